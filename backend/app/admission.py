@@ -0,0 +1,202 @@
+"""Inbound admission control: per-client token buckets and an upstream concurrency cap."""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+import jwt
+from app.auth import get_user_id_from_token
+from app.config import settings
+
+# Request paths that can reach Alpha Vantage or The Odds API
+UPSTREAM_PREFIXES = ("/stocks/", "/sports/")
+# Never limited (load balancer probes, internal metrics)
+EXEMPT_PATHS = ("/health", "/metrics")
+
+
+class TokenBuckets:
+    """
+    One token bucket per key, refilled lazily on access.
+    
+    A key may spend `burst` requests at once and then `rate` per second.
+    Only the `max_keys` most recently seen keys are kept; a forgotten key
+    starts again with a full bucket, which is where an idle one would be
+    anyway. A rate of 0 or less admits everything.
+    """
+    
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        # Key -> (tokens, time of last refill)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Take one token for `key`.
+        
+        Returns:
+            0 if the request is admitted, otherwise seconds until a token is
+            available (nothing is taken)
+        """
+        return self.acquire_all((key,), now)
+    
+    def acquire_all(self, keys: Sequence[str], now: Optional[float] = None) -> float:
+        """
+        Take one token from every key in `keys`, or from none of them.
+        
+        Returns:
+            0 if the request is admitted, otherwise seconds until every key
+            has a token (nothing is taken)
+        """
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        levels = {}
+        for key in keys:
+            tokens, refilled_at = self._buckets.pop(key, (self.burst, now))
+            levels[key] = min(self.burst, tokens + (now - refilled_at) * self.rate)
+        wait = max(((1 - tokens) / self.rate for tokens in levels.values() if tokens < 1), default=0.0)
+        for key, tokens in levels.items():
+            self._buckets[key] = (tokens if wait else tokens - 1, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimit:
+    """Non-blocking cap on requests in flight; a limit of 0 or less admits everything."""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+    
+    def try_acquire(self) -> bool:
+        if 0 < self.limit <= self.in_flight:
+            return False
+        self.in_flight += 1
+        return True
+    
+    def release(self):
+        self.in_flight -= 1
+
+
+def client_ip(scope: Dict[str, Any], trust_forwarded_for: bool = False) -> str:
+    """Client address of an ASGI request (the first X-Forwarded-For hop behind a trusted proxy)."""
+    if trust_forwarded_for:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+def user_key(authorization: Optional[str]) -> Optional[str]:
+    """
+    The Clerk user id get_current_user_optional would resolve for a header.
+    
+    Read from the token's claims without the JWKS fetch or database lookup,
+    so it costs microseconds; None for anonymous or malformed requests. The
+    signature is not checked, so a client can claim any user id.
+    """
+    if not authorization:
+        return None
+    token = authorization[7:] if authorization.startswith("Bearer ") else authorization
+    try:
+        return get_user_id_from_token(jwt.decode(token, options={"verify_signature": False}))
+    except Exception:
+        return None
+
+
+class AdmissionController:
+    """
+    Decides whether a request may run, without any I/O.
+    
+    Every request spends a token from its client IP's bucket. Requests to
+    upstream-bound paths also spend one from their IP's and, if they carry
+    a token, their user's bucket in `user_buckets`, and must get one of the
+    upstream concurrency slots, which the caller releases when the request
+    finishes. Charging the IP whatever the token says means forged user ids
+    cannot buy a fresh bucket per request. State is per process, so with
+    several workers each enforces its own limits.
+    """
+    
+    def __init__(
+        self,
+        ip_buckets: TokenBuckets,
+        user_buckets: TokenBuckets,
+        upstream: ConcurrencyLimit,
+        retry_after_seconds: int = 1,
+        trust_forwarded_for: bool = False
+    ):
+        self.ip_buckets = ip_buckets
+        self.user_buckets = user_buckets
+        self.upstream = upstream
+        self.retry_after_seconds = retry_after_seconds
+        self.trust_forwarded_for = trust_forwarded_for
+        self.counters = {"admitted": 0, "rejected_ip": 0, "rejected_user": 0, "rejected_busy": 0}
+    
+    def admit(self, scope: Dict[str, Any]) -> Tuple[Optional[int], float, bool]:
+        """
+        Check an HTTP request.
+        
+        Returns:
+            (rejection status or None, Retry-After seconds, whether an
+            upstream slot was taken and must be released)
+        """
+        path = scope.get("path", "")
+        if path in EXEMPT_PATHS:
+            return None, 0.0, False
+        ip = client_ip(scope, self.trust_forwarded_for)
+        wait = self.ip_buckets.acquire(f"ip:{ip}")
+        if wait:
+            self.counters["rejected_ip"] += 1
+            return 429, wait, False
+        if not path.startswith(UPSTREAM_PREFIXES):
+            self.counters["admitted"] += 1
+            return None, 0.0, False
+        
+        authorization = None
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        user = user_key(authorization)
+        # A user over its limit must not spend the tokens of others on its IP
+        wait = self.user_buckets.acquire_all((f"ip:{ip}", f"user:{user}") if user else (f"ip:{ip}",))
+        if wait:
+            self.counters["rejected_user"] += 1
+            return 429, wait, False
+        if not self.upstream.try_acquire():
+            self.counters["rejected_busy"] += 1
+            return 503, float(self.retry_after_seconds), False
+        self.counters["admitted"] += 1
+        return None, 0.0, True
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_ips": len(self.ip_buckets),
+            "tracked_users": len(self.user_buckets),
+            "upstream_in_flight": self.upstream.in_flight,
+            "upstream_limit": self.upstream.limit,
+            **self.counters,
+        }
+
+
+def build_admission_controller(
+    ip_rate: float = settings.admission_ip_rate,
+    user_rate: float = settings.admission_user_rate,
+    max_upstream_requests: int = settings.admission_max_upstream_requests
+) -> AdmissionController:
+    """Controller from settings, with optional overrides of the limits."""
+    return AdmissionController(
+        TokenBuckets(ip_rate, settings.admission_ip_burst, settings.admission_max_clients),
+        TokenBuckets(user_rate, settings.admission_user_burst, settings.admission_max_clients),
+        ConcurrencyLimit(max_upstream_requests),
+        retry_after_seconds=settings.admission_retry_after_seconds,
+        trust_forwarded_for=settings.admission_trust_forwarded_for
+    )
+
+
+admission = build_admission_controller()
@@ -27,8 +27,7 @@ async def verify_clerk_token(token: str) -> dict:
         async with httpx.AsyncClient() as client:
             # Clerk's JWKS endpoint (this is a simplified version)
             # In production, you'd fetch this from Clerk's API
-            jwks_url = f"https://api.clerk.dev/v1/jwks"
-            response = await client.get(jwks_url)
+            response = await client.get(settings.clerk_jwks_url)
             
             if response.status_code != 200:
                 raise HTTPException(
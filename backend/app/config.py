@@ -25,9 +25,127 @@ class Settings(BaseSettings):
     alpha_vantage_api_key: str
     the_odds_api_key: str
     
+    # External API Endpoints (point these at the local stand-in for load tests)
+    alpha_vantage_base_url: str = "https://www.alphavantage.co/query"
+    the_odds_api_base_url: str = "https://api.the-odds-api.com/v4"
+    clerk_jwks_url: str = "https://api.clerk.dev/v1/jwks"
+    
     # Application Settings
     environment: str = "development"
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
+    warmup_models_on_startup: bool = True
+    
+    # Model Inference Executor ("inline", "thread" or "process")
+    inference_executor: str = "thread"
+    inference_workers: int = 0  # 0 = one per CPU
+    inference_max_queue: int = 64
+    inference_retry_after_seconds: int = 1
+    
+    # Upstream resilience: per-request timeout, retries of transient errors
+    # with jittered backoff, and per-upstream circuit breakers
+    upstream_timeout_seconds: float = 10.0
+    upstream_retries: int = 2
+    upstream_retry_base_delay: float = 0.2
+    upstream_retry_max_delay: float = 2.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    breaker_slow_call_seconds: float = 5.0
+    
+    # API cache payload compression ("none", "zlib" or "zstd"; zstd needs the
+    # zstandard package and msgpack is used for serialization when installed)
+    cache_compression: str = "zlib"
+    cache_compress_min_bytes: int = 16384
+    cache_compression_level: int = 3
+    
+    # Where API cache entries and upstream request counts live: "mongodb"
+    # (the api_cache and rate_limits collections) or "redis" (atomic
+    # counters and expiring keys; needs the redis package). With redis,
+    # each worker keeps its last CACHE_LOCAL_ENTRIES entries in memory and
+    # drops them when another worker publishes a newer write
+    cache_backend: str = "mongodb"
+    redis_url: str = "redis://localhost:6379/0"
+    redis_key_prefix: str = "predict:"
+    cache_retention_seconds: int = 604800
+    cache_local_entries: int = 256
+    
+    # Memoized prediction results per process (0 disables)
+    prediction_cache_size: int = 4096
+    
+    # Elo team ratings from completed games (refresh 0 disables the background
+    # refresh; a results directory of <sport>.json scores payloads replaces the API).
+    # Each refresh costs 2 Odds API requests per sport; the scores endpoint
+    # returns three days of results, so a daily refresh misses nothing
+    team_ratings_sports: str = "basketball_nba,americanfootball_nfl,icehockey_nhl,baseball_mlb"
+    team_ratings_refresh_seconds: int = 86400
+    team_ratings_k: float = 20.0
+    team_ratings_home_advantage: float = 65.0
+    team_ratings_results_dir: str = ""
+    
+    # How sports predictions strip the bookmaker margin from implied
+    # probabilities: multiplicative, power or shin
+    odds_vig_method: str = "multiplicative"
+    
+    # Most The Odds API odds requests per minute per worker (with the Redis
+    # cache backend, across all workers), on top of the monthly quota
+    odds_max_requests_per_minute: int = 30
+    
+    # Smallest expected value (model probability * decimal price - 1) that
+    # the line scanner reports as a value line
+    value_line_min_edge: float = 0.03
+    
+    # Inbound admission control, in memory per process: token buckets per
+    # client IP (every request) and per IP and user for /stocks and /sports
+    # requests, and a cap on those requests in flight.
+    # Rates are requests per second; a rate or cap of 0 disables it
+    admission_ip_rate: float = 20.0
+    admission_ip_burst: int = 60
+    admission_user_rate: float = 2.0
+    admission_user_burst: int = 30
+    admission_max_upstream_requests: int = 64
+    admission_retry_after_seconds: int = 1
+    admission_max_clients: int = 10000
+    admission_trust_forwarded_for: bool = False  # only behind a proxy that sets it
+    
+    # Precomputed prediction snapshots: every SNAPSHOT_REFRESH_SECONDS each
+    # worker predicts these symbols and sport slates (with SNAPSHOT_SPORTS_MARKETS
+    # and the "us" region) and answers matching requests from the result while
+    # it is younger than SNAPSHOT_MAX_AGE_SECONDS (refresh 0 disables)
+    snapshot_stock_symbols: str = ""
+    snapshot_sports: str = ""
+    snapshot_sports_markets: str = "h2h"
+    snapshot_refresh_seconds: int = 300
+    snapshot_max_age_seconds: int = 600
+    
+    # Concurrent odds fetches for one multi-sport predictions request
+    sports_fetch_concurrency: int = 4
+    
+    # Trained stock model artifact (written by train_model.py); falls back to
+    # the untrained placeholder model when the file does not exist
+    stock_model_artifact: str = "artifacts/stock/latest.json"
+    
+    # prediction_logs is a time-series collection whose logs expire after
+    # PREDICTION_LOGS_RETENTION_DAYS (set by init_db.py); archive_logs.py moves
+    # logs older than PREDICTION_LOGS_ARCHIVE_AFTER_DAYS into compressed
+    # per-day files first, so keep the retention longer than that
+    prediction_logs_retention_days: int = 30
+    prediction_logs_archive_after_days: int = 7
+    prediction_logs_archive_dir: str = "data/prediction_logs"
+    
+    # Bulk exports (/export): rows per database round trip and encoded chunk,
+    # and the Clerk user ids allowed to export every user's rows (others get
+    # only their own)
+    export_batch_size: int = 1000
+    export_clerk_ids: str = ""
+    
+    # Local columnar price history (one memory-mapped .npy file per symbol)
+    price_store_dir: str = "data/prices"
+    price_refresh_seconds: int = 300
+    
+    # Request Instrumentation
+    server_timing_enabled: bool = True
+    slow_request_threshold_ms: float = 1000.0
+    slow_request_sample_rate: float = 1.0
+    slow_request_profile_rate: float = 0.0
     
     @property
     def postgres_url(self) -> str:
@@ -39,6 +157,26 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
+    @property
+    def team_ratings_sports_list(self) -> List[str]:
+        """Parse team rating sports from comma-separated string."""
+        return [sport.strip() for sport in self.team_ratings_sports.split(",") if sport.strip()]
+    
+    @property
+    def snapshot_stock_symbols_list(self) -> List[str]:
+        """Parse snapshot symbols from comma-separated string."""
+        return [symbol.strip().upper() for symbol in self.snapshot_stock_symbols.split(",") if symbol.strip()]
+    
+    @property
+    def snapshot_sports_list(self) -> List[str]:
+        """Parse snapshot sport keys from comma-separated string."""
+        return [sport.strip() for sport in self.snapshot_sports.split(",") if sport.strip()]
+    
+    @property
+    def export_clerk_ids_list(self) -> List[str]:
+        """Parse exporter Clerk ids from comma-separated string."""
+        return [clerk_id.strip() for clerk_id in self.export_clerk_ids.split(",") if clerk_id.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -3,6 +3,7 @@ from fastapi import Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from app.database import get_db, get_mongodb
 from app.auth import verify_clerk_token, get_user_id_from_token
+from app.timing import phase, PHASE_AUTH
 
 
 async def get_current_user(
@@ -20,22 +21,23 @@ async def get_current_user(
             detail="Authorization header missing"
         )
     
-    token_payload = await verify_clerk_token(authorization)
-    clerk_id = get_user_id_from_token(token_payload)
-    
-    # Get or create user in database
-    from app.models import User
-    user = db.query(User).filter(User.clerk_id == clerk_id).first()
-    
-    if not user:
-        # Create new user if doesn't exist
-        user = User(
-            clerk_id=clerk_id,
-            email=token_payload.get("email", f"{clerk_id}@example.com")
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    with phase(PHASE_AUTH):
+        token_payload = await verify_clerk_token(authorization)
+        clerk_id = get_user_id_from_token(token_payload)
+        
+        # Get or create user in database
+        from app.models import User
+        user = db.query(User).filter(User.clerk_id == clerk_id).first()
+        
+        if not user:
+            # Create new user if doesn't exist
+            user = User(
+                clerk_id=clerk_id,
+                email=token_payload.get("email", f"{clerk_id}@example.com")
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
     
     return user
 
@@ -53,24 +55,25 @@ async def get_current_user_optional(
         return None
     
     try:
-        token_payload = await verify_clerk_token(authorization)
-        clerk_id = get_user_id_from_token(token_payload)
+        with phase(PHASE_AUTH):
+            token_payload = await verify_clerk_token(authorization)
+            clerk_id = get_user_id_from_token(token_payload)
         
-        # Get or create user in database
-        from app.models import User
-        user = db.query(User).filter(User.clerk_id == clerk_id).first()
+            # Get or create user in database
+            from app.models import User
+            user = db.query(User).filter(User.clerk_id == clerk_id).first()
         
-        if not user:
-            # Create new user if doesn't exist
-            user = User(
-                clerk_id=clerk_id,
-                email=token_payload.get("email", f"{clerk_id}@example.com")
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+            if not user:
+                # Create new user if doesn't exist
+                user = User(
+                    clerk_id=clerk_id,
+                    email=token_payload.get("email", f"{clerk_id}@example.com")
+                )
+                db.add(user)
+                db.commit()
+                db.refresh(user)
         
-        return user
+            return user
     except Exception:
         # Return None if token verification fails
         return None
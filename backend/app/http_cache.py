@@ -0,0 +1,49 @@
+"""Conditional GET support: ETag, Last-Modified and Cache-Control headers."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+from fastapi import Response
+
+# Longest max-age sent, however long the underlying data stays fresh
+MAX_AGE_LIMIT = 86400
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag for a response that is fully determined by `parts`."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime], max_age: float) -> Dict[str, str]:
+    """
+    Validator and freshness headers for a response.
+    
+    Args:
+        etag: From make_etag
+        last_modified: When the data behind the response was fetched (naive UTC)
+        max_age: Seconds the data stays fresh; clamped to [0, MAX_AGE_LIMIT]
+    """
+    headers = {
+        "ETag": etag,
+        # private: responses may be served to authenticated users
+        "Cache-Control": f"private, max-age={int(min(max(max_age, 0), MAX_AGE_LIMIT))}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """Empty 304 response carrying the same validators as a full one."""
+    return Response(status_code=304, headers=headers)
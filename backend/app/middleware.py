@@ -0,0 +1,160 @@
+"""ASGI middleware for request instrumentation."""
+import io
+import math
+import random
+import logging
+from datetime import datetime
+from typing import Optional
+from starlette.responses import JSONResponse
+from app.admission import AdmissionController, admission
+from app.config import settings
+from app.timing import start_request_timer
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+except ImportError:  # pragma: no cover - optional dependency
+    _PyinstrumentProfiler = None
+
+
+class _RequestProfiler:
+    """Profiles one request with pyinstrument if installed, else cProfile."""
+    
+    # cProfile cannot run two profilers on one thread, so only one request
+    # is profiled at a time
+    active = False
+    
+    def __init__(self):
+        if _PyinstrumentProfiler is not None:
+            self._profiler = _PyinstrumentProfiler(async_mode="enabled")
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+    
+    def start(self):
+        _RequestProfiler.active = True
+        if _PyinstrumentProfiler is not None:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+    
+    def stop(self) -> str:
+        """Stop profiling and return a text report."""
+        _RequestProfiler.active = False
+        if _PyinstrumentProfiler is not None:
+            self._profiler.stop()
+            return self._profiler.output_text()
+        
+        import pstats
+        self._profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(40)
+        return output.getvalue()
+
+
+class ServerTimingMiddleware:
+    """
+    Record per-request phase timings.
+    
+    Adds a Server-Timing header to every HTTP response and writes a full
+    breakdown of sampled slow requests to the `slow_requests` collection.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timer = start_request_timer()
+        status_code = 500
+        
+        profiler: Optional[_RequestProfiler] = None
+        if (
+            settings.slow_request_profile_rate > 0
+            and not _RequestProfiler.active
+            and random.random() < settings.slow_request_profile_rate
+        ):
+            profiler = _RequestProfiler()
+            profiler.start()
+        
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.server_timing_enabled:
+                    header = timer.server_timing_header(total_ms=timer.elapsed_ms())
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", header.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profile_text = profiler.stop() if profiler else None
+            total_ms = timer.elapsed_ms()
+            if (
+                total_ms >= settings.slow_request_threshold_ms
+                and random.random() < settings.slow_request_sample_rate
+            ):
+                await self._record_slow_request(scope, status_code, total_ms, timer, profile_text)
+    
+    @staticmethod
+    async def _record_slow_request(scope, status_code, total_ms, timer, profile_text):
+        """Store a slow request breakdown; never fails the request."""
+        from app.database import get_mongodb
+        
+        try:
+            mongodb = await get_mongodb()
+            await mongodb["slow_requests"].insert_one({
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status_code": status_code,
+                "total_ms": round(total_ms, 3),
+                "phases": timer.breakdown(),
+                "profile": profile_text,
+                "timestamp": datetime.utcnow()
+            })
+        except Exception as e:
+            logger.warning("Failed to record slow request: %s", e)
+
+
+class AdmissionMiddleware:
+    """
+    Reject requests over their client's limits before any work is done.
+    
+    Clients over their token bucket get 429 and requests beyond the
+    upstream concurrency cap get 503, both with Retry-After and the same
+    {"detail": ...} body as an HTTPException. See AdmissionController.
+    """
+    
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code, retry_after, holds_slot = self.controller.admit(scope)
+        if status_code is not None:
+            detail = "Too many requests, please slow down" if status_code == 429 else "Server busy, please retry shortly"
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=status_code,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if holds_slot:
+                self.controller.upstream.release()
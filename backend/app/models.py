@@ -29,7 +29,7 @@ class UserPick(Base):
     symbol_or_event = Column(String, nullable=False)  # Stock symbol or event ID
     prediction = Column(Text, nullable=False)  # JSON string of prediction
     confidence = Column(Float, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationships
     user = relationship("User", back_populates="picks")
@@ -0,0 +1,118 @@
+"""Bulk export router for prediction logs and user picks."""
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app import database
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models import User
+from app.services.exports import EXPORT_FORMATS, log_query, stream_picks, stream_prediction_logs
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+TYPE_PATTERN = "^(stock|sports)$"
+
+
+def _user_scope(current_user: User) -> Optional[int]:
+    """None (every user's rows) for exporters listed in EXPORT_CLERK_IDS, else the user's own id."""
+    return None if current_user.clerk_id in settings.export_clerk_ids_list else current_user.id
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """An aware UTC datetime; naive query values are taken to be UTC."""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _check_range(start: Optional[datetime], end: Optional[datetime]):
+    if start is not None and end is not None and _utc(start) >= _utc(end):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+
+
+def _streaming_response(body, name: str, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'}
+    )
+
+
+@router.get("/prediction-logs")
+async def export_prediction_logs(
+    export_format: str = Query(default="ndjson", alias="format", pattern=FORMAT_PATTERN, description="ndjson or csv"),
+    start: Optional[datetime] = Query(default=None, description="Earliest log time (inclusive, UTC if no offset)"),
+    end: Optional[datetime] = Query(default=None, description="Latest log time (exclusive, UTC if no offset)"),
+    prediction_type: Optional[str] = Query(default=None, pattern=TYPE_PATTERN, description="stock or sports"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream prediction logs as NDJSON or CSV, oldest first.
+    
+    Rows are the archive columns (see app/services/prediction_logs.py) with
+    the prediction type. Users not listed in EXPORT_CLERK_IDS get only their
+    own logs.
+    
+    Args:
+        export_format: Output format
+        start: Optional start of the time range
+        end: Optional end of the time range
+        prediction_type: Optional filter by type
+        current_user: Authenticated user
+    
+    Returns:
+        Streaming export
+    """
+    _check_range(start, end)
+    mongodb = await database.get_mongodb()
+    query = log_query(start, end, prediction_type, _user_scope(current_user))
+    return _streaming_response(
+        stream_prediction_logs(mongodb["prediction_logs"], query, export_format, settings.export_batch_size),
+        "prediction_logs",
+        export_format
+    )
+
+
+@router.get("/picks")
+async def export_picks(
+    export_format: str = Query(default="ndjson", alias="format", pattern=FORMAT_PATTERN, description="ndjson or csv"),
+    start: Optional[datetime] = Query(default=None, description="Earliest creation time (inclusive, UTC if no offset)"),
+    end: Optional[datetime] = Query(default=None, description="Latest creation time (exclusive, UTC if no offset)"),
+    prediction_type: Optional[str] = Query(default=None, pattern=TYPE_PATTERN, description="stock or sports"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream saved picks as NDJSON or CSV, in the order they were saved.
+    
+    Users not listed in EXPORT_CLERK_IDS get only their own picks.
+    
+    Args:
+        export_format: Output format
+        start: Optional start of the time range
+        end: Optional end of the time range
+        prediction_type: Optional filter by type
+        current_user: Authenticated user
+    
+    Returns:
+        Streaming export
+    """
+    _check_range(start, end)
+    # The request's session closes with the request, so the stream opens its own
+    return _streaming_response(
+        stream_picks(
+            database.SessionLocal,
+            export_format,
+            start=_utc(start),
+            end=_utc(end),
+            prediction_type=prediction_type,
+            user_id=_user_scope(current_user),
+            batch_size=settings.export_batch_size
+        ),
+        "picks",
+        export_format
+    )
@@ -1,18 +1,172 @@
 """Sports predictions router."""
-from fastapi import APIRouter, Depends, Query
-from typing import Optional, List
+import asyncio
+import functools
+import math
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, Optional, List, Tuple
+from datetime import datetime
 from app.dependencies import get_current_user_optional
+from app.http_cache import cache_headers, etag_matches, make_etag, not_modified
 from app.models import User
-from app.schemas import SportsPrediction
+from app.schemas import (
+    LineScanResponse,
+    MultiSportPredictionsRequest,
+    MultiSportPredictionsResponse,
+    SlatePredictions,
+    SportsPrediction,
+    SportsSlate,
+)
 from app.services.external_apis import TheOddsAPI
+from app.services.inference import InferenceBusyError, inference_executor
+from app.services.line_scanner import scan_lines
+from app.services.prediction_cache import fingerprint_event, prediction_cache
+from app.services.resilience import CircuitOpenError
+from app.services.prediction_logs import log_document
 from app.services.prediction_models import SportsPredictionModel
+from app.services.snapshots import make_snapshot, prediction_snapshots, serve_snapshot
+from app.services.team_ratings import team_ratings
+from app.config import settings
 from app.database import get_mongodb
+from app.timing import phase, PHASE_INFERENCE, PHASE_LOGGING, PHASE_SERIALIZATION
 
 router = APIRouter(prefix="/sports", tags=["sports"])
 
+# Events predicted per slate
+MAX_SLATE_EVENTS = 10
+
+# Slates accepted by one multi-sport request
+MAX_SLATES = 10
+
+
+def _log_document(event: Dict[str, Any], prediction_result: Dict[str, Any], current_user: Optional[User]) -> Dict[str, Any]:
+    return log_document(
+        "sports",
+        prediction_result,
+        current_user.id if current_user else None,
+        event_id=event.get("id", ""),
+        commence_time=event.get("commence_time")
+    )
+
+
+def _to_prediction(event: Dict[str, Any], prediction_result: Dict[str, Any]) -> SportsPrediction:
+    return SportsPrediction(
+        event_id=event.get("id", ""),
+        prediction_type="sports",
+        probability=prediction_result["probability"],
+        confidence=prediction_result["confidence"],
+        outcome=prediction_result["outcome"],
+        team=prediction_result.get("team"),
+        market=prediction_result.get("market", "h2h"),
+        point=prediction_result.get("point"),
+        odds=prediction_result.get("odds"),
+        implied_probability=prediction_result.get("implied_probability"),
+        model_version=prediction_result["model_version"],
+        metadata=prediction_result.get("metadata", {})
+    )
+
+
+def _requested_markets(markets: str) -> List[str]:
+    """Markets to predict for a comma-separated markets parameter, in order (h2h if none is supported)."""
+    requested = []
+    for market in markets.split(","):
+        market = market.strip()
+        if market in SportsPredictionModel.MARKETS and market not in requested:
+            requested.append(market)
+    return requested or ["h2h"]
+
+
+def _market_pairs(events: List[Dict[str, Any]], markets: str) -> List[Tuple[Dict[str, Any], str]]:
+    """(event, market) pairs to predict for a slate: every requested market of every event."""
+    requested = _requested_markets(markets)
+    return [(event, market) for event in events for market in requested]
+
+
+def _model_version() -> str:
+    """Model version and team ratings revision the predictions depend on."""
+    return f"{SportsPredictionModel.MODEL_VERSION}+r{team_ratings.revision}"
+
+
+def _max_age(odds: Dict[str, Any]) -> float:
+    """Seconds until cached odds are due for a refresh."""
+    return odds["ttl"] - (datetime.utcnow() - odds["timestamp"]).total_seconds()
+
+
+def _etag(sport: str, markets: str, regions: str, odds: Dict[str, Any]) -> str:
+    return make_etag(
+        "sports", sport, markets, regions, odds["timestamp"].isoformat(),
+        SportsPredictionModel.MODEL_VERSION, team_ratings.revision
+    )
+
+
+async def _predict_events(pairs: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """
+    Predictions for (event, market) pairs.
+    
+    Only pairs not seen with the same odds, model version and ratings are
+    run, all markets in one executor call.
+    """
+    model_version = _model_version()
+    fingerprints = {}
+    keys = []
+    for event, market in pairs:
+        if id(event) not in fingerprints:
+            fingerprints[id(event)] = fingerprint_event(event)
+        keys.append(prediction_cache.key(f"sports:{market}", event.get("id", ""), fingerprints[id(event)], model_version))
+    results = [prediction_cache.get(key) for key in keys]
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses:
+        # Generate predictions for the new pairs off the event loop
+        missed: Dict[str, List[Dict[str, Any]]] = {}
+        for i in misses:
+            event, market = pairs[i]
+            missed.setdefault(market, []).append(event)
+        ratings = team_ratings.ratings_for([pairs[i][0] for i in misses])
+        fresh = await inference_executor.run(SportsPredictionModel.predict_markets, missed, ratings)
+        fresh_by_market = {market: iter(market_results) for market, market_results in fresh.items()}
+        for i in misses:
+            results[i] = next(fresh_by_market[pairs[i][1]])
+            prediction_cache.put(keys[i], results[i])
+    return results
+
+
+def _snapshot_key(sport: str, markets: str, regions: str) -> str:
+    return f"sports:{sport}:{markets}:{regions}"
+
+
+async def build_snapshot(sport: str, markets: str, regions: str) -> Dict[str, Any]:
+    """Snapshot of the /sports/predictions response for a slate (see PredictionSnapshots)."""
+    odds = await TheOddsAPI.get_sports_odds_entry(sport, markets, regions)
+    pairs = _market_pairs(odds["data"][:MAX_SLATE_EVENTS], markets)
+    prediction_results = await _predict_events(pairs)
+    
+    content, logs = [], []
+    for (event, _), prediction_result in zip(pairs, prediction_results):
+        try:
+            content.append(_to_prediction(event, prediction_result).model_dump(mode="json"))
+        except Exception:
+            # Skip events that fail to process, as the endpoint does
+            continue
+        logs.append(_log_document(event, prediction_result, None))
+    
+    return make_snapshot(
+        content, _model_version(), _etag(sport, markets, regions, odds), odds["timestamp"], _max_age(odds), logs
+    )
+
+
+def _unique_slates(slates: List[SportsSlate]) -> List[SportsSlate]:
+    """Requested slates with blanks dropped and duplicates removed, in order."""
+    unique = {}
+    for slate in slates:
+        key = (slate.sport.strip(), slate.markets.strip(), slate.regions.strip())
+        if key[0] and key not in unique:
+            unique[key] = SportsSlate(sport=key[0], markets=key[1], regions=key[2])
+    return list(unique.values())
+
 
 @router.get("/predictions", response_model=List[SportsPrediction])
 async def get_sports_predictions(
+    request: Request,
+    response: Response,
     sport: str = Query(default="basketball_nba", description="Sport key (e.g., basketball_nba, americanfootball_nfl)"),
     markets: str = Query(default="h2h", description="Comma-separated markets"),
     regions: str = Query(default="us", description="Comma-separated regions"),
@@ -21,54 +175,224 @@ async def get_sports_predictions(
     """
     Get sports predictions for upcoming events.
     
+    Every supported market in `markets` (h2h, spreads, totals) is predicted
+    from the one odds fetch, one prediction per event and market.
+    
+    The response carries an ETag for the cached odds' fetch time, the model
+    version and the team ratings revision; a request whose If-None-Match
+    matches it gets an empty 304 without running the model. Cache-Control
+    allows reuse until the cached odds are due for a refresh. Slates in
+    SNAPSHOT_SPORTS are served from their precomputed snapshot while it is
+    fresh.
+    
     Args:
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for the caching headers)
         sport: Sport key
         markets: Comma-separated markets
         regions: Comma-separated regions
         current_user: Authenticated user (optional)
-        
+    
     Returns:
         List of sports predictions
     """
+    snapshot = prediction_snapshots.get(_snapshot_key(sport, markets, regions), _model_version())
+    if snapshot is not None:
+        return await serve_snapshot(snapshot, request, current_user.id if current_user else None)
+    
     try:
         # Fetch odds data from The Odds API
-        odds_data = await TheOddsAPI.get_sports_odds(sport, markets, regions)
+        odds = await TheOddsAPI.get_sports_odds_entry(sport, markets, regions)
+        odds_data = odds["data"]
+        
+        headers = cache_headers(_etag(sport, markets, regions, odds), odds["timestamp"], _max_age(odds))
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+        
+        events = odds_data[:MAX_SLATE_EVENTS]
+        pairs = _market_pairs(events, markets)
+        
+        prediction_results = await _predict_events(pairs)
         
         predictions = []
         mongodb = await get_mongodb()
         
-        # Generate predictions for each event
-        for event in odds_data[:10]:  # Limit to 10 events
+        for (event, _), prediction_result in zip(pairs, prediction_results):
             try:
-                prediction_result = SportsPredictionModel.predict(event)
-                
                 # Log prediction
-                await mongodb["prediction_logs"].insert_one({
-                    "prediction_type": "sports",
-                    "event_id": event.get("id", ""),
-                    "prediction": prediction_result,
-                    "timestamp": event.get("commence_time"),
-                    "user_id": current_user.id if current_user else None
-                })
+                with phase(PHASE_LOGGING):
+                    await mongodb["prediction_logs"].insert_one(_log_document(event, prediction_result, current_user))
                 
-                predictions.append(SportsPrediction(
-                    event_id=event.get("id", ""),
-                    prediction_type="sports",
-                    probability=prediction_result["probability"],
-                    confidence=prediction_result["confidence"],
-                    outcome=prediction_result["outcome"],
-                    team=prediction_result.get("team"),
-                    odds=prediction_result.get("odds"),
-                    implied_probability=prediction_result.get("implied_probability"),
-                    model_version=prediction_result["model_version"],
-                    metadata=prediction_result.get("metadata", {})
-                ))
+                with phase(PHASE_SERIALIZATION):
+                    predictions.append(_to_prediction(event, prediction_result))
             except Exception as e:
                 # Skip events that fail to process
                 continue
         
         return predictions
+    
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Prediction capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(settings.inference_retry_after_seconds)}
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch odds: {str(e)}"
+        )
+
+
+@router.post("/predictions/batch", response_model=MultiSportPredictionsResponse)
+async def get_multi_sport_predictions(
+    request: MultiSportPredictionsRequest,
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Get predictions for several sports (or markets/regions combinations) at once.
+    
+    Odds for all slates are fetched concurrently, at most
+    SPORTS_FETCH_CONCURRENCY at a time, and the model runs once over the
+    combined events. A slate whose odds cannot be fetched is reported with an
+    error instead of failing the whole request.
+    
+    Args:
+        request: Slates to predict
+        current_user: Authenticated user (optional)
+    
+    Returns:
+        Predictions grouped by slate, in request order
+    """
+    slates = _unique_slates(request.slates)
+    if not slates:
+        raise HTTPException(status_code=400, detail="No slates given")
+    if len(slates) > MAX_SLATES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SLATES} slates per request")
+    
+    semaphore = asyncio.Semaphore(max(1, settings.sports_fetch_concurrency))
+    
+    async def fetch(slate: SportsSlate):
+        async with semaphore:
+            return await TheOddsAPI.get_sports_odds(slate.sport, slate.markets, slate.regions)
+    
+    fetched = await asyncio.gather(*(fetch(slate) for slate in slates), return_exceptions=True)
+    
+    slate_pairs = [
+        [] if isinstance(odds, Exception) else _market_pairs(odds[:MAX_SLATE_EVENTS], slate.markets)
+        for slate, odds in zip(slates, fetched)
+    ]
+    combined = [pair for pairs in slate_pairs for pair in pairs]
+    try:
+        prediction_results = await _predict_events(combined)
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Prediction capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(settings.inference_retry_after_seconds)}
+        )
+    
+    results = []
+    log_documents = []
+    offset = 0
+    for slate, odds, pairs in zip(slates, fetched, slate_pairs):
+        slate_results = prediction_results[offset:offset + len(pairs)]
+        offset += len(pairs)
+        if isinstance(odds, Exception):
+            results.append(SlatePredictions(**slate.model_dump(), error=str(odds) or type(odds).__name__))
+            continue
+        predictions = []
+        with phase(PHASE_SERIALIZATION):
+            for (event, _), prediction_result in zip(pairs, slate_results):
+                try:
+                    predictions.append(_to_prediction(event, prediction_result))
+                except Exception:
+                    # Skip events that fail to process
+                    continue
+                log_documents.append(_log_document(event, prediction_result, current_user))
+        results.append(SlatePredictions(**slate.model_dump(), predictions=predictions))
+    
+    if log_documents:
+        try:
+            mongodb = await get_mongodb()
+            with phase(PHASE_LOGGING):
+                await mongodb["prediction_logs"].insert_many(log_documents)
+        except Exception:
+            # Logging must not fail the request
+            pass
+    
+    return MultiSportPredictionsResponse(results=results)
+
+
+@router.get("/lines", response_model=LineScanResponse)
+async def get_best_lines(
+    sport: str = Query(default="basketball_nba", description="Sport key (e.g., basketball_nba, americanfootball_nfl)"),
+    markets: str = Query(default="h2h", description="Comma-separated markets"),
+    regions: str = Query(default="us", description="Comma-separated regions"),
+    min_edge: Optional[float] = Query(default=None, description="Smallest expected value reported as a value line")
+):
+    """
+    Best price per outcome across all bookmakers for a slate's first
+    MAX_SLATE_EVENTS events.
+    
+    Also lists arbitrages (lines whose best prices' implied probabilities sum
+    to less than 1) and value lines, whose expected value under the model's
+    probability is at least `min_edge` (VALUE_LINE_MIN_EDGE by default).
+    
+    Args:
+        sport: Sport key
+        markets: Comma-separated markets (h2h, spreads, totals)
+        regions: Comma-separated regions
+        min_edge: Value line threshold
+    
+    Returns:
+        Best lines, arbitrages and value lines
+    """
+    try:
+        odds_data = (await TheOddsAPI.get_sports_odds(sport, markets, regions))[:MAX_SLATE_EVENTS]
+        requested = _requested_markets(markets)
+        
+        pairs = [(event, market) for market in requested for event in odds_data]
+        prediction_results = await _predict_events(pairs)
+        predictions = {
+            market: prediction_results[i * len(odds_data):(i + 1) * len(odds_data)]
+            for i, market in enumerate(requested)
+        }
         
+        edge = settings.value_line_min_edge if min_edge is None else min_edge
+        with phase(PHASE_INFERENCE):
+            scan = scan_lines(odds_data, requested, predictions, edge)
+        with phase(PHASE_SERIALIZATION):
+            return LineScanResponse(sport=sport, markets=requested, **scan)
+    
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Prediction capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(settings.inference_retry_after_seconds)}
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except Exception as e:
-        # Return empty list on error rather than raising
-        return []
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch odds: {str(e)}"
+        )
+
+
+for _sport in settings.snapshot_sports_list:
+    prediction_snapshots.add_job(
+        _snapshot_key(_sport, settings.snapshot_sports_markets, "us"),
+        functools.partial(build_snapshot, _sport, settings.snapshot_sports_markets, "us")
+    )
@@ -1,63 +1,220 @@
 """Stock predictions router."""
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+import functools
+import math
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, Optional
 from app.dependencies import get_current_user_optional
+from app.http_cache import cache_headers, etag_matches, make_etag, not_modified
 from app.models import User
-from app.schemas import StockPrediction
+from app.schemas import StockPrediction, StockQuote, StockQuotesResponse
 from app.services.external_apis import AlphaVantageAPI
+from app.services.ingestion import price_ingestion
+from app.services.inference import InferenceBusyError, inference_executor
+from app.services.prediction_cache import fingerprint_prices, prediction_cache
+from app.services.resilience import CircuitOpenError
 from app.services.prediction_models import StockPredictionModel
+from app.services.prediction_logs import log_document
+from app.services.price_store import PriceHistory
+from app.services.snapshots import make_snapshot, prediction_snapshots, serve_snapshot
+from app.config import settings
 from app.database import get_mongodb
+from app.timing import phase, PHASE_LOGGING, PHASE_SERIALIZATION
 
 router = APIRouter(prefix="/stocks", tags=["stocks"])
 
 
+def _etag(symbol: str, history: PriceHistory) -> str:
+    return make_etag("stock", symbol, fingerprint_prices(history.close), StockPredictionModel.current_version())
+
+
+async def _predict_history(symbol: str, history: PriceHistory) -> Dict[str, Any]:
+    """Prediction for a stored history, reused while the history and model are unchanged."""
+    cache_key = prediction_cache.key(
+        "stock", symbol, fingerprint_prices(history.close), StockPredictionModel.current_version()
+    )
+    prediction_result = prediction_cache.get(cache_key)
+    if prediction_result is None:
+        # Generate prediction off the event loop from the mapped close column
+        prediction_result = await inference_executor.run(StockPredictionModel.predict_prices, history.close)
+        prediction_cache.put(cache_key, prediction_result)
+    return prediction_result
+
+
+def _log_document(symbol: str, prediction_result: Dict[str, Any], current_user: Optional[User]) -> Dict[str, Any]:
+    return log_document("stock", prediction_result, current_user.id if current_user else None, symbol=symbol)
+
+
+def _to_prediction(symbol: str, prediction_result: Dict[str, Any]) -> StockPrediction:
+    return StockPrediction(
+        symbol=symbol,
+        prediction_type="stock",
+        probability=prediction_result["probability"],
+        confidence=prediction_result["confidence"],
+        direction=prediction_result["direction"],
+        price_target=prediction_result.get("price_target"),
+        current_price=prediction_result.get("current_price"),
+        model_version=prediction_result["model_version"],
+        metadata=prediction_result.get("metadata", {})
+    )
+
+
+async def build_snapshot(symbol: str) -> Dict[str, Any]:
+    """Snapshot of the /stocks/predictions response for a symbol (see PredictionSnapshots)."""
+    history = await price_ingestion.ensure_history(symbol)
+    prediction_result = await _predict_history(symbol, history)
+    return make_snapshot(
+        _to_prediction(symbol, prediction_result).model_dump(mode="json"),
+        StockPredictionModel.current_version(),
+        _etag(symbol, history),
+        history.modified_at,
+        settings.price_refresh_seconds,
+        [_log_document(symbol, prediction_result, None)]
+    )
+
+
 @router.get("/predictions", response_model=StockPrediction)
 async def get_stock_prediction(
+    request: Request,
+    response: Response,
     symbol: str = Query(..., description="Stock ticker symbol (e.g., AAPL, MSFT)"),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Get stock prediction for a given symbol.
     
+    The response carries an ETag for the stored price history and model
+    version; a request whose If-None-Match matches it gets an empty 304
+    without running the model. Cache-Control allows reuse for
+    PRICE_REFRESH_SECONDS, the interval at which the history is re-checked.
+    Symbols in SNAPSHOT_STOCK_SYMBOLS are served from their precomputed
+    snapshot while it is fresh.
+    
     Args:
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for the caching headers)
         symbol: Stock ticker symbol
         current_user: Authenticated user (optional for this endpoint)
-        
+    
     Returns:
         Stock prediction with probability, confidence, and direction
     """
+    symbol = symbol.upper()
+    snapshot = prediction_snapshots.get(f"stock:{symbol}", StockPredictionModel.current_version())
+    if snapshot is not None:
+        return await serve_snapshot(snapshot, request, current_user.id if current_user else None)
+    
     try:
-        # Fetch stock data from Alpha Vantage
-        stock_data = await AlphaVantageAPI.get_stock_data(symbol.upper())
+        # Bring the local price history up to date (full backfill once, then compact deltas)
+        history = await price_ingestion.ensure_history(symbol)
+        
+        headers = cache_headers(_etag(symbol, history), history.modified_at, settings.price_refresh_seconds)
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
         
-        # Generate prediction
-        prediction_result = StockPredictionModel.predict(stock_data)
+        # Unchanged history and model: reuse the stored prediction
+        prediction_result = await _predict_history(symbol, history)
         
         # Log prediction to MongoDB
-        mongodb = await get_mongodb()
-        await mongodb["prediction_logs"].insert_one({
-            "prediction_type": "stock",
-            "symbol": symbol.upper(),
-            "prediction": prediction_result,
-            "timestamp": prediction_result.get("metadata", {}).get("timestamp"),
-            "user_id": current_user.id if current_user else None
-        })
+        with phase(PHASE_LOGGING):
+            mongodb = await get_mongodb()
+            await mongodb["prediction_logs"].insert_one(_log_document(symbol, prediction_result, current_user))
         
         # Return prediction
-        return StockPrediction(
-            symbol=symbol.upper(),
-            prediction_type="stock",
-            probability=prediction_result["probability"],
-            confidence=prediction_result["confidence"],
-            direction=prediction_result["direction"],
-            price_target=prediction_result.get("price_target"),
-            current_price=prediction_result.get("current_price"),
-            model_version=prediction_result["model_version"],
-            metadata=prediction_result.get("metadata", {})
+        with phase(PHASE_SERIALIZATION):
+            return _to_prediction(symbol, prediction_result)
+    
+    except InferenceBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Prediction capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(settings.inference_retry_after_seconds)}
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
         )
-        
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate prediction: {str(e)}"
         )
+
+
+# Most symbols accepted by /stocks/quotes (one bulk upstream call)
+MAX_QUOTE_SYMBOLS = AlphaVantageAPI.BULK_QUOTE_LIMIT
+
+
+def _number(value, cast=float):
+    """Parse an Alpha Vantage numeric string, or None if absent/invalid."""
+    try:
+        return cast(float(str(value).rstrip("%")))
+    except (TypeError, ValueError):
+        return None
+
+
+@router.get("/quotes", response_model=StockQuotesResponse)
+async def get_stock_quotes(
+    symbols: str = Query(..., description="Comma-separated ticker symbols (e.g., AAPL,MSFT,GOOGL)"),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Get latest quotes for a watchlist in one request.
+    
+    Args:
+        symbols: Comma-separated ticker symbols
+        current_user: Authenticated user (optional for this endpoint)
+    
+    Returns:
+        Quotes for the known symbols and the list of symbols without a quote
+    """
+    requested = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(requested) > MAX_QUOTE_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_QUOTE_SYMBOLS} symbols per request")
+    
+    try:
+        quotes = await AlphaVantageAPI.get_quotes(requested)
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch quotes: {str(e)}"
+        )
+    
+    with phase(PHASE_SERIALIZATION):
+        results = []
+        for symbol in requested:
+            quote = quotes.get(symbol, {}).get("Global Quote")
+            price = _number(quote.get("05. price")) if quote else None
+            if price is None:
+                continue
+            results.append(StockQuote(
+                symbol=symbol,
+                price=price,
+                open=_number(quote.get("02. open")),
+                high=_number(quote.get("03. high")),
+                low=_number(quote.get("04. low")),
+                volume=_number(quote.get("06. volume"), int),
+                previous_close=_number(quote.get("08. previous close")),
+                change=_number(quote.get("09. change")),
+                change_percent=_number(quote.get("10. change percent")),
+                latest_trading_day=quote.get("07. latest trading day")
+            ))
+        found = {quote.symbol for quote in results}
+        return StockQuotesResponse(
+            quotes=results,
+            missing=[symbol for symbol in requested if symbol not in found]
+        )
+
+
+for _symbol in settings.snapshot_stock_symbols_list:
+    prediction_snapshots.add_job(f"stock:{_symbol}", functools.partial(build_snapshot, _symbol))
@@ -29,11 +29,88 @@ class SportsPrediction(PredictionBase):
     event_id: str
     prediction_type: str = "sports"
     team: Optional[str] = None
-    outcome: str  # 'win', 'loss', 'over', 'under', etc.
+    outcome: str  # 'win', 'loss', 'cover', 'no_cover', 'over', 'under', etc.
+    market: str = "h2h"  # 'h2h', 'spreads' or 'totals'
+    point: Optional[float] = None  # home team's spread or the total line
     odds: Optional[float] = None
     implied_probability: Optional[float] = None
 
 
+class SportsSlate(BaseModel):
+    """One sport/markets/regions combination to fetch odds for."""
+    sport: str
+    markets: str = "h2h"
+    regions: str = "us"
+
+
+class MultiSportPredictionsRequest(BaseModel):
+    """Slates to predict in one request."""
+    slates: List[SportsSlate]
+
+
+class SlatePredictions(SportsSlate):
+    """Predictions for one slate, or the error that prevented them."""
+    predictions: List[SportsPrediction] = []
+    error: Optional[str] = None
+
+
+class MultiSportPredictionsResponse(BaseModel):
+    """Predictions grouped by slate, in request order."""
+    results: List[SlatePredictions]
+
+
+class BestLine(BaseModel):
+    """Best price for one outcome across bookmakers."""
+    event_id: str
+    market: str
+    outcome: str
+    point: Optional[float] = None
+    bookmaker: str
+    price: float
+    decimal_odds: float
+    implied_probability: float
+    model_probability: Optional[float] = None
+    expected_value: Optional[float] = None
+
+
+class Arbitrage(BaseModel):
+    """A line whose best prices guarantee a profit of `margin` per unit staked."""
+    event_id: str
+    market: str
+    line: float
+    margin: float
+    legs: List[BestLine]
+
+
+class LineScanResponse(BaseModel):
+    """Best lines, arbitrages and value lines for one slate."""
+    sport: str
+    markets: List[str]
+    best_lines: List[BestLine]
+    arbitrages: List[Arbitrage]
+    value_lines: List[BestLine]
+
+
+class StockQuote(BaseModel):
+    """Latest quote for one stock."""
+    symbol: str
+    price: float
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    volume: Optional[int] = None
+    previous_close: Optional[float] = None
+    change: Optional[float] = None
+    change_percent: Optional[float] = None
+    latest_trading_day: Optional[str] = None
+
+
+class StockQuotesResponse(BaseModel):
+    """Quotes for a list of stocks."""
+    quotes: List[StockQuote]
+    missing: List[str] = []
+
+
 class UserPickCreate(BaseModel):
     """Schema for creating a user pick."""
     prediction_type: str
@@ -0,0 +1,213 @@
+"""Vectorized walk-forward backtesting for the stock prediction model."""
+import time
+import numpy as np
+from typing import Any, Dict, Mapping, Optional, Tuple
+from app.services.prediction_models import StockPredictionModel
+
+# Trading days per year, for the default training window
+TRADING_DAYS = 252
+
+CALIBRATION_BINS = 10
+
+
+def closes_from_payload(price_data: Dict[str, Any]) -> np.ndarray:
+    """
+    Extract closing prices (oldest first) from a TIME_SERIES_DAILY payload.
+    
+    Args:
+        price_data: Alpha Vantage daily payload
+    
+    Returns:
+        Array of closing prices
+    """
+    time_series = price_data.get("Time Series (Daily)", {})
+    return np.array([float(time_series[date]["4. close"]) for date in sorted(time_series)])
+
+
+def labeled_rows(prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the model features for every date and the next-day direction labels.
+    
+    The last date has no next day, so it is dropped.
+    
+    Returns:
+        (features, labels, positions) where labels[i] is 1.0 if the close after
+        row i's date is higher and positions[i] is that date's index in prices
+    """
+    prices = np.asarray(prices, dtype=float)
+    features = StockPredictionModel.feature_matrix(prices)[:-1]
+    window = StockPredictionModel.MIN_HISTORY
+    labels = (prices[window:] > prices[window - 1:-1]).astype(float)
+    positions = np.arange(window - 1, len(prices) - 1)
+    # Guard against bad prices (zeros) producing inf/nan features
+    valid = np.isfinite(features).all(axis=1)
+    return features[valid], labels[valid], positions[valid]
+
+
+def features_and_labels(prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """labeled_rows without the date positions."""
+    features, labels, _ = labeled_rows(prices)
+    return features, labels
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -500, 500)))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, C: float = 1.0, max_iter: int = 50, tol: float = 1e-8) -> np.ndarray:
+    """
+    Fit many L2-regularized logistic regressions at once with Newton's method.
+    
+    Minimizes the same objective as sklearn's LogisticRegression(C=C) (the
+    intercept is not penalized), batched over the leading axis so every
+    walk-forward fold is solved in one set of array operations.
+    
+    Args:
+        X: Features of shape (batch, samples, features)
+        y: Labels (0/1) of shape (batch, samples)
+        C: Inverse regularization strength
+        max_iter: Maximum Newton iterations
+        tol: Stop when the largest step is below this
+    
+    Returns:
+        Weights of shape (batch, features + 1), intercept last
+    """
+    batch, samples, n_features = X.shape
+    Xa = np.concatenate([X, np.ones((batch, samples, 1))], axis=2)
+    Xt = Xa.transpose(0, 2, 1)
+    penalty = np.diag(np.append(np.full(n_features, 1.0 / C), 0.0))
+    w = np.zeros((batch, n_features + 1))
+    
+    for _ in range(max_iter):
+        p = _sigmoid(np.matmul(Xa, w[..., None])[..., 0])
+        gradient = np.matmul(Xt, (p - y)[..., None])[..., 0] + w @ penalty
+        hessian = np.matmul(Xt * (p * (1 - p))[:, None, :], Xa) + penalty
+        step = np.linalg.solve(hessian, gradient[..., None])[..., 0]
+        w -= step
+        if np.abs(step).max() < tol:
+            break
+    return w
+
+
+def predict_logistic(X: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Probabilities from fit_logistic weights; X is (..., features) broadcast against w."""
+    return _sigmoid(np.einsum("...i,...i->...", X, w[..., :-1]) + w[..., -1])
+
+
+def walk_forward(
+    features: np.ndarray,
+    labels: np.ndarray,
+    train_days: int = TRADING_DAYS,
+    test_days: int = 21,
+    C: float = 1.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling train/test evaluation over one symbol's history.
+    
+    Each fold trains on the `train_days` rows before its start and predicts
+    the next `test_days` rows; folds are contiguous and never overlap, and
+    all folds are fitted in one batched solve.
+    
+    Returns:
+        (probabilities, labels) for every out-of-sample row, in date order
+    """
+    n = len(labels)
+    starts = np.arange(train_days, n, test_days)
+    if len(starts) == 0:
+        return np.empty(0), np.empty(0)
+    
+    train_index = starts[:, None] - train_days + np.arange(train_days)
+    w = fit_logistic(features[train_index], labels[train_index], C=C)
+    
+    test_index = starts[:, None] + np.arange(test_days)
+    in_range = test_index < n
+    test_index = np.minimum(test_index, n - 1)
+    probabilities = predict_logistic(features[test_index], w[:, None, :])
+    return probabilities[in_range], labels[test_index][in_range]
+
+
+def evaluate(probabilities: np.ndarray, labels: np.ndarray, bins: int = CALIBRATION_BINS) -> Dict[str, Any]:
+    """
+    Score out-of-sample predictions.
+    
+    Returns:
+        Dictionary with predictions, base_rate, hit_rate, brier, log_loss,
+        calibration (per-bin count, mean prediction, observed frequency) and
+        expected calibration error (ece)
+    """
+    n = len(labels)
+    if n == 0:
+        return {"predictions": 0}
+    
+    clipped = np.clip(probabilities, 1e-12, 1 - 1e-12)
+    bin_index = np.minimum((probabilities * bins).astype(int), bins - 1)
+    counts = np.bincount(bin_index, minlength=bins)
+    predicted_sum = np.bincount(bin_index, weights=probabilities, minlength=bins)
+    observed_sum = np.bincount(bin_index, weights=labels, minlength=bins)
+    occupied = counts > 0
+    mean_predicted = np.divide(predicted_sum, counts, out=np.zeros(bins), where=occupied)
+    observed = np.divide(observed_sum, counts, out=np.zeros(bins), where=occupied)
+    
+    return {
+        "predictions": int(n),
+        "base_rate": float(labels.mean()),
+        "hit_rate": float(((probabilities > 0.5) == (labels > 0.5)).mean()),
+        "brier": float(np.mean((probabilities - labels) ** 2)),
+        "log_loss": float(-np.mean(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped))),
+        "ece": float(np.sum(counts * np.abs(mean_predicted - observed)) / n),
+        "calibration": [
+            {
+                "bin": [i / bins, (i + 1) / bins],
+                "count": int(counts[i]),
+                "mean_predicted": float(mean_predicted[i]),
+                "observed": float(observed[i]),
+            }
+            for i in range(bins) if occupied[i]
+        ],
+    }
+
+
+def run_backtest(
+    histories: Mapping[str, np.ndarray],
+    train_days: int = TRADING_DAYS,
+    test_days: int = 21,
+    C: float = 1.0,
+    model_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Walk-forward backtest of the stock model across many symbols.
+    
+    Args:
+        histories: Symbol -> closing prices (oldest first)
+        train_days: Rows in each training window
+        test_days: Rows predicted by each fold
+        C: Inverse regularization strength of the logistic regression
+        model_version: Version the report is filed under (defaults to the serving model's)
+    
+    Returns:
+        Report with per-symbol and overall metrics
+    """
+    started = time.perf_counter()
+    symbols = {}
+    all_probabilities, all_labels = [], []
+    
+    for symbol, prices in histories.items():
+        features, labels = features_and_labels(prices)
+        probabilities, outcomes = walk_forward(features, labels, train_days, test_days, C)
+        symbols[symbol] = evaluate(probabilities, outcomes)
+        all_probabilities.append(probabilities)
+        all_labels.append(outcomes)
+    
+    overall = evaluate(
+        np.concatenate(all_probabilities) if all_probabilities else np.empty(0),
+        np.concatenate(all_labels) if all_labels else np.empty(0)
+    )
+    return {
+        "model_version": model_version or StockPredictionModel.MODEL_VERSION,
+        "features": StockPredictionModel.FEATURE_NAMES,
+        "config": {"train_days": train_days, "test_days": test_days, "C": C},
+        "symbols_tested": len(symbols),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "overall": overall,
+        "symbols": symbols,
+    }
@@ -0,0 +1,263 @@
+"""Storage backends for API cache entries and upstream request counts."""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from pymongo import UpdateOne
+
+
+class CacheBackend:
+    """
+    Where RateLimiter keeps cache entries and request counts.
+    
+    Entries are stored as the fields CacheCodec.encode produced plus a
+    naive UTC `timestamp`; decoding and freshness checks are the caller's.
+    """
+    
+    def load(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored entries among `keys`, whatever their age."""
+        raise NotImplementedError
+    
+    def store(self, entries: Dict[str, Dict[str, Any]]):
+        """Write entries (encoded fields with a timestamp) by key."""
+        raise NotImplementedError
+    
+    def reserve_request(self, api_name: str, window_seconds: int, limit: int) -> bool:
+        """
+        Count one upstream request for `api_name` in the current window.
+        
+        The count is taken before the check, so workers reserving at the
+        same time cannot all pass it. Returns False if the request would
+        exceed `limit` and must not be sent.
+        """
+        raise NotImplementedError
+    
+    def invalidate(self, keys: List[str]):
+        """Drop entries, for every worker."""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class MongoCacheBackend(CacheBackend):
+    """
+    The `api_cache` and `rate_limits` MongoDB collections.
+    
+    Request counts are a sliding window: one document per request, counted
+    by timestamp. A reservation inserts its document first and takes it
+    back if the count is then over the limit, so concurrent reservations
+    may refuse more than needed but never admit too many.
+    """
+    
+    def __init__(self, db: Callable[[], Any]):
+        self._get_db = db
+    
+    @property
+    def cache_collection(self):
+        return self._get_db()["api_cache"]
+    
+    @property
+    def rate_limit_collection(self):
+        return self._get_db()["rate_limits"]
+    
+    def load(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        if len(keys) == 1:
+            document = self.cache_collection.find_one({"key": keys[0]})
+            return {keys[0]: document} if document else {}
+        return {document["key"]: document for document in self.cache_collection.find({"key": {"$in": keys}})}
+    
+    def store(self, entries: Dict[str, Dict[str, Any]]):
+        if len(entries) == 1:
+            (cache_key, fields), = entries.items()
+            self.cache_collection.update_one({"key": cache_key}, {"$set": {"key": cache_key, **fields}}, upsert=True)
+            return
+        self.cache_collection.bulk_write([
+            UpdateOne({"key": cache_key}, {"$set": {"key": cache_key, **fields}}, upsert=True)
+            for cache_key, fields in entries.items()
+        ], ordered=False)
+    
+    def reserve_request(self, api_name: str, window_seconds: int, limit: int) -> bool:
+        now = datetime.utcnow()
+        reservation = uuid.uuid4().hex
+        self.rate_limit_collection.insert_one({
+            "api_name": api_name,
+            "timestamp": now,
+            "reservation": reservation
+        })
+        count = self.rate_limit_collection.count_documents({
+            "api_name": api_name,
+            "timestamp": {"$gte": now - timedelta(seconds=window_seconds)}
+        })
+        if count > limit:
+            self.rate_limit_collection.delete_many({"reservation": reservation})
+            return False
+        return True
+    
+    def invalidate(self, keys: List[str]):
+        self.cache_collection.delete_many({"key": {"$in": keys}})
+
+
+def _pack(fields: Dict[str, Any]) -> bytes:
+    """One Redis value: a JSON header line, then the compressed blob or the JSON payload."""
+    timestamp = fields["timestamp"]
+    header = {"codec": fields.get("codec"), "timestamp": (timestamp - datetime(1970, 1, 1)) // timedelta(milliseconds=1)}
+    payload = fields["blob"] if fields.get("codec") else json.dumps(fields.get("data"), separators=(",", ":")).encode()
+    return json.dumps(header).encode() + b"\n" + payload
+
+
+def _unpack(value: bytes) -> Dict[str, Any]:
+    header, payload = value.split(b"\n", 1)
+    header = json.loads(header)
+    fields = {"codec": header["codec"], "timestamp": datetime(1970, 1, 1) + timedelta(milliseconds=header["timestamp"])}
+    if header["codec"]:
+        return {**fields, "data": None, "blob": payload}
+    return {**fields, "data": json.loads(payload), "blob": None}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache entries and request counts in Redis, shared by every worker.
+    
+    - entries are string keys that expire `retention_seconds` after their
+      last write (stale entries are still served when an upstream fails,
+      so this is much longer than any freshness TTL)
+    - request counts are fixed windows: one INCR counter per API and
+      window, expiring with it; the INCR is the reservation, so every
+      worker spends the same budget and none can overshoot it
+    - each worker also keeps its last `local_entries` entries in memory; a
+      write or invalidation is published on `channel`, and every other
+      worker drops its local copy of those keys
+    
+    `client` is a redis-py client (or anything with the same get, set,
+    mget, incr, expire, delete, publish, pubsub and pipeline methods); the
+    pub/sub listener starts on first use.
+    """
+    
+    def __init__(
+        self,
+        client,
+        prefix: str = "predict:",
+        retention_seconds: int = 604800,
+        local_entries: int = 256,
+        channel: Optional[str] = None
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.retention_seconds = retention_seconds
+        self.local_entries = local_entries
+        self.channel = channel or f"{prefix}invalidate"
+        # Tells this worker's own messages apart from the others'
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self.counters = {"local_hits": 0, "remote_reads": 0, "invalidations_received": 0}
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisCacheBackend":
+        import redis  # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), **kwargs)
+    
+    def _listen(self):
+        """Subscribe to invalidations once, in a background thread."""
+        if self._listener is not None or self.local_entries <= 0:
+            return
+        with self._listener_lock:
+            if self._listener is None:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_invalidation})
+                self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    
+    def _on_invalidation(self, message: Dict[str, Any]):
+        data = message.get("data")
+        worker_id, _, keys = (data.decode() if isinstance(data, bytes) else str(data)).partition(" ")
+        if worker_id == self.worker_id:
+            return
+        self.counters["invalidations_received"] += 1
+        for cache_key in json.loads(keys):
+            self._local.pop(cache_key, None)
+    
+    def _publish(self, keys: List[str]):
+        self.client.publish(self.channel, f"{self.worker_id} {json.dumps(keys)}")
+    
+    def _remember(self, cache_key: str, fields: Dict[str, Any]):
+        if self.local_entries <= 0:
+            return
+        self._local[cache_key] = fields
+        self._local.move_to_end(cache_key)
+        while len(self._local) > self.local_entries:
+            self._local.popitem(last=False)
+    
+    def load(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._listen()
+        found = {}
+        missing = []
+        for cache_key in keys:
+            fields = self._local.get(cache_key)
+            if fields is None:
+                missing.append(cache_key)
+            else:
+                found[cache_key] = fields
+        self.counters["local_hits"] += len(found)
+        if missing:
+            self.counters["remote_reads"] += 1
+            for cache_key, value in zip(missing, self.client.mget([self.prefix + k for k in missing])):
+                if value is not None:
+                    found[cache_key] = _unpack(value)
+                    self._remember(cache_key, found[cache_key])
+        return found
+    
+    def store(self, entries: Dict[str, Dict[str, Any]]):
+        self._listen()
+        pipeline = self.client.pipeline()
+        for cache_key, fields in entries.items():
+            pipeline.set(self.prefix + cache_key, _pack(fields), ex=self.retention_seconds)
+        pipeline.execute()
+        for cache_key, fields in entries.items():
+            self._remember(cache_key, fields)
+        self._publish(list(entries))
+    
+    def _window_key(self, api_name: str, window_seconds: int) -> str:
+        return f"{self.prefix}requests:{api_name}:{int(time.time() // window_seconds)}"
+    
+    def reserve_request(self, api_name: str, window_seconds: int, limit: int) -> bool:
+        key = self._window_key(api_name, window_seconds)
+        pipeline = self.client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, window_seconds * 2)
+        count, _ = pipeline.execute()
+        return int(count) <= limit
+    
+    def invalidate(self, keys: List[str]):
+        self.client.delete(*[self.prefix + k for k in keys])
+        for cache_key in keys:
+            self._local.pop(cache_key, None)
+        self._publish(keys)
+    
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "local_entries": len(self._local), **self.counters}
+
+
+def cache_backend_for(name: str, url: str = "", **kwargs) -> Optional[CacheBackend]:
+    """
+    Backend named by the CACHE_BACKEND setting.
+    
+    Returns:
+        None for "mongodb" (RateLimiter's default), a RedisCacheBackend for
+        "redis" (no connection is made until first use)
+    """
+    if name == "mongodb":
+        return None
+    if name == "redis":
+        return RedisCacheBackend.from_url(url, **kwargs)
+    raise ValueError(f"Unknown cache backend: {name}")
@@ -0,0 +1,123 @@
+"""Compressed binary encoding for large API cache entries."""
+import json
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+def _serializer() -> str:
+    return "msgpack" if msgpack is not None else "json"
+
+
+def _dumps(serializer: str, data: Any) -> bytes:
+    if serializer == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _loads(serializer: str, raw: bytes) -> Any:
+    if serializer == "msgpack":
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+class CacheCodec:
+    """
+    Encodes cache payloads as a compressed blob once they are large enough.
+    
+    A payload whose serialized size reaches `min_bytes` is stored as
+    {"blob": <bytes>, "codec": "<serializer>+<compression>"} instead of a BSON
+    document, so MongoDB stores and transfers the compressed bytes and the
+    server never parses the nested payload. msgpack is used when installed,
+    JSON otherwise; zstd when installed and requested, zlib otherwise.
+    Smaller payloads, and every payload with compression "none", are stored
+    as plain documents. Entries stay readable whatever the current settings,
+    since each one records its own codec.
+    """
+    
+    def __init__(self, compression: str = "zlib", min_bytes: int = 16384, level: int = 3):
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        if compression not in ("none", "zlib", "zstd"):
+            raise ValueError(f"Unknown cache compression: {compression}")
+        self.compression = compression
+        self.min_bytes = min_bytes
+        self.level = level
+        self.counters = {
+            "encoded": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+            "decoded": 0,
+            "decode_ms": 0.0,
+        }
+    
+    def _compress(self, raw: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return zlib.compress(raw, self.level)
+    
+    @staticmethod
+    def _decompress(compression: str, blob: bytes) -> bytes:
+        if compression == "zstd":
+            if zstandard is None:
+                raise ValueError("zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return zlib.decompress(blob)
+    
+    def encode(self, data: Any) -> Dict[str, Any]:
+        """Fields to store for a payload: plain `data`, or a compressed `blob` and its `codec`."""
+        if self.compression == "none":
+            return {"data": data, "blob": None, "codec": None}
+        serializer = _serializer()
+        raw = _dumps(serializer, data)
+        if len(raw) < self.min_bytes:
+            return {"data": data, "blob": None, "codec": None}
+        blob = self._compress(raw)
+        self.counters["encoded"] += 1
+        self.counters["raw_bytes"] += len(raw)
+        self.counters["stored_bytes"] += len(blob)
+        return {"data": None, "blob": blob, "codec": f"{serializer}+{self.compression}"}
+    
+    def decode(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        A cache entry with `data` filled in.
+        
+        Returns:
+            The entry, or None if its codec cannot be read here (treated as a miss)
+        """
+        codec = entry.get("codec")
+        if not codec:
+            return entry
+        started = time.perf_counter()
+        try:
+            serializer, compression = codec.split("+")
+            if serializer not in ("json", "msgpack") or compression not in ("zlib", "zstd"):
+                return None
+            if serializer == "msgpack" and msgpack is None:
+                return None
+            data = _loads(serializer, self._decompress(compression, entry["blob"]))
+        except (ValueError, zlib.error):
+            return None
+        self.counters["decoded"] += 1
+        self.counters["decode_ms"] += (time.perf_counter() - started) * 1000
+        return {**entry, "data": data}
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "serializer": _serializer(),
+            "min_bytes": self.min_bytes,
+            **self.counters,
+            "decode_ms": round(self.counters["decode_ms"], 3),
+            "bytes_saved": self.counters["raw_bytes"] - self.counters["stored_bytes"],
+        }
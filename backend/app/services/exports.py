@@ -0,0 +1,170 @@
+"""Streaming NDJSON and CSV exports of prediction logs and user picks."""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import select
+from app.models import UserPick
+from app.services.prediction_logs import ARCHIVE_COLUMNS, log_row
+
+# Export format -> media type
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+LOG_EXPORT_COLUMNS = ("prediction_type",) + ARCHIVE_COLUMNS
+PICK_EXPORT_COLUMNS = ("id", "user_id", "prediction_type", "symbol_or_event", "confidence", "created_at", "prediction")
+
+
+def utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """A query bound as naive UTC, the way prediction_logs timestamps are stored."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=_json_default)
+    return value
+
+
+class RowEncoder:
+    """
+    Encodes batches of row dicts as NDJSON lines or CSV records.
+    
+    NDJSON rows keep nested values (the prediction) as objects; CSV writes
+    them as JSON text. Datetimes are ISO 8601 in both.
+    """
+    
+    def __init__(self, columns: Sequence[str], export_format: str):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.columns = columns
+        self.export_format = export_format
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+    
+    def header(self) -> bytes:
+        """The CSV header line (nothing for NDJSON)."""
+        if self.export_format != "csv":
+            return b""
+        return self._flush([self.columns])
+    
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        if self.export_format == "ndjson":
+            return "".join(
+                json.dumps({name: row[name] for name in self.columns}, separators=(",", ":"), default=_json_default) + "\n"
+                for row in rows
+            ).encode()
+        return self._flush([[_csv_value(row[name]) for name in self.columns] for row in rows])
+    
+    def _flush(self, records) -> bytes:
+        self._writer.writerows(records)
+        chunk = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def log_query(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    prediction_type: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """prediction_logs filter for logs in [start, end), optionally of one type or user."""
+    query: Dict[str, Any] = {}
+    timestamp = {}
+    if start is not None:
+        timestamp["$gte"] = utc_naive(start)
+    if end is not None:
+        timestamp["$lt"] = utc_naive(end)
+    if timestamp:
+        query["timestamp"] = timestamp
+    if prediction_type:
+        query["prediction_type"] = prediction_type
+    if user_id is not None:
+        query["user_id"] = user_id
+    return query
+
+
+async def stream_prediction_logs(
+    collection,
+    query: Dict[str, Any],
+    export_format: str,
+    batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+    """
+    Encoded prediction logs matching `query`, oldest first.
+    
+    Logs are read through one server-side cursor, `batch_size` documents per
+    round trip, and each batch is encoded and sent before the next is read,
+    so memory does not grow with the size of the export. The sort may spill
+    to disk on the server rather than fail on large ranges.
+    """
+    encoder = RowEncoder(LOG_EXPORT_COLUMNS, export_format)
+    header = encoder.header()
+    if header:
+        yield header
+    cursor = collection.find(query, {"_id": 0}, sort=[("timestamp", 1)], batch_size=batch_size, allow_disk_use=True)
+    batch = []
+    async for doc in cursor:
+        batch.append({"prediction_type": doc.get("prediction_type"), **log_row(doc)})
+        if len(batch) >= batch_size:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
+
+
+def stream_picks(
+    session_factory: Callable[[], Any],
+    export_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    prediction_type: Optional[str] = None,
+    user_id: Optional[int] = None,
+    batch_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encoded user picks created in [start, end), in id order.
+    
+    Runs in its own session for as long as the response streams. Columns
+    are selected rather than ORM objects, and `yield_per` fetches them
+    through a server-side cursor (a named cursor on PostgreSQL) `batch_size`
+    rows at a time.
+    """
+    statement = select(*(getattr(UserPick, name) for name in PICK_EXPORT_COLUMNS)).order_by(UserPick.id)
+    if start is not None:
+        statement = statement.where(UserPick.created_at >= start)
+    if end is not None:
+        statement = statement.where(UserPick.created_at < end)
+    if prediction_type:
+        statement = statement.where(UserPick.prediction_type == prediction_type)
+    if user_id is not None:
+        statement = statement.where(UserPick.user_id == user_id)
+    
+    encoder = RowEncoder(PICK_EXPORT_COLUMNS, export_format)
+    header = encoder.header()
+    if header:
+        yield header
+    session = session_factory()
+    try:
+        result = session.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.mappings().partitions():
+            rows = []
+            for row in partition:
+                row = dict(row)
+                if export_format == "ndjson":
+                    row["prediction"] = json.loads(row["prediction"])
+                rows.append(row)
+            yield encoder.encode(rows)
+    finally:
+        session.close()
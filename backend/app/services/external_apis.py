@@ -1,147 +1,394 @@
 """External API integrations for stock and sports data."""
+import asyncio
 import httpx
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 from app.config import settings
 from app.database import get_mongodb_sync
+from app.services.cache_backend import CacheBackend, MongoCacheBackend, cache_backend_for
+from app.services.cache_codec import CacheCodec
+from app.services.odds_quota import OddsQuota, OddsRefreshPolicy, request_cost
+from app.services.resilience import CircuitBreaker, call_upstream
+from app.timing import phase, PHASE_CACHE, PHASE_RATE_LIMIT
 
 
 class RateLimiter:
-    """Simple rate limiter using MongoDB for caching."""
+    """
+    Simple rate limiter and API cache.
     
-    def __init__(self, max_requests: int = 5, window_seconds: int = 60):
+    Entries and request counts live in a CacheBackend: the MongoDB
+    `api_cache` and `rate_limits` collections by default, or Redis shared
+    by every worker. Large cache payloads are stored compressed (see
+    CacheCodec) and decoded transparently on read. `limits` overrides
+    `max_requests` per window for individual APIs.
+    """
+    
+    def __init__(
+        self,
+        max_requests: int = 5,
+        window_seconds: int = 60,
+        codec: Optional[CacheCodec] = None,
+        backend: Optional[CacheBackend] = None,
+        limits: Optional[Dict[str, int]] = None
+    ):
         self.max_requests = max_requests
+        self.limits = dict(limits or {})
         self.window_seconds = window_seconds
-        self.db = get_mongodb_sync()
-        self.cache_collection = self.db["api_cache"]
-        self.rate_limit_collection = self.db["rate_limits"]
+        self.codec = codec or CacheCodec(compression="none")
+        self.backend = backend or MongoCacheBackend(lambda: self.db)
+        self._db = None
     
-    def is_allowed(self, api_name: str) -> bool:
-        """Check if API call is allowed within rate limit."""
-        now = datetime.utcnow()
-        window_start = now - timedelta(seconds=self.window_seconds)
-        
-        count = self.rate_limit_collection.count_documents({
-            "api_name": api_name,
-            "timestamp": {"$gte": window_start}
-        })
-        
-        return count < self.max_requests
+    @property
+    def db(self):
+        """MongoDB database, resolved on first use (after startup has connected)."""
+        if self._db is None:
+            self._db = get_mongodb_sync()
+        return self._db
     
-    def record_request(self, api_name: str):
-        """Record an API request."""
-        self.rate_limit_collection.insert_one({
-            "api_name": api_name,
-            "timestamp": datetime.utcnow()
-        })
+    @property
+    def cache_collection(self):
+        return self.db["api_cache"]
+    
+    @property
+    def rate_limit_collection(self):
+        return self.db["rate_limits"]
+    
+    def try_acquire(self, api_name: str) -> bool:
+        """Reserve one API call within the rate limit; False if none is left (do not call)."""
+        with phase(PHASE_RATE_LIMIT):
+            return self.backend.reserve_request(
+                api_name, self.window_seconds, self.limits.get(api_name, self.max_requests)
+            )
+    
+    def get_cached_entry(self, cache_key: str) -> Optional[Dict]:
+        """Get the raw cache entry (data and timestamp) regardless of age."""
+        with phase(PHASE_CACHE):
+            cached = self.backend.load([cache_key]).get(cache_key)
+            return self.codec.decode(cached) if cached else None
     
     def get_cached(self, cache_key: str, ttl_seconds: int = 300) -> Optional[Dict]:
         """Get cached data if still valid."""
-        cached = self.cache_collection.find_one({"key": cache_key})
+        with phase(PHASE_CACHE):
+            cached = self.backend.load([cache_key]).get(cache_key)
         if cached:
             age = (datetime.utcnow() - cached["timestamp"]).total_seconds()
             if age < ttl_seconds:
-                return cached["data"]
+                with phase(PHASE_CACHE):
+                    cached = self.codec.decode(cached)
+                return cached["data"] if cached else None
         return None
     
-    def set_cached(self, cache_key: str, data: Dict):
-        """Cache data with timestamp."""
-        self.cache_collection.update_one(
-            {"key": cache_key},
-            {
-                "$set": {
-                    "key": cache_key,
-                    "data": data,
-                    "timestamp": datetime.utcnow()
-                }
-            },
-            upsert=True
-        )
+    def get_cached_many(self, cache_keys: List[str], ttl_seconds: int = 300) -> Dict[str, Dict]:
+        """Get every still-valid cached entry among cache_keys in one query."""
+        now = datetime.utcnow()
+        with phase(PHASE_CACHE):
+            documents = self.backend.load(cache_keys)
+            fresh = {
+                cache_key: self.codec.decode(doc) for cache_key, doc in documents.items()
+                if (now - doc["timestamp"]).total_seconds() < ttl_seconds
+            }
+        return {cache_key: doc["data"] for cache_key, doc in fresh.items() if doc}
+    
+    def set_cached_many(self, entries: Dict[str, Dict]):
+        """Cache several entries in one round trip."""
+        if not entries:
+            return
+        now = datetime.utcnow()
+        with phase(PHASE_CACHE):
+            self.backend.store({
+                cache_key: {**self.codec.encode(data), "timestamp": now}
+                for cache_key, data in entries.items()
+            })
+    
+    def set_cached(self, cache_key: str, data: Dict, timestamp: Optional[datetime] = None):
+        """Cache data with timestamp (now unless given)."""
+        with phase(PHASE_CACHE):
+            self.backend.store({cache_key: {**self.codec.encode(data), "timestamp": timestamp or datetime.utcnow()}})
+    
+    def invalidate(self, *cache_keys: str):
+        """Drop cache entries (for every worker sharing the backend)."""
+        with phase(PHASE_CACHE):
+            self.backend.invalidate(list(cache_keys))
 
 
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(
+    codec=CacheCodec(
+        compression=settings.cache_compression,
+        min_bytes=settings.cache_compress_min_bytes,
+        level=settings.cache_compression_level
+    ),
+    backend=cache_backend_for(
+        settings.cache_backend,
+        settings.redis_url,
+        prefix=settings.redis_key_prefix,
+        retention_seconds=settings.cache_retention_seconds,
+        local_entries=settings.cache_local_entries
+    ),
+    limits={"the_odds_api": settings.odds_max_requests_per_minute}
+)
+odds_quota = OddsQuota(lambda: rate_limiter.db["api_quotas"])
+odds_refresh_policy = OddsRefreshPolicy()
+
+upstream_breakers = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=settings.breaker_failure_threshold,
+        reset_seconds=settings.breaker_reset_seconds,
+        slow_call_seconds=settings.breaker_slow_call_seconds
+    )
+    for name in ("alpha_vantage", "the_odds_api")
+}
+
+
+async def upstream_get(api_name: str, client: httpx.AsyncClient, url: str, params: Dict[str, Any]) -> httpx.Response:
+    """
+    GET through the upstream's circuit breaker, retrying transient errors.
+    
+    The caller reserves the first request with the rate limiter; each retry
+    reserves its own, and retrying stops when none is left.
+    """
+    return await call_upstream(
+        upstream_breakers[api_name],
+        lambda: client.get(url, params=params),
+        retries=settings.upstream_retries,
+        base_delay=settings.upstream_retry_base_delay,
+        max_delay=settings.upstream_retry_max_delay,
+        acquire=lambda: rate_limiter.try_acquire(api_name)
+    )
+
+
+def _is_fresh(entry: Optional[Dict], ttl_seconds: float) -> bool:
+    return bool(entry) and (datetime.utcnow() - entry["timestamp"]).total_seconds() < ttl_seconds
 
 
 class AlphaVantageAPI:
     """Alpha Vantage API client for stock data."""
     
-    BASE_URL = "https://www.alphavantage.co/query"
+    BASE_URL = settings.alpha_vantage_base_url
+    
+    @staticmethod
+    def check_payload(data: Dict[str, Any]):
+        """Raise if Alpha Vantage answered with an error or rate-limit notice."""
+        for key in ("Error Message", "Note", "Information"):
+            if key in data:
+                raise Exception(f"Alpha Vantage error: {data[key]}")
     
     @staticmethod
     async def get_stock_data(symbol: str) -> Dict[str, Any]:
         """
         Fetch stock data from Alpha Vantage.
         
+        If the upstream call fails, the last cached response is returned
+        regardless of age.
+        
         Args:
             symbol: Stock ticker symbol
-            
+        
         Returns:
             Dictionary containing stock data
         """
         cache_key = f"alpha_vantage_{symbol}"
         
         # Check cache first
-        cached = rate_limiter.get_cached(cache_key, ttl_seconds=300)
-        if cached:
-            return cached
+        cached = rate_limiter.get_cached_entry(cache_key)
+        if _is_fresh(cached, 300):
+            return cached["data"]
         
-        # Check rate limit
-        if not rate_limiter.is_allowed("alpha_vantage"):
+        try:
+            # Reserve a request within the rate limit
+            if not rate_limiter.try_acquire("alpha_vantage"):
+                raise Exception("Alpha Vantage rate limit exceeded. Please try again later.")
+            
+            async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
+                params = {
+                    "function": "TIME_SERIES_DAILY",
+                    "symbol": symbol,
+                    "apikey": settings.alpha_vantage_api_key,
+                    "outputsize": "compact"
+                }
+                
+                response = await upstream_get("alpha_vantage", client, AlphaVantageAPI.BASE_URL, params)
+                response.raise_for_status()
+                data = response.json()
+                
+                AlphaVantageAPI.check_payload(data)
+        except Exception:
+            if cached:
+                # Last known good data beats an error
+                return cached["data"]
+            raise
+        
+        # Cache the response
+        rate_limiter.set_cached(cache_key, data)
+        
+        return data
+    
+    @staticmethod
+    async def get_daily_series(symbol: str, outputsize: str = "compact") -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch a TIME_SERIES_DAILY payload without caching (for price ingestion).
+        
+        Args:
+            symbol: Stock ticker symbol
+            outputsize: 'compact' (latest 100 bars) or 'full' (entire history)
+        
+        Returns:
+            Tuple of (payload, response size in bytes)
+        """
+        if not rate_limiter.try_acquire("alpha_vantage"):
             raise Exception("Alpha Vantage rate limit exceeded. Please try again later.")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        # Full histories are large; give them more time than other calls
+        timeout = settings.upstream_timeout_seconds * (3 if outputsize == "full" else 1)
+        async with httpx.AsyncClient(timeout=timeout) as client:
             params = {
                 "function": "TIME_SERIES_DAILY",
                 "symbol": symbol,
                 "apikey": settings.alpha_vantage_api_key,
-                "outputsize": "compact"
+                "outputsize": outputsize
             }
             
-            response = await client.get(AlphaVantageAPI.BASE_URL, params=params)
+            response = await upstream_get("alpha_vantage", client, AlphaVantageAPI.BASE_URL, params)
             response.raise_for_status()
             data = response.json()
             
-            # Record request
-            rate_limiter.record_request("alpha_vantage")
-            
-            # Cache the response
-            rate_limiter.set_cached(cache_key, data)
+            AlphaVantageAPI.check_payload(data)
             
-            return data
+            return data, len(response.content)
     
     @staticmethod
     async def get_quote(symbol: str) -> Dict[str, Any]:
-        """Get real-time quote for a stock."""
+        """Get real-time quote for a stock (the last cached quote if the upstream call fails)."""
         cache_key = f"alpha_vantage_quote_{symbol}"
         
-        cached = rate_limiter.get_cached(cache_key, ttl_seconds=60)
-        if cached:
-            return cached
+        cached = rate_limiter.get_cached_entry(cache_key)
+        if _is_fresh(cached, 60):
+            return cached["data"]
         
-        if not rate_limiter.is_allowed("alpha_vantage"):
-            raise Exception("Alpha Vantage rate limit exceeded.")
+        try:
+            if not rate_limiter.try_acquire("alpha_vantage"):
+                raise Exception("Alpha Vantage rate limit exceeded.")
+            
+            async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
+                params = {
+                    "function": "GLOBAL_QUOTE",
+                    "symbol": symbol,
+                    "apikey": settings.alpha_vantage_api_key
+                }
+                
+                response = await upstream_get("alpha_vantage", client, AlphaVantageAPI.BASE_URL, params)
+                response.raise_for_status()
+                data = response.json()
+                
+                AlphaVantageAPI.check_payload(data)
+        except Exception:
+            if cached:
+                return cached["data"]
+            raise
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            params = {
-                "function": "GLOBAL_QUOTE",
-                "symbol": symbol,
-                "apikey": settings.alpha_vantage_api_key
+        rate_limiter.set_cached(cache_key, data)
+        
+        return data
+    
+    
+    # Most symbols Alpha Vantage accepts in one REALTIME_BULK_QUOTES call
+    BULK_QUOTE_LIMIT = 100
+    
+    @staticmethod
+    def quote_from_bulk(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a REALTIME_BULK_QUOTES row to the GLOBAL_QUOTE payload shape."""
+        change_percent = str(row.get("change_percent", ""))
+        return {
+            "Global Quote": {
+                "01. symbol": row.get("symbol", "").upper(),
+                "02. open": row.get("open"),
+                "03. high": row.get("high"),
+                "04. low": row.get("low"),
+                "05. price": row.get("close"),
+                "06. volume": row.get("volume"),
+                "07. latest trading day": str(row.get("timestamp", ""))[:10],
+                "08. previous close": row.get("previous_close"),
+                "09. change": row.get("change"),
+                "10. change percent": change_percent if change_percent.endswith("%") else f"{change_percent}%",
             }
-            
-            response = await client.get(AlphaVantageAPI.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            rate_limiter.record_request("alpha_vantage")
-            rate_limiter.set_cached(cache_key, data)
-            
-            return data
+        }
+    
+    @staticmethod
+    async def get_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for many symbols with as few upstream calls as possible.
+        
+        Cached quotes are read in one query; the rest are fetched in
+        REALTIME_BULK_QUOTES batches of up to BULK_QUOTE_LIMIT symbols (one
+        rate-limit slot per batch) and cached per symbol, so get_quote
+        benefits from them too. If a batch fails, the last cached quotes are
+        used for its symbols; the error is raised only if none are cached.
+        
+        Args:
+            symbols: Stock ticker symbols
+        
+        Returns:
+            Symbol -> GLOBAL_QUOTE-shaped payload; symbols upstream does not know are omitted
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        cache_keys = {symbol: f"alpha_vantage_quote_{symbol}" for symbol in symbols}
+        
+        cached = rate_limiter.get_cached_many(list(cache_keys.values()), ttl_seconds=60)
+        quotes = {symbol: cached[key] for symbol, key in cache_keys.items() if key in cached}
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if not missing:
+            return quotes
+        
+        async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
+            for start in range(0, len(missing), AlphaVantageAPI.BULK_QUOTE_LIMIT):
+                batch = missing[start:start + AlphaVantageAPI.BULK_QUOTE_LIMIT]
+                
+                try:
+                    if not rate_limiter.try_acquire("alpha_vantage"):
+                        raise Exception("Alpha Vantage rate limit exceeded.")
+                    
+                    params = {
+                        "function": "REALTIME_BULK_QUOTES",
+                        "symbol": ",".join(batch),
+                        "apikey": settings.alpha_vantage_api_key
+                    }
+                    
+                    response = await upstream_get("alpha_vantage", client, AlphaVantageAPI.BASE_URL, params)
+                    response.raise_for_status()
+                    data = response.json()
+                    
+                    AlphaVantageAPI.check_payload(data)
+                except Exception:
+                    stale = rate_limiter.get_cached_many([cache_keys[symbol] for symbol in batch], ttl_seconds=float("inf"))
+                    if not stale:
+                        raise
+                    quotes.update({symbol: stale[cache_keys[symbol]] for symbol in batch if cache_keys[symbol] in stale})
+                    continue
+                
+                fetched = {}
+                for row in data.get("data", []):
+                    quote = AlphaVantageAPI.quote_from_bulk(row)
+                    symbol = quote["Global Quote"]["01. symbol"]
+                    if symbol in cache_keys:
+                        fetched[symbol] = quote
+                rate_limiter.set_cached_many({cache_keys[symbol]: quote for symbol, quote in fetched.items()})
+                quotes.update(fetched)
+        
+        return quotes
+
+
+def normalize_keys(value: str, default: str) -> str:
+    """A comma-separated parameter stripped, deduplicated and sorted (`default` if empty)."""
+    return ",".join(sorted({item.strip() for item in value.split(",") if item.strip()})) or default
 
 
 class TheOddsAPI:
     """The Odds API client for sports betting data."""
     
-    BASE_URL = "https://api.the-odds-api.com/v4"
+    BASE_URL = settings.the_odds_api_base_url
+    
+    # Cache key -> fetch in progress, shared by concurrent misses
+    _in_flight: Dict[str, "asyncio.Future"] = {}
     
     @staticmethod
     async def get_sports_odds(
@@ -150,26 +397,91 @@ class TheOddsAPI:
         regions: str = "us"
     ) -> List[Dict[str, Any]]:
         """
-        Fetch sports odds from The Odds API.
+        Fetch sports odds from The Odds API (see get_sports_odds_entry).
         
         Args:
             sport: Sport key (e.g., 'basketball_nba', 'americanfootball_nfl')
             markets: Comma-separated markets (e.g., 'h2h', 'spreads', 'totals')
             regions: Comma-separated regions (e.g., 'us', 'uk')
-            
+        
         Returns:
             List of events with odds
         """
+        return (await TheOddsAPI.get_sports_odds_entry(sport, markets, regions))["data"]
+    
+    @staticmethod
+    async def get_sports_odds_entry(
+        sport: str = "basketball_nba",
+        markets: str = "h2h",
+        regions: str = "us"
+    ) -> Dict[str, Any]:
+        """
+        Fetch sports odds from The Odds API, with when they were fetched.
+        
+        Cached odds are refreshed on an adaptive schedule (see OddsRefreshPolicy):
+        often when games are imminent or live, rarely when they are far off,
+        and less often across the board when the monthly quota is running low.
+        Concurrent misses for the same slate share one upstream call, and
+        markets and regions are normalized first, so "spreads,h2h" and
+        "h2h,spreads" are one cache entry. Once the quota or the per-minute
+        request cap (ODDS_MAX_REQUESTS_PER_MINUTE) is spent, or when the
+        upstream call fails, cached odds are served however old they are.
+        
+        Args:
+            sport: Sport key (e.g., 'basketball_nba', 'americanfootball_nfl')
+            markets: Comma-separated markets (e.g., 'h2h', 'spreads', 'totals')
+            regions: Comma-separated regions (e.g., 'us', 'uk')
+        
+        Returns:
+            {"data": events with odds, "timestamp": when they were fetched
+            (UTC), "ttl": seconds they stay fresh from then}
+        """
+        markets = normalize_keys(markets, "h2h")
+        regions = normalize_keys(regions, "us")
         cache_key = f"the_odds_{sport}_{markets}_{regions}"
+        cost = request_cost(markets, regions)
         
-        cached = rate_limiter.get_cached(cache_key, ttl_seconds=300)
+        cached = rate_limiter.get_cached_entry(cache_key)
+        with phase(PHASE_RATE_LIMIT):
+            budget = odds_quota.load()
         if cached:
-            return cached
+            ttl = odds_refresh_policy.ttl_seconds(cache_key, cached["data"], cost, budget)
+            stale = {"data": cached["data"], "timestamp": cached["timestamp"], "ttl": ttl}
+            if (datetime.utcnow() - cached["timestamp"]).total_seconds() < ttl:
+                return stale
         
-        if not rate_limiter.is_allowed("the_odds_api"):
+        if budget and budget["remaining"] < cost:
+            if cached:
+                return stale
+            raise Exception("The Odds API usage quota is exhausted. Please try again later.")
+
+        fetch = TheOddsAPI._in_flight.get(cache_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(TheOddsAPI._fetch_odds(sport, markets, regions, cache_key, cost))
+            TheOddsAPI._in_flight[cache_key] = fetch
+            fetch.add_done_callback(lambda done: TheOddsAPI._fetch_done(cache_key, done))
+        try:
+            # Shielded: one caller going away does not cancel the others' fetch
+            return await asyncio.shield(fetch)
+        except Exception:
+            if cached:
+                return stale
+            raise
+    
+    @staticmethod
+    def _fetch_done(cache_key: str, fetch: "asyncio.Future"):
+        TheOddsAPI._in_flight.pop(cache_key, None)
+        # Mark the error retrieved in case every caller went away
+        if not fetch.cancelled():
+            fetch.exception()
+    
+    @staticmethod
+    async def _fetch_odds(sport: str, markets: str, regions: str, cache_key: str, cost: int) -> Dict[str, Any]:
+        """Fetch a slate's odds upstream and cache them (one call per miss, see get_sports_odds_entry)."""
+        if not rate_limiter.try_acquire("the_odds_api"):
             raise Exception("The Odds API rate limit exceeded. Please try again later.")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
             url = f"{TheOddsAPI.BASE_URL}/sports/{sport}/odds"
             params = {
                 "apiKey": settings.the_odds_api_key,
@@ -177,11 +489,79 @@ class TheOddsAPI:
                 "regions": regions
             }
             
-            response = await client.get(url, params=params)
+            response = await upstream_get("the_odds_api", client, url, params)
+            # Quota headers are sent on errors too (e.g. 401 once the quota is spent)
+            with phase(PHASE_RATE_LIMIT):
+                odds_quota.update_from_headers(response.headers)
             response.raise_for_status()
             data = response.json()
-            
-            rate_limiter.record_request("the_odds_api")
-            rate_limiter.set_cached(cache_key, data)
-            
-            return data
+        
+        # BSON dates keep milliseconds: stamp the entry as it will read back
+        now = datetime.utcnow()
+        fetched_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        rate_limiter.set_cached(cache_key, data, fetched_at)
+        
+        return {
+            "data": data,
+            "timestamp": fetched_at,
+            "ttl": odds_refresh_policy.ttl_seconds(cache_key, data, cost, odds_quota.last)
+        }
+    
+    # Quota cost of a scores request with daysFrom
+    SCORES_COST = 2
+    
+    @staticmethod
+    async def get_scores(sport: str, days_from: int = 3, max_age_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch recent and live games with scores from The Odds API.
+        
+        Responses are kept in the shared cache for `max_age_seconds` (the
+        team ratings refresh interval by default), so every worker refreshing
+        its ratings spends the quota once between them. Nothing is fetched
+        when the remaining quota cannot cover the request; the last cached
+        scores are served then, and when the upstream call fails.
+        
+        Args:
+            sport: Sport key
+            days_from: Include games completed up to this many days ago (1-3)
+            max_age_seconds: Oldest cached response to use without refreshing
+        
+        Returns:
+            List of events; completed ones carry `completed: true` and `scores`
+        """
+        cache_key = f"the_odds_scores_{sport}_{days_from}"
+        if max_age_seconds is None:
+            max_age_seconds = settings.team_ratings_refresh_seconds
+        
+        cached = rate_limiter.get_cached_entry(cache_key)
+        if _is_fresh(cached, max_age_seconds):
+            return cached["data"]
+        
+        try:
+            with phase(PHASE_RATE_LIMIT):
+                budget = odds_quota.load()
+            if budget and budget["remaining"] < TheOddsAPI.SCORES_COST:
+                raise Exception("The Odds API usage quota is exhausted. Please try again later.")
+            if not rate_limiter.try_acquire("the_odds_api"):
+                raise Exception("The Odds API rate limit exceeded. Please try again later.")
+
+            async with httpx.AsyncClient(timeout=settings.upstream_timeout_seconds) as client:
+                url = f"{TheOddsAPI.BASE_URL}/sports/{sport}/scores"
+                params = {
+                    "apiKey": settings.the_odds_api_key,
+                    "daysFrom": days_from
+                }
+                
+                response = await upstream_get("the_odds_api", client, url, params)
+                with phase(PHASE_RATE_LIMIT):
+                    odds_quota.update_from_headers(response.headers)
+                response.raise_for_status()
+                data = response.json()
+        except Exception:
+            if cached:
+                return cached["data"]
+            raise
+        
+        rate_limiter.set_cached(cache_key, data)
+        
+        return data
@@ -0,0 +1,178 @@
+"""Executor that runs CPU-bound model inference off the event loop."""
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.config import settings
+from app.timing import get_request_timer, start_request_timer
+
+
+class InferenceBusyError(Exception):
+    """Raised when the inference queue is full and the request should back off."""
+
+
+def _init_worker():
+    """Process-pool initializer: import and warm the models once per worker."""
+    from app.services.prediction_models import warmup_models
+    warmup_models()
+
+
+def _noop():
+    """Submitted at startup to spawn pool workers before the first request."""
+    return None
+
+
+def _timed_call(fn: Callable, args: tuple):
+    """
+    Run fn(*args) in a worker and time it.
+    
+    Phases recorded by the model (indicators, inference) are captured in a
+    fresh context and returned so they can be merged into the request timer.
+    """
+    def run():
+        timer = start_request_timer()
+        result = fn(*args)
+        return result, timer.phases
+    
+    started_at = time.time()
+    compute_started = time.perf_counter()
+    result, phases = contextvars.Context().run(run)
+    compute_ms = (time.perf_counter() - compute_started) * 1000
+    return result, started_at, compute_ms, phases
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class InferenceExecutor:
+    """
+    Bounded thread or process pool for model inference.
+    
+    Modes:
+        inline: run on the event loop (no offload, for tests and debugging)
+        thread: thread pool (NumPy/sklearn release the GIL for most heavy work)
+        process: process pool with the models preloaded in every worker
+    
+    At most `max_workers + max_queue` calls may be pending; beyond that
+    `run` raises InferenceBusyError instead of queueing without bound.
+    """
+    
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None, max_queue: int = 64):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Unknown inference executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = self.max_workers + max_queue
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_ms = deque(maxlen=1000)
+        self._compute_ms = deque(maxlen=1000)
+    
+    def start(self):
+        """Create the pool (and spawn process workers ahead of the first request)."""
+        if self._pool is not None or self.mode == "inline":
+            return
+        if self.mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        else:
+            # spawn, not fork: the parent has an event loop and database client threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            for _ in range(self.max_workers):
+                self._pool.submit(_noop)
+    
+    def shutdown(self):
+        """Stop the pool without waiting for queued work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """
+        Run a model function in the pool and await its result.
+        
+        Args:
+            fn: Module-level function or staticmethod (must be picklable in process mode)
+            *args: Arguments for fn
+        
+        Returns:
+            fn's return value
+        
+        Raises:
+            InferenceBusyError: If the queue is full
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise InferenceBusyError("Inference queue is full")
+        
+        if self.mode == "inline":
+            started = time.perf_counter()
+            result = fn(*args)
+            self._record(0.0, (time.perf_counter() - started) * 1000)
+            return result
+        
+        self.start()
+        self._pending += 1
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at, compute_ms, phases = await loop.run_in_executor(
+                self._pool, _timed_call, fn, args
+            )
+        finally:
+            self._pending -= 1
+        
+        wait_ms = max(0.0, (started_at - submitted_at) * 1000)
+        self._record(wait_ms, compute_ms)
+        
+        timer = get_request_timer()
+        if timer is not None:
+            timer.record("inference_wait", wait_ms)
+            for name, duration in phases.items():
+                timer.record(name, duration)
+        return result
+    
+    def _record(self, wait_ms: float, compute_ms: float):
+        self.completed += 1
+        self._wait_ms.append(wait_ms)
+        self._compute_ms.append(compute_ms)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, rejections and wait/compute time distribution (last 1000 calls)."""
+        wait, compute = list(self._wait_ms), list(self._compute_ms)
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_ms": {
+                "mean": round(sum(wait) / len(wait), 3) if wait else 0.0,
+                "p95": round(_percentile(wait, 0.95), 3),
+            },
+            "compute_ms": {
+                "mean": round(sum(compute) / len(compute), 3) if compute else 0.0,
+                "p95": round(_percentile(compute, 0.95), 3),
+            },
+        }
+
+
+inference_executor = InferenceExecutor(
+    mode=settings.inference_executor,
+    max_workers=settings.inference_workers or None,
+    max_queue=settings.inference_max_queue
+)
@@ -0,0 +1,180 @@
+"""Incremental Alpha Vantage ingestion into the local price store."""
+import asyncio
+import numpy as np
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+from app.config import settings
+from app.database import get_mongodb
+from app.services.external_apis import AlphaVantageAPI
+from app.services.price_store import PriceHistory, PriceStore, price_store
+
+# Bars in an outputsize=compact response
+COMPACT_BARS = 100
+
+# A trading day's bar is expected once it is this late in New York
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+DAILY_BAR_READY = time(18, 0)
+
+
+def market_date(now: datetime) -> date:
+    """The latest date whose daily bar should be published at `now` (naive UTC)."""
+    local = now.replace(tzinfo=timezone.utc).astimezone(MARKET_TIMEZONE)
+    return local.date() if local.time() >= DAILY_BAR_READY else local.date() - timedelta(days=1)
+
+
+def missing_bars(last_date: Optional[np.datetime64], today: date) -> int:
+    """Trading days after last_date up to and including today."""
+    if last_date is None:
+        return -1
+    return int(np.busday_count(last_date + 1, np.datetime64(today) + 1))
+
+
+class PriceIngestionService:
+    """
+    Keeps the price store current with as few upstream calls as possible.
+    
+    The first time a symbol is seen its entire history is fetched once
+    (outputsize=full). After that only compact responses (the latest 100 bars)
+    are fetched and merged by date, so repeating an ingest is harmless. A symbol
+    is not re-fetched while its stored history already includes the latest
+    published bar (see market_date) or was checked within `refresh_seconds`.
+    Nor is it re-fetched after a check found no new bar for the same market
+    date, as happens on exchange holidays. A full fetch is repeated only when
+    the gap since the last stored bar is too long for a compact response to
+    cover.
+    
+    Per-symbol state (backfilled, last stored date, last check, upstream calls
+    and bytes) is kept in the MongoDB `price_ingestion` collection.
+    """
+    
+    def __init__(
+        self,
+        store: PriceStore,
+        refresh_seconds: int = 300,
+        fetch: Callable[[str, str], Awaitable[Tuple[Dict[str, Any], int]]] = AlphaVantageAPI.get_daily_series,
+        collection=None
+    ):
+        self.store = store
+        self.refresh_seconds = refresh_seconds
+        self.fetch = fetch
+        self._collection = collection
+        # Per-symbol locks, with how many ingests hold or wait on each; a lock
+        # is dropped when its count returns to zero
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+    
+    async def collection(self):
+        if self._collection is None:
+            return (await get_mongodb())["price_ingestion"]
+        return self._collection
+    
+    async def state(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Ingestion state for a symbol, or None if it was never ingested."""
+        return await (await self.collection()).find_one({"symbol": symbol})
+    
+    def plan(self, state: Optional[Dict[str, Any]], history: Optional[PriceHistory], today: date, now: datetime) -> str:
+        """Decide what to fetch: 'full', 'compact' or 'skip'."""
+        if state is None or not state.get("backfilled") or history is None or len(history) == 0:
+            return "full"
+        missing = missing_bars(history.last_date, today)
+        if missing <= 0:
+            return "skip"
+        if missing >= COMPACT_BARS:
+            return "full"
+        if state.get("empty_for") == str(today):
+            # A holiday, or a bar published unusually late: try the next date
+            return "skip"
+        checked_at = state.get("checked_at")
+        if checked_at and (now - checked_at).total_seconds() < self.refresh_seconds:
+            return "skip"
+        return "compact"
+    
+    async def ingest(self, symbol: str, force_full: bool = False, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Bring one symbol's stored history up to date.
+        
+        Args:
+            symbol: Stock ticker symbol
+            force_full: Re-fetch the entire history even if it is stored
+            today: Override the current date (for tests and replays)
+        
+        Returns:
+            Summary with mode ('full', 'compact' or 'skip'), new_bars and bytes
+        
+        Raises:
+            Exception: If the upstream call fails and nothing is stored for the symbol
+        """
+        symbol = symbol.upper()
+        lock = self._locks.setdefault(symbol, asyncio.Lock())
+        self._lock_users[symbol] = self._lock_users.get(symbol, 0) + 1
+        try:
+            # Concurrent requests for the same symbol share one upstream call
+            async with lock:
+                return await self._ingest(symbol, force_full, today)
+        finally:
+            self._lock_users[symbol] -= 1
+            if not self._lock_users[symbol]:
+                del self._lock_users[symbol]
+                del self._locks[symbol]
+    
+    async def _ingest(self, symbol: str, force_full: bool, today: Optional[date]) -> Dict[str, Any]:
+        """ingest() for a symbol whose lock is held."""
+        now = datetime.utcnow()
+        today = today or market_date(now)
+        collection = await self.collection()
+        state = await collection.find_one({"symbol": symbol})
+        history = self.store.read(symbol)
+        mode = "full" if force_full else self.plan(state, history, today, now)
+        if mode == "skip":
+            return {"symbol": symbol, "mode": mode, "new_bars": 0, "bytes": 0}
+        
+        try:
+            data, size = await self.fetch(symbol, mode)
+        except Exception:
+            if history is not None and len(history):
+                # Serve the stored history rather than failing the request
+                return {"symbol": symbol, "mode": "stale", "new_bars": 0, "bytes": 0}
+            raise
+        
+        loop = asyncio.get_running_loop()
+        new_bars = await loop.run_in_executor(None, self.store.merge_payload, symbol, data)
+        history = self.store.read(symbol)
+        
+        state = state or {"upstream_calls": 0, "bytes_fetched": 0}
+        await collection.update_one(
+            {"symbol": symbol},
+            {
+                "$set": {
+                    "symbol": symbol,
+                    "backfilled": bool(state.get("backfilled")) or mode == "full",
+                    "first_date": str(history.dates[0]),
+                    "last_date": str(history.last_date),
+                    "bars": len(history),
+                    "checked_at": now,
+                    "last_mode": mode,
+                    # The market date this check found nothing new for
+                    "empty_for": None if new_bars else str(today),
+                    "upstream_calls": state.get("upstream_calls", 0) + 1,
+                    "bytes_fetched": state.get("bytes_fetched", 0) + size,
+                }
+            },
+            upsert=True
+        )
+        return {"symbol": symbol, "mode": mode, "new_bars": new_bars, "bytes": size}
+    
+    async def ensure_history(self, symbol: str) -> PriceHistory:
+        """
+        Stored history for a symbol, ingesting first if it is missing or stale.
+        
+        Raises:
+            Exception: If nothing is stored and the upstream call fails
+        """
+        await self.ingest(symbol)
+        history = self.store.read(symbol)
+        if history is None:
+            raise Exception(f"No price history available for {symbol}")
+        return history
+
+
+price_ingestion = PriceIngestionService(price_store, refresh_seconds=settings.price_refresh_seconds)
@@ -0,0 +1,188 @@
+"""Best prices across bookmakers, arbitrage and value lines for an odds slate."""
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.services.odds_math import implied_probabilities
+
+
+def flatten_odds(
+    events: List[Dict[str, Any]],
+    markets: Sequence[str]
+) -> Tuple[Dict[str, np.ndarray], List[str], List[str]]:
+    """
+    Every bookmaker price for `markets` in a slate, one row per price.
+    
+    Rows carry integer codes so the scan can group them with array
+    operations: the event's index, the market's index in `markets`, an
+    outcome code, and the line the outcome belongs to. The line is the home
+    team's spread for spreads (the away side of -3.5 is on line -3.5 too),
+    the total for totals, and 0 for h2h. `first` marks the outcome a
+    SportsPredictionModel probability refers to (home team, or Over).
+    
+    Returns:
+        (columns, outcome names by code, bookmaker keys by code)
+    """
+    market_codes = {market: code for code, market in enumerate(markets)}
+    outcome_codes: Dict[str, int] = {}
+    rows = []
+    bookmakers: List[str] = []
+    bookmaker_codes: Dict[str, int] = {}
+    for event_index, event in enumerate(events):
+        home_team = event.get("home_team")
+        for bookmaker in event.get("bookmakers", []):
+            key = bookmaker.get("key", "")
+            if key not in bookmaker_codes:
+                bookmaker_codes[key] = len(bookmakers)
+                bookmakers.append(key)
+            for market in bookmaker.get("markets", []):
+                market_code = market_codes.get(market.get("key"))
+                if market_code is None:
+                    continue
+                is_spread, is_total = market["key"] == "spreads", market["key"] == "totals"
+                for outcome in market.get("outcomes", []):
+                    name, price, point = outcome.get("name"), outcome.get("price"), outcome.get("point")
+                    if not isinstance(price, (int, float)) or ((is_spread or is_total) and point is None):
+                        continue
+                    first = name == "Over" if is_total else name == home_team
+                    if is_spread:
+                        line = point if first else -point
+                    else:
+                        line = point if is_total else 0.0
+                    rows.append((
+                        event_index,
+                        market_code,
+                        outcome_codes.setdefault(name, len(outcome_codes)),
+                        line,
+                        np.nan if point is None else point,
+                        first,
+                        bookmaker_codes[key],
+                        price
+                    ))
+    columns = list(zip(*rows)) or [()] * 8
+    dtypes = (np.int64, np.int64, np.int64, np.float64, np.float64, bool, np.int64, np.float64)
+    names = ("event", "market", "outcome", "line", "point", "first", "bookmaker", "price")
+    flat = {name: np.array(column, dtype=dtype) for name, column, dtype in zip(names, columns, dtypes)}
+    return flat, list(outcome_codes), bookmakers
+
+
+def _starts(*keys: np.ndarray) -> np.ndarray:
+    """Indices where any of the (sorted) key columns changes value."""
+    changed = np.zeros(len(keys[0]), dtype=bool)
+    changed[:1] = True
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(changed)
+
+
+def scan_lines(
+    events: List[Dict[str, Any]],
+    markets: Sequence[str] = ("h2h",),
+    predictions: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    min_edge: float = 0.03
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Best price per outcome across bookmakers, with arbitrage and value flags.
+    
+    The slate is flattened once and scanned with sorts and segment
+    reductions, no per-bookmaker loops:
+    - best lines: the highest decimal price for every (event, market, line,
+      outcome)
+    - arbitrages: lines whose best prices' implied probabilities sum to
+      less than 1, so backing every outcome at them guarantees a profit of
+      `margin` per unit staked
+    - value lines: best prices whose expected value under the model,
+      probability * decimal price - 1, is at least `min_edge`
+    
+    Args:
+        events: Odds API events
+        markets: Market keys to scan
+        predictions: Market -> SportsPredictionModel results aligned with
+            `events`; a prediction prices both outcomes of its own line
+            (probability and 1 - probability)
+        min_edge: Smallest expected value reported as a value line
+    
+    Returns:
+        {"best_lines": [...], "arbitrages": [...], "value_lines": [...]}
+    """
+    flat, outcome_names, bookmaker_names = flatten_odds(events, markets)
+    if not len(flat["price"]):
+        return {"best_lines": [], "arbitrages": [], "value_lines": []}
+    
+    implied = implied_probabilities(flat["price"])
+    with np.errstate(divide="ignore"):
+        decimal = 1 / implied
+    
+    # Best price per outcome: sort by line and outcome, best price first
+    order = np.lexsort((-decimal, flat["outcome"], flat["line"], flat["market"], flat["event"]))
+    event, market, line, outcome = (flat[name][order] for name in ("event", "market", "line", "outcome"))
+    best = order[_starts(event, market, line, outcome)]
+    best_decimal = decimal[best]
+    
+    # Arbitrage: best lines are grouped by (event, market, line) in this order
+    line_starts = _starts(flat["event"][best], flat["market"][best], flat["line"][best])
+    book_sum = np.add.reduceat(1 / best_decimal, line_starts)
+    sides = np.diff(np.append(line_starts, len(best)))
+    arbitrage = (sides >= 2) & (book_sum < 1)
+    
+    # Model probability for each best line that a prediction prices
+    model_probability = np.full(len(best), np.nan)
+    if predictions:
+        probability = np.full((len(events), len(markets)), np.nan)
+        point = np.full((len(events), len(markets)), np.nan)
+        for market_code, market_key in enumerate(markets):
+            for event_index, result in enumerate(predictions.get(market_key, [])):
+                if (result.get("metadata") or {}).get("error"):
+                    continue
+                probability[event_index, market_code] = result["probability"]
+                point[event_index, market_code] = 0.0 if result.get("point") is None else result["point"]
+        best_event, best_market = flat["event"][best], flat["market"][best]
+        priced = point[best_event, best_market] == flat["line"][best]
+        first_probability = probability[best_event, best_market]
+        model_probability = np.where(
+            priced,
+            np.where(flat["first"][best], first_probability, 1 - first_probability),
+            np.nan
+        )
+    expected_value = model_probability * best_decimal - 1
+    
+    best_lines = [
+        {
+            "event_id": events[event_index].get("id", ""),
+            "market": markets[market_code],
+            "outcome": outcome_names[outcome_code],
+            "point": None if math.isnan(row_point) else row_point,
+            "bookmaker": bookmaker_names[bookmaker_code],
+            "price": price,
+            "decimal_odds": row_decimal,
+            "implied_probability": row_implied,
+            "model_probability": None if math.isnan(row_probability) else row_probability,
+            "expected_value": None if math.isnan(row_value) else row_value,
+        }
+        for event_index, market_code, outcome_code, row_point, bookmaker_code, price, row_decimal, row_implied, row_probability, row_value in zip(
+            flat["event"][best].tolist(),
+            flat["market"][best].tolist(),
+            flat["outcome"][best].tolist(),
+            flat["point"][best].tolist(),
+            flat["bookmaker"][best].tolist(),
+            flat["price"][best].tolist(),
+            best_decimal.tolist(),
+            implied[best].tolist(),
+            model_probability.tolist(),
+            expected_value.tolist()
+        )
+    ]
+    
+    line_ends = np.append(line_starts[1:], len(best))
+    arbitrages = [
+        {
+            "event_id": best_lines[start]["event_id"],
+            "market": best_lines[start]["market"],
+            "line": float(flat["line"][best][start]),
+            "margin": 1 - float(book_sum[group]),
+            "legs": best_lines[start:end],
+        }
+        for group, (start, end) in enumerate(zip(line_starts.tolist(), line_ends.tolist()))
+        if arbitrage[group]
+    ]
+    value_lines = [line for line in best_lines if line["expected_value"] is not None and line["expected_value"] >= min_edge]
+    return {"best_lines": best_lines, "arbitrages": arbitrages, "value_lines": value_lines}
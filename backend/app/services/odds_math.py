@@ -0,0 +1,127 @@
+"""Vectorized odds conversion and bookmaker margin removal."""
+import numpy as np
+
+ODDS_FORMATS = ("american", "decimal", "fractional")
+VIG_METHODS = ("multiplicative", "power", "shin")
+
+# Most Newton steps for the power method and for Shin's z; both usually
+# converge to float rounding of a probability within a handful
+POWER_ITERATIONS = 30
+SHIN_ITERATIONS = 50
+
+
+def implied_probabilities(odds, odds_format: str = "american") -> np.ndarray:
+    """
+    Implied probabilities for an array of prices, element-wise.
+    
+    Args:
+        odds: Prices of any shape; NaN marks a missing outcome and stays NaN
+        odds_format: 'american' (+150 / -110), 'decimal' (2.5) or
+            'fractional' (1.5 for 3/2)
+    
+    Returns:
+        Float array of implied probabilities, same shape as `odds`
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    if odds_format == "american":
+        # +150 -> 100 / 250 and -110 -> 110 / 210: the denominator is never zero
+        return np.where(odds > 0, 100.0, np.abs(odds)) / (np.abs(odds) + 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if odds_format == "decimal":
+            return np.where(odds <= 0, 0.0, 1 / odds)
+        if odds_format == "fractional":
+            return np.where(odds < 0, 0.0, 1 / (odds + 1))
+    raise ValueError(f"Unknown odds format: {odds_format}")
+
+
+def _row_sums(p: np.ndarray) -> np.ndarray:
+    """Sum of each row ignoring NaN padding (np.nansum copies the array; this does not)."""
+    return np.add.reduce(p, axis=-1, keepdims=True, where=~np.isnan(p))
+
+
+def overround(probabilities) -> np.ndarray:
+    """Bookmaker margin of each market (row): implied probabilities summed, minus 1."""
+    return _row_sums(np.asarray(probabilities, dtype=np.float64))[..., 0] - 1
+
+
+def _multiplicative(p: np.ndarray) -> np.ndarray:
+    return p / _row_sums(p)
+
+
+def _power(p: np.ndarray) -> np.ndarray:
+    """Solve sum(p ** k) = 1 per row with Newton's method, starting from k = 1."""
+    log_p = np.log(np.where(p > 0, p, 1.0))
+    k = np.ones(p.shape[:-1] + (1,))
+    for _ in range(POWER_ITERATIONS):
+        powered = np.where(p == 0, 0.0, p ** k)
+        excess = _row_sums(powered) - 1
+        if np.all(np.abs(excess) < 1e-12):
+            break
+        slope = _row_sums(powered * log_p)
+        k = k - excess / np.where(slope < 0, slope, -1.0)
+    return _multiplicative(np.where(p == 0, 0.0, p ** k))
+
+
+def _shin_fair(z: np.ndarray, share: np.ndarray) -> np.ndarray:
+    return (np.sqrt(z ** 2 + 4 * (1 - z) * share) - z) / (2 * (1 - z))
+
+
+def _shin(p: np.ndarray) -> np.ndarray:
+    """
+    Shin's model: find the insider-trading share z per row with Newton's method.
+    
+    Each row keeps a bracket [low, high] around its root, and a step that
+    would leave it bisects instead, so rows with very large margins converge
+    too. Rows without a margin (no z >= 0 solves them) fall back to the
+    multiplicative method.
+    """
+    total = _row_sums(p)
+    share = p ** 2 / total
+    low = np.zeros_like(total)
+    high = np.ones_like(total)
+    z = low
+    for _ in range(SHIN_ITERATIONS):
+        root = np.sqrt(z ** 2 + 4 * (1 - z) * share)
+        excess = _row_sums((root - z) / (2 * (1 - z))) - 1
+        done = (np.abs(excess) < 1e-12) | (total <= 1)
+        if done.all():
+            break
+        low = np.where(excess > 0, z, low)
+        high = np.where(excess > 0, high, z)
+        slope = _row_sums((((z - 2 * share) / root - 1) * (1 - z) + root - z) / (2 * (1 - z) ** 2))
+        step = z - excess / np.where(slope < 0, slope, -1.0)
+        z = np.where(done, z, np.where((step > low) & (step < high), step, (low + high) / 2))
+    fair = _multiplicative(_shin_fair(z, share))
+    return np.where(total > 1, fair, _multiplicative(p))
+
+
+_METHODS = {"multiplicative": _multiplicative, "power": _power, "shin": _shin}
+
+
+def remove_vig(probabilities, method: str = "multiplicative") -> np.ndarray:
+    """
+    Fair probabilities for a batch of markets, one market per row.
+    
+    Args:
+        probabilities: Implied probabilities, shape (markets, outcomes); pad
+            markets with fewer outcomes with NaN
+        method: 'multiplicative' (scale each row to sum to 1), 'power' (raise
+            each probability to the exponent that makes the row sum to 1, which
+            takes more margin from longshots) or 'shin' (Shin's insider-trading
+            model)
+    
+    Returns:
+        Array of the same shape whose rows sum to 1; rows that sum to zero
+        or less are returned unchanged
+    """
+    if method not in _METHODS:
+        raise ValueError(f"Unknown vig removal method: {method}")
+    p = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+    valid = _row_sums(p)[:, 0] > 0
+    if valid.all():
+        fair = _METHODS[method](p)
+    else:
+        fair = p.copy()
+        if valid.any():
+            fair[valid] = _METHODS[method](p[valid])
+    return fair.reshape(np.shape(probabilities))
@@ -0,0 +1,157 @@
+"""Usage-quota tracking and adaptive refresh for The Odds API."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional
+
+# Events that started less than this long ago are treated as in progress
+LIVE_WINDOW = timedelta(hours=4)
+
+
+def parse_commence_time(value: str) -> Optional[datetime]:
+    """Parse an Odds API commence_time ('2024-09-06T00:20:00Z') as naive UTC."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return None
+
+
+def next_quota_reset(now: datetime) -> datetime:
+    """The Odds API quota renews monthly; assume the first of the next UTC month."""
+    first = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (first + timedelta(days=32)).replace(day=1)
+
+
+def request_cost(markets: str, regions: str) -> int:
+    """Quota cost of one odds request: one unit per market per region."""
+    return max(1, len(markets.split(","))) * max(1, len(regions.split(",")))
+
+
+class OddsQuota:
+    """
+    The Odds API usage budget, read from response headers and kept in MongoDB.
+    
+    Every odds response carries x-requests-remaining / x-requests-used /
+    x-requests-last; the latest values are stored in the `api_quotas`
+    collection so all workers share one view of the monthly budget.
+    """
+    
+    API_NAME = "the_odds_api"
+    
+    def __init__(self, collection_getter):
+        self._collection_getter = collection_getter
+        self.last: Optional[Dict[str, Any]] = None
+    
+    def load(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Current budget, or None if unknown (never seen, or from a previous quota period)."""
+        now = now or datetime.utcnow()
+        budget = self._collection_getter().find_one({"api_name": self.API_NAME})
+        if budget and next_quota_reset(budget["updated_at"]) <= now:
+            # The quota has renewed since the headers were read
+            budget = None
+        if budget:
+            budget = {key: value for key, value in budget.items() if key != "_id"}
+        self.last = budget
+        return budget
+    
+    def update_from_headers(self, headers: Mapping[str, str], now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Store the budget reported by an odds response (no-op without quota headers)."""
+        try:
+            remaining = int(float(headers["x-requests-remaining"]))
+            used = int(float(headers.get("x-requests-used", 0)))
+            last_cost = int(float(headers.get("x-requests-last", 0)))
+        except (KeyError, TypeError, ValueError):
+            return None
+        budget = {
+            "api_name": self.API_NAME,
+            "remaining": remaining,
+            "used": used,
+            "last_cost": last_cost,
+            "updated_at": now or datetime.utcnow(),
+        }
+        self._collection_getter().update_one({"api_name": self.API_NAME}, {"$set": budget}, upsert=True)
+        self.last = budget
+        return budget
+
+
+class OddsRefreshPolicy:
+    """
+    How long cached odds stay fresh.
+    
+    The base interval follows the next event on the cached slate: in-progress
+    and imminent games refresh every minute or two, slates days away only a
+    few times a day. When the combined refresh rate of every slate this
+    process polls would spend the remaining quota before it renews, all
+    intervals are stretched by the same factor so the budget lasts the month.
+    """
+    
+    # (next event starts within, refresh interval in seconds), checked in order
+    PROXIMITY_TTLS = [
+        (timedelta(0), 60),
+        (timedelta(hours=1), 120),
+        (timedelta(hours=6), 600),
+        (timedelta(hours=24), 1800),
+        (timedelta(days=3), 3 * 3600),
+    ]
+    DISTANT_TTL = 6 * 3600
+    EMPTY_TTL = 6 * 3600
+    # A slate not looked up for this many of its own refresh intervals no
+    # longer counts towards the refresh rate
+    DEMAND_EXPIRY_INTERVALS = 2
+    
+    def __init__(self):
+        # Cache key -> (quota cost per refresh, base interval, last lookup,
+        # last interval given), for slates this process polls
+        self._demand: Dict[str, tuple] = {}
+    
+    def _forget_idle(self, now: datetime):
+        """Drop slates not looked up within DEMAND_EXPIRY_INTERVALS of their interval."""
+        for cache_key, (_, base, seen, ttl) in list(self._demand.items()):
+            interval = ttl if ttl != float("inf") else base
+            if (now - seen).total_seconds() > self.DEMAND_EXPIRY_INTERVALS * interval:
+                del self._demand[cache_key]
+    
+    def base_ttl(self, events: List[Dict[str, Any]], now: datetime) -> int:
+        """Refresh interval from the soonest upcoming or in-progress event."""
+        starts = [parse_commence_time(event.get("commence_time")) for event in events]
+        upcoming = [start for start in starts if start is not None and start > now - LIVE_WINDOW]
+        if not upcoming:
+            return self.EMPTY_TTL
+        until_next = min(upcoming) - now
+        for horizon, ttl in self.PROXIMITY_TTLS:
+            if until_next <= horizon:
+                return ttl
+        return self.DISTANT_TTL
+    
+    def ttl_seconds(
+        self,
+        cache_key: str,
+        events: List[Dict[str, Any]],
+        cost: int,
+        budget: Optional[Dict[str, Any]],
+        now: Optional[datetime] = None
+    ) -> float:
+        """
+        Refresh interval for one cached slate, stretched to fit the remaining quota.
+        
+        Args:
+            cache_key: Cache key of the slate (one per sport/markets/regions)
+            events: Cached events
+            cost: Quota cost of refreshing this slate
+            budget: OddsQuota.load() result (None = unknown, no stretching)
+            now: Current UTC time
+        """
+        now = now or datetime.utcnow()
+        base = self.base_ttl(events, now)
+        self._forget_idle(now)
+        self._demand[cache_key] = (cost, base, now, base)
+        if not budget:
+            return base
+        remaining = budget["remaining"]
+        if remaining <= 0:
+            ttl = float("inf")
+        else:
+            seconds_left = max(60.0, (next_quota_reset(budget["updated_at"]) - now).total_seconds())
+            affordable_rate = remaining / seconds_left
+            wanted_rate = sum(c / interval for c, interval, _, _ in self._demand.values())
+            ttl = base * max(1.0, wanted_rate / affordable_rate)
+        self._demand[cache_key] = (cost, base, now, ttl)
+        return ttl
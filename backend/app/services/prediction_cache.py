@@ -0,0 +1,91 @@
+"""Memoized prediction results keyed by input fingerprint and model version."""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import numpy as np
+from app.config import settings
+
+
+def fingerprint_prices(prices) -> str:
+    """Digest of a closing-price series (list, array or memory-mapped column)."""
+    data = np.ascontiguousarray(prices, dtype=np.float64)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def fingerprint_event(event: Dict[str, Any]) -> str:
+    """
+    Fingerprint of an Odds API event's teams, start time and prices.
+    
+    Bookmakers stamp every price change with last_update, so when all of them
+    carry one the stamps stand in for the prices; otherwise the whole event is
+    hashed.
+    """
+    bookmakers = event.get("bookmakers") or []
+    stamps = [(b.get("key"), b.get("last_update")) for b in bookmakers]
+    if all(stamp for _, stamp in stamps):
+        return repr((event.get("home_team"), event.get("away_team"), event.get("commence_time"), stamps))
+    encoded = json.dumps(event, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a prediction result's (nested) dicts; leaves are immutable scalars."""
+    return {key: _copy(value) if isinstance(value, dict) else value for key, value in result.items()}
+
+
+class PredictionCache:
+    """
+    Least-recently-used cache of prediction results.
+    
+    Keys are (prediction type, symbol or event id, input fingerprint, model
+    version), so unchanged inputs skip indicators and inference entirely, and
+    deploying a new model version misses only for that version; entries for
+    the old one are evicted as they age out. Results are copied in and out so
+    callers can annotate them freely.
+    """
+    
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Dict[str, Any]]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    @staticmethod
+    def key(prediction_type: str, subject: str, fingerprint: str, model_version: str) -> Tuple[str, str, str, str]:
+        return (prediction_type, subject, fingerprint, model_version)
+    
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Dict[str, Any]]:
+        result = self._entries.get(key)
+        if result is None:
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return _copy(result)
+    
+    def put(self, key: Tuple[Hashable, ...], result: Dict[str, Any]):
+        """Store a result; results that carry an error are not cached."""
+        if self.max_entries <= 0 or (result.get("metadata") or {}).get("error"):
+            return
+        self._entries[key] = _copy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+    
+    def invalidate(self, model_version: Optional[str] = None):
+        """Drop every entry, or only those for one model version."""
+        if model_version is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[-1] == model_version]:
+            del self._entries[key]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, **self.counters}
+
+
+prediction_cache = PredictionCache(settings.prediction_cache_size)
@@ -0,0 +1,179 @@
+"""Prediction log documents and their columnar day-file archive."""
+import json
+import os
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pymongo.errors import OperationFailure
+
+# Archive columns, in file order
+ARCHIVE_COLUMNS = (
+    "timestamp", "subject", "user_id", "model_version", "market", "outcome",
+    "probability", "confidence", "point", "commence_time", "prediction",
+)
+ANONYMOUS_USER = -1
+# File in the archive root holding the last archived day
+ARCHIVED_THROUGH = "archived_through"
+
+_TYPE_PATTERN = re.compile(r"^[a-z0-9_]{1,32}$")
+
+
+def log_document(
+    prediction_type: str,
+    prediction_result: Dict[str, Any],
+    user_id: Optional[int],
+    **fields: Any
+) -> Dict[str, Any]:
+    """
+    A prediction_logs document, stamped with the time it is written.
+    
+    Args:
+        prediction_type: 'stock' or 'sports' (the time-series meta field)
+        prediction_result: Model output as returned to the client
+        user_id: Requesting user, None for anonymous requests
+        **fields: What was predicted (symbol, or event_id and commence_time)
+    """
+    return {
+        "prediction_type": prediction_type,
+        **fields,
+        "prediction": prediction_result,
+        "timestamp": datetime.utcnow(),
+        "user_id": user_id,
+    }
+
+
+def partition_path(archive_dir: str, prediction_type: str, day: date) -> str:
+    """Archive file for one prediction type and UTC day: <dir>/<type>/<YYYY-MM-DD>.npz."""
+    if not _TYPE_PATTERN.match(prediction_type):
+        raise ValueError(f"Invalid prediction type: {prediction_type}")
+    return os.path.join(archive_dir, prediction_type, f"{day.isoformat()}.npz")
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def log_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """A log document flattened to ARCHIVE_COLUMNS (missing numbers and users are None)."""
+    prediction = doc.get("prediction") or {}
+    return {
+        "timestamp": doc["timestamp"],
+        "subject": doc.get("symbol") or doc.get("event_id") or "",
+        "user_id": doc.get("user_id"),
+        "model_version": prediction.get("model_version") or "",
+        "market": prediction.get("market") or "",
+        "outcome": prediction.get("direction") or prediction.get("outcome") or "",
+        "probability": _number(prediction.get("probability")),
+        "confidence": _number(prediction.get("confidence")),
+        "point": _number(prediction.get("point")),
+        "commence_time": doc.get("commence_time") or "",
+        "prediction": prediction,
+    }
+
+
+def _columns(documents: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Archive columns for log documents; the full prediction is kept as JSON."""
+    rows = [log_row(doc) for doc in documents]
+    columns = {name: [row[name] for row in rows] for name in ARCHIVE_COLUMNS}
+    columns["user_id"] = [ANONYMOUS_USER if user_id is None else user_id for user_id in columns["user_id"]]
+    for name in ("probability", "confidence", "point"):
+        columns[name] = [np.nan if value is None else value for value in columns[name]]
+    columns["prediction"] = [json.dumps(prediction, separators=(",", ":"), default=str) for prediction in columns["prediction"]]
+    dtypes = ("datetime64[ms]", str, np.int64, str, str, str, np.float64, np.float64, np.float64, str, str)
+    return {name: np.array(columns[name], dtype=dtype) for name, dtype in zip(ARCHIVE_COLUMNS, dtypes)}
+
+
+def read_partition(path: str) -> Dict[str, np.ndarray]:
+    """Columns of an archive file (no pickled objects are read)."""
+    with np.load(path, allow_pickle=False) as archive:
+        return {name: archive[name] for name in ARCHIVE_COLUMNS}
+
+
+def _replace(path: str, write):
+    """Write a file through a temporary file renamed over it, so readers never see a partial one."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        write(f)
+    os.replace(temporary, path)
+
+
+def write_partition(path: str, documents: List[Dict[str, Any]]) -> int:
+    """
+    Write log documents to an archive file, sorted by timestamp (replacing the file).
+    
+    Returns:
+        Rows written
+    """
+    columns = _columns(documents)
+    order = np.argsort(columns["timestamp"], kind="stable")
+    _replace(path, lambda f: np.savez_compressed(f, **{name: column[order] for name, column in columns.items()}))
+    return len(order)
+
+
+def archived_through(archive_dir: str) -> Optional[date]:
+    """Last day archived into `archive_dir`, or None before the first run."""
+    try:
+        with open(os.path.join(archive_dir, ARCHIVED_THROUGH)) as f:
+            return date.fromisoformat(f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def archive_prediction_logs(collection, archive_dir: str, before: datetime, delete: bool = True) -> Dict[str, int]:
+    """
+    Move logs from whole UTC days before `before` into archive files.
+    
+    Logs are read in timestamp order and written out one day at a time, so
+    memory holds at most one day of logs. Once all of a day's files are
+    written it is recorded as archived and deleted from the collection.
+    Servers that cannot delete from a time-series collection by time
+    (MongoDB before 7.0) leave the day to the collection's expiry instead.
+    Days already archived are skipped, and an interrupted day is rewritten
+    whole on the next run, so running again never duplicates rows.
+    
+    Args:
+        collection: pymongo prediction_logs collection
+        archive_dir: Root of the archive (see partition_path)
+        before: Logs from days before this one are archived
+        delete: Remove archived logs from the collection
+    
+    Returns:
+        {"logs": archived, "days": days archived, "files": files written,
+         "deleted": logs deleted}
+    """
+    cutoff = datetime.combine(before.date(), time())
+    query: Dict[str, Any] = {"$lt": cutoff}
+    done = archived_through(archive_dir)
+    if done is not None:
+        query["$gte"] = datetime.combine(done + timedelta(days=1), time())
+    summary = {"logs": 0, "days": 0, "files": 0, "deleted": 0}
+    day: Optional[date] = None
+    buffers: Dict[str, List[Dict[str, Any]]] = {}
+    
+    def flush():
+        for prediction_type, documents in buffers.items():
+            write_partition(partition_path(archive_dir, prediction_type, day), documents)
+            summary["files"] += 1
+            summary["logs"] += len(documents)
+        summary["days"] += 1
+        _replace(os.path.join(archive_dir, ARCHIVED_THROUGH), lambda f: f.write(day.isoformat().encode()))
+        if delete:
+            start = datetime.combine(day, time())
+            try:
+                result = collection.delete_many({"timestamp": {"$gte": start, "$lt": start + timedelta(days=1)}})
+                summary["deleted"] += result.deleted_count
+            except OperationFailure:
+                pass
+        buffers.clear()
+    
+    for doc in collection.find({"timestamp": query}, sort=[("timestamp", 1)]):
+        doc_day = doc["timestamp"].date()
+        if day is not None and doc_day != day:
+            flush()
+        day = doc_day
+        buffers.setdefault(doc.get("prediction_type") or "unknown", []).append(doc)
+    if buffers:
+        flush()
+    return summary
@@ -1,9 +1,17 @@
 """Prediction models for stocks and sports."""
+import json
+import os
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Any, Optional
-from sklearn.linear_model import LogisticRegression
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from app.config import settings
+from app.services.odds_math import implied_probabilities, overround, remove_vig
+from app.timing import phase, PHASE_INDICATORS, PHASE_INFERENCE
+
+# Trained stock model artifact (loaded once per process) and the untrained fallback
+_stock_artifact: Optional[Dict[str, Any]] = None
+_stock_artifact_loaded = False
+_stock_fallback_model = None
 
 
 class StockPredictionModel:
@@ -11,6 +19,12 @@ class StockPredictionModel:
     
     MODEL_VERSION = "v1.0.0"
     
+    # Model inputs, in order; see features_from_indicators and feature_matrix
+    FEATURE_NAMES = ["recent_change", "change_5d", "sma_spread", "relative_volatility"]
+    
+    # Fewest prices for which every indicator is defined
+    MIN_HISTORY = 10
+    
     @staticmethod
     def calculate_indicators(prices: List[float]) -> Dict[str, float]:
         """
@@ -18,14 +32,14 @@ class StockPredictionModel:
         
         Args:
             prices: List of historical prices (most recent last)
-            
+        
         Returns:
             Dictionary of calculated indicators
         """
         if len(prices) < 2:
             return {}
         
-        prices_array = np.array(prices)
+        prices_array = np.asarray(prices, dtype=float)
         
         # Simple moving averages
         sma_5 = np.mean(prices_array[-5:]) if len(prices_array) >= 5 else prices_array[-1]
@@ -47,6 +61,119 @@ class StockPredictionModel:
             "current_price": prices_array[-1]
         }
     
+    @staticmethod
+    def features_from_indicators(indicators: Dict[str, float]) -> List[float]:
+        """
+        Build the model's feature vector (FEATURE_NAMES order) from indicators.
+        
+        Args:
+            indicators: Output of calculate_indicators
+        
+        Returns:
+            List of feature values
+        """
+        return [
+            indicators["recent_change"],
+            indicators["change_5d"],
+            (indicators["sma_5"] - indicators["sma_10"]) / indicators["sma_10"] if indicators["sma_10"] > 0 else 0,
+            indicators["volatility"] / indicators["current_price"] if indicators["current_price"] > 0 else 0
+        ]
+    
+    @staticmethod
+    def feature_matrix(prices: np.ndarray) -> np.ndarray:
+        """
+        Compute the feature vector for every date of a price history at once.
+        
+        Row i equals features_from_indicators(calculate_indicators(prices[:i + MIN_HISTORY])),
+        i.e. the features the model would see at the close of day i + MIN_HISTORY - 1.
+        
+        Args:
+            prices: Array of historical prices (oldest first)
+        
+        Returns:
+            Array of shape (len(prices) - MIN_HISTORY + 1, len(FEATURE_NAMES))
+        """
+        from numpy.lib.stride_tricks import sliding_window_view
+        
+        prices = np.asarray(prices, dtype=float)
+        window = StockPredictionModel.MIN_HISTORY
+        if len(prices) < window:
+            return np.empty((0, len(StockPredictionModel.FEATURE_NAMES)))
+        
+        windows = sliding_window_view(prices, window)
+        current = windows[:, -1]
+        sma_5 = windows[:, -5:].mean(axis=1)
+        sma_10 = windows.mean(axis=1)
+        volatility = windows.std(axis=1)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recent_change = (current - windows[:, -2]) / windows[:, -2]
+            change_5d = (current - windows[:, -5]) / windows[:, -5]
+            sma_spread = np.where(sma_10 > 0, (sma_5 - sma_10) / sma_10, 0.0)
+            relative_volatility = np.where(current > 0, volatility / current, 0.0)
+        
+        return np.column_stack([recent_change, change_5d, sma_spread, relative_volatility])
+    
+    @staticmethod
+    def load_artifact(path: str) -> Dict[str, Any]:
+        """
+        Read and validate a trained model artifact (see app.services.training).
+        
+        Args:
+            path: Artifact JSON file
+        
+        Returns:
+            Artifact dictionary
+        
+        Raises:
+            ValueError: If the artifact does not match this model's features
+        """
+        with open(path) as f:
+            artifact = json.load(f)
+        if artifact.get("model_type") != "logistic_regression":
+            raise ValueError(f"Unsupported model type: {artifact.get('model_type')}")
+        if artifact.get("features") != StockPredictionModel.FEATURE_NAMES:
+            raise ValueError(f"Artifact features {artifact.get('features')} do not match {StockPredictionModel.FEATURE_NAMES}")
+        if len(artifact.get("coefficients", [])) != len(StockPredictionModel.FEATURE_NAMES):
+            raise ValueError("Artifact has the wrong number of coefficients")
+        return artifact
+    
+    @staticmethod
+    def artifact() -> Optional[Dict[str, Any]]:
+        """The configured trained artifact, or None when there is none (loaded on first call)."""
+        global _stock_artifact, _stock_artifact_loaded
+        if not _stock_artifact_loaded:
+            path = settings.stock_model_artifact
+            if path and os.path.exists(path):
+                _stock_artifact = StockPredictionModel.load_artifact(path)
+            _stock_artifact_loaded = True
+        return _stock_artifact
+    
+    @staticmethod
+    def current_version() -> str:
+        """Version of the model predict_prices serves (the artifact's, if one is deployed)."""
+        artifact = StockPredictionModel.artifact()
+        return artifact["model_version"] if artifact else StockPredictionModel.MODEL_VERSION
+    
+    @staticmethod
+    def _fallback_model():
+        """
+        Placeholder model used when no trained artifact is deployed.
+        
+        Fitted once per process on synthetic data rather than on every request.
+        """
+        global _stock_fallback_model
+        if _stock_fallback_model is None:
+            # scikit-learn is imported on first use (or by warmup_models) to keep startup fast
+            from sklearn.linear_model import LogisticRegression
+            
+            model = LogisticRegression(random_state=42)
+            X_train = np.random.RandomState(42).randn(100, 4)
+            y_train = (X_train[:, 0] > 0).astype(int)
+            model.fit(X_train, y_train)
+            _stock_fallback_model = model
+        return _stock_fallback_model
+    
     @staticmethod
     def predict(price_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -54,7 +181,7 @@ class StockPredictionModel:
         
         Args:
             price_data: Dictionary containing stock price history
-            
+        
         Returns:
             Prediction dictionary with probability, confidence, and direction
         """
@@ -67,8 +194,37 @@ class StockPredictionModel:
             # Convert to sorted list of prices (oldest to newest)
             dates = sorted(time_series.keys())
             prices = [float(time_series[date]["4. close"]) for date in dates]
-            
-            if len(prices) < 10:
+        
+        except Exception as e:
+            return StockPredictionModel._default_prediction(str(e))
+        
+        return StockPredictionModel.predict_prices(prices)
+    
+    @staticmethod
+    def _default_prediction(error: str) -> Dict[str, Any]:
+        """Neutral prediction returned when the model cannot run."""
+        return {
+            "probability": 0.5,
+            "confidence": 0.2,
+            "direction": "neutral",
+            "model_version": StockPredictionModel.MODEL_VERSION,
+            "metadata": {"error": error}
+        }
+    
+    @staticmethod
+    def predict_prices(prices) -> Dict[str, Any]:
+        """
+        Generate stock prediction from closing prices.
+        
+        Args:
+            prices: Closing prices, oldest first (list or array; a memory-mapped
+                price store column is read without copying)
+        
+        Returns:
+            Prediction dictionary with probability, confidence, and direction
+        """
+        try:
+            if len(prices) < StockPredictionModel.MIN_HISTORY:
                 # Not enough data, return default prediction
                 return {
                     "probability": 0.5,
@@ -79,29 +235,22 @@ class StockPredictionModel:
                 }
             
             # Calculate indicators
-            indicators = StockPredictionModel.calculate_indicators(prices)
+            with phase(PHASE_INDICATORS):
+                indicators = StockPredictionModel.calculate_indicators(prices)
             
             # Prepare features for logistic regression
-            features = np.array([[
-                indicators["recent_change"],
-                indicators["change_5d"],
-                (indicators["sma_5"] - indicators["sma_10"]) / indicators["sma_10"] if indicators["sma_10"] > 0 else 0,
-                indicators["volatility"] / indicators["current_price"] if indicators["current_price"] > 0 else 0
-            ]])
+            features = np.array([StockPredictionModel.features_from_indicators(indicators)])
             
-            # Simple logistic regression model
-            # In production, this would be trained on historical data
-            # For now, using a simple heuristic-based approach
-            model = LogisticRegression(random_state=42)
-            
-            # Create synthetic training data for demonstration
-            # In production, use real historical data
-            X_train = np.random.randn(100, 4)
-            y_train = (X_train[:, 0] > 0).astype(int)
-            model.fit(X_train, y_train)
-            
-            # Make prediction
-            probability = model.predict_proba(features)[0][1]
+            with phase(PHASE_INFERENCE):
+                artifact = StockPredictionModel.artifact()
+                if artifact:
+                    # Trained offline; serving is a dot product
+                    logit = float(features[0] @ np.array(artifact["coefficients"]) + artifact["intercept"])
+                    probability = 1.0 / (1.0 + np.exp(-logit))
+                    model_version = artifact["model_version"]
+                else:
+                    probability = StockPredictionModel._fallback_model().predict_proba(features)[0][1]
+                    model_version = StockPredictionModel.MODEL_VERSION
             direction = "up" if probability > 0.5 else "down"
             
             # Calculate confidence based on data quality and signal strength
@@ -113,46 +262,50 @@ class StockPredictionModel:
                 "direction": direction,
                 "price_target": indicators["current_price"] * (1 + (probability - 0.5) * 0.1),
                 "current_price": indicators["current_price"],
-                "model_version": StockPredictionModel.MODEL_VERSION,
+                "model_version": model_version,
                 "metadata": {
                     "indicators": indicators,
                     "data_points": len(prices)
                 }
             }
-            
+        
         except Exception as e:
             # Return default prediction on error
-            return {
-                "probability": 0.5,
-                "confidence": 0.2,
-                "direction": "neutral",
-                "model_version": StockPredictionModel.MODEL_VERSION,
-                "metadata": {"error": str(e)}
-            }
+            return StockPredictionModel._default_prediction(str(e))
 
 
 class SportsPredictionModel:
     """Simple model for sports predictions based on odds and team ratings."""
     
-    MODEL_VERSION = "v1.0.0"
+    MODEL_VERSION = "v1.3.1"
+    
+    # Markets the model predicts, and the outcome reported when the
+    # probability is above / below 0.5. The probability is always for the
+    # first outcome: the home team winning, the home team covering its
+    # spread, or the game going over the total
+    MARKETS = ("h2h", "spreads", "totals")
+    MARKET_OUTCOMES = {"h2h": ("win", "loss"), "spreads": ("cover", "no_cover"), "totals": ("over", "under")}
+    
+    # Standard deviation of the final score margin by sport (the sport key's
+    # prefix), used to price a spread from team ratings
+    MARGIN_STDEV = {"americanfootball": 13.5, "basketball": 12.0, "baseball": 4.3, "icehockey": 2.4, "soccer": 1.8}
+    DEFAULT_MARGIN_STDEV = 10.0
     
     @staticmethod
     def calculate_team_rating(team_name: str, historical_data: Optional[Dict] = None) -> float:
         """
-        Calculate simple team rating.
-        
-        In production, this would use historical performance data.
-        For now, returns a default rating.
+        Look up a team's rating.
         
         Args:
             team_name: Name of the team
-            historical_data: Optional historical performance data
-            
+            historical_data: Team -> strength (0.0 to 1.0), e.g. from
+                TeamRatingService.ratings_for; teams not in it are neutral
+        
         Returns:
             Team rating (0.0 to 1.0)
         """
-        # Placeholder: In production, use actual team statistics
-        # For now, return a neutral rating
+        if historical_data and team_name in historical_data:
+            return float(historical_data[team_name])
         return 0.5
     
     @staticmethod
@@ -160,10 +313,14 @@ class SportsPredictionModel:
         """
         Convert betting odds to implied probability.
         
+        Scalar version of odds_math.implied_probabilities, for one price; a
+        NumPy call costs more than this arithmetic, so convert whole slates
+        with that instead.
+        
         Args:
             odds: Betting odds
             odds_format: 'american', 'decimal', or 'fractional'
-            
+        
         Returns:
             Implied probability (0.0 to 1.0)
         """
@@ -173,108 +330,286 @@ class SportsPredictionModel:
             else:
                 return abs(odds) / (abs(odds) + 100)
         elif odds_format == "decimal":
-            return 1 / odds
-        else:
-            # Default to decimal
-            return 1 / odds if odds > 0 else 0.5
+            return 1 / odds if odds > 0 else 0.0
+        elif odds_format == "fractional":
+            return 1 / (odds + 1) if odds >= 0 else 0.0
+        raise ValueError(f"Unknown odds format: {odds_format}")
     
     @staticmethod
-    def predict(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _market_prices(event_data: Dict[str, Any], market: str = "h2h") -> Tuple[str, str, Any, Any, Optional[float]]:
         """
-        Generate sports prediction from odds data.
+        Home team, away team, a market's two prices and its point from the event's first bookmaker.
         
-        Args:
-            event_data: Dictionary containing event and odds information
-            
-        Returns:
-            Prediction dictionary with probability, confidence, and outcome
+        Prices are (home, away) for h2h and spreads and (over, under) for
+        totals. The point is the home team's spread or the total line, and
+        None for h2h.
         """
-        try:
-            # Extract event information
-            home_team = event_data.get("home_team", "Team A")
-            away_team = event_data.get("away_team", "Team B")
-            
-            # Get odds (assuming first bookmaker's odds)
-            bookmakers = event_data.get("bookmakers", [])
-            if not bookmakers:
-                raise ValueError("No bookmaker data available")
-            
-            # Get first bookmaker's h2h (head-to-head) odds
-            bookmaker = bookmakers[0]
-            markets = bookmaker.get("markets", [])
-            h2h_market = next((m for m in markets if m.get("key") == "h2h"), None)
-            
-            if not h2h_market:
-                raise ValueError("No h2h market available")
-            
-            outcomes = h2h_market.get("outcomes", [])
-            if len(outcomes) < 2:
-                raise ValueError("Insufficient outcomes")
-            
-            # Find home and away team odds
-            home_outcome = next((o for o in outcomes if o.get("name") == home_team), None)
-            away_outcome = next((o for o in outcomes if o.get("name") == away_team), None)
-            
-            if not home_outcome or not away_outcome:
-                # Use first two outcomes if team names don't match
-                home_outcome = outcomes[0]
-                away_outcome = outcomes[1]
-            
-            home_odds = home_outcome.get("price", 0)
-            away_odds = away_outcome.get("price", 0)
-            
-            # Convert to implied probabilities
-            home_implied = SportsPredictionModel.implied_probability_from_odds(home_odds)
-            away_implied = SportsPredictionModel.implied_probability_from_odds(away_odds)
-            
+        if market not in SportsPredictionModel.MARKETS:
+            raise ValueError(f"Unsupported market: {market}")
+        home_team = event_data.get("home_team", "Team A")
+        away_team = event_data.get("away_team", "Team B")
+        
+        # Get odds (assuming first bookmaker's odds)
+        bookmakers = event_data.get("bookmakers", [])
+        if not bookmakers:
+            raise ValueError("No bookmaker data available")
+        
+        # Get first bookmaker's odds for the market
+        # (plain loops: this runs once per event on every slate)
+        market_data = None
+        for candidate in bookmakers[0].get("markets", []):
+            if candidate.get("key") == market:
+                market_data = candidate
+                break
+        
+        if not market_data:
+            raise ValueError(f"No {market} market available")
+        
+        outcomes = market_data.get("outcomes", [])
+        if len(outcomes) < 2:
+            raise ValueError("Insufficient outcomes")
+        
+        # Find home and away team (or over and under) odds
+        first_name, second_name = ("Over", "Under") if market == "totals" else (home_team, away_team)
+        first = second = None
+        for outcome in outcomes:
+            name = outcome.get("name")
+            if first is None and name == first_name:
+                first = outcome
+            if second is None and name == second_name:
+                second = outcome
+        
+        if not first or not second:
+            # Use first two outcomes if names don't match
+            first = outcomes[0]
+            second = outcomes[1]
+        
+        point = None
+        if market != "h2h":
+            if first.get("point") is None:
+                raise ValueError(f"No {market} point available")
+            point = float(first["point"])
+        
+        return home_team, away_team, first.get("price", 0), second.get("price", 0), point
+    
+    @staticmethod
+    def margin_stdev(sport_key: str) -> float:
+        """Standard deviation of the final score margin for a sport key such as basketball_nba."""
+        return SportsPredictionModel.MARGIN_STDEV.get(sport_key.split("_")[0], SportsPredictionModel.DEFAULT_MARGIN_STDEV)
+    
+    @staticmethod
+    def _rating_cover_probability(team_ratings: np.ndarray, points: np.ndarray, stdevs: np.ndarray) -> np.ndarray:
+        """
+        Probability the home team covers its spread, from team ratings alone.
+        
+        Final margins are modelled as logistic with the sport's margin
+        standard deviation: the ratings' head-to-head probability fixes the
+        expected margin, and the spread moves the line that margin has to beat.
+        """
+        total = team_ratings.sum(axis=1)
+        win = np.divide(team_ratings[:, 0], total, out=np.full_like(total, 0.5), where=total > 0)
+        win = np.clip(win, 1e-6, 1 - 1e-6)
+        scale = stdevs * np.sqrt(3) / np.pi
+        expected_margin = scale * np.log(win / (1 - win))
+        return 1 / (1 + np.exp(-(expected_margin + points) / scale))
+    
+    @staticmethod
+    def _default_prediction(error: str) -> Dict[str, Any]:
+        return {
+            "probability": 0.5,
+            "confidence": 0.2,
+            "outcome": "unknown",
+            "model_version": SportsPredictionModel.MODEL_VERSION,
+            "metadata": {"error": error}
+        }
+    
+    @staticmethod
+    def _predict_slate(
+        events: List[Dict[str, Any]],
+        ratings: Optional[Dict[str, float]],
+        market: str = "h2h"
+    ) -> List[Dict[str, Any]]:
+        """
+        Predictions for one market of a list of events, converting all prices at once.
+        
+        Prices go through odds_math as one (events, 2) array, so odds
+        conversion and margin removal are a few array operations per slate.
+        Events without usable prices for the market get an error prediction.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+        rows, prices, team_ratings, points, stdevs, rated = [], [], [], [], [], []
+        for i, event_data in enumerate(events):
+            try:
+                home_team, away_team, first_odds, second_odds, point = SportsPredictionModel._market_prices(event_data, market)
+                prices.append((float(first_odds), float(second_odds)))
+            except Exception as e:
+                results[i] = SportsPredictionModel._default_prediction(str(e))
+                continue
+            rows.append((i, home_team, away_team, first_odds, second_odds, point))
             # Adjust with team ratings (simplified)
-            home_rating = SportsPredictionModel.calculate_team_rating(home_team)
-            away_rating = SportsPredictionModel.calculate_team_rating(away_team)
-            
-            # Combine implied probability with team rating
-            # Weight: 70% implied probability, 30% team rating
-            home_adjusted = home_implied * 0.7 + home_rating * 0.3
-            away_adjusted = away_implied * 0.7 + away_rating * 0.3
+            team_ratings.append((
+                SportsPredictionModel.calculate_team_rating(home_team, ratings),
+                SportsPredictionModel.calculate_team_rating(away_team, ratings)
+            ))
+            if market == "spreads":
+                points.append(point)
+                stdevs.append(SportsPredictionModel.margin_stdev(event_data.get("sport_key", "")))
+                rated.append(bool(ratings) and (home_team in ratings or away_team in ratings))
+        if not rows:
+            return results
+        
+        # Convert to implied probabilities and strip the bookmaker's margin
+        implied = implied_probabilities(prices)
+        fair = remove_vig(implied, settings.odds_vig_method)
+        margin = overround(implied)
+        rating_array = np.array(team_ratings)
+        
+        # Combine fair probability with team rating
+        # Weight: 70% fair probability, 30% team rating
+        if market == "totals":
+            # Team ratings say nothing about how many points are scored
+            probability = fair[:, 0]
+        elif market == "spreads":
+            # Two unrated teams would price every spread as a pick'em between
+            # equals, pulling favourites' cover probability down: use the
+            # market's fair probability alone for them
+            cover = SportsPredictionModel._rating_cover_probability(rating_array, np.array(points), np.array(stdevs))
+            probability = np.where(rated, fair[:, 0] * 0.7 + cover * 0.3, fair[:, 0])
+        else:
+            adjusted = fair * 0.7 + rating_array * 0.3
             
             # Normalize probabilities
-            total = home_adjusted + away_adjusted
-            if total > 0:
-                home_prob = home_adjusted / total
-                away_prob = away_adjusted / total
+            total = adjusted.sum(axis=1)
+            probability = np.divide(adjusted[:, 0], total, out=np.full_like(total, 0.5), where=total > 0)
+        
+        # Calculate confidence based on probability margin
+        confidence = np.minimum(0.9, np.abs(probability - 0.5) * 2 + 0.4)
+        
+        yes, no = SportsPredictionModel.MARKET_OUTCOMES[market]
+        first_key, second_key = ("over_odds", "under_odds") if market == "totals" else ("home_odds", "away_odds")
+        columns = zip(
+            rows,
+            probability.tolist(),
+            confidence.tolist(),
+            implied[:, 0].tolist(),
+            fair[:, 0].tolist(),
+            margin.tolist(),
+            prices,
+            team_ratings
+        )
+        for row, row_probability, row_confidence, first_implied, first_fair, row_margin, (first_price, _), (home_rating, away_rating) in columns:
+            i, home_team, away_team, first_odds, second_odds, point = row
+            # Determine prediction (home team win or cover, or the over)
+            if market == "totals":
+                team = None
             else:
-                home_prob = 0.5
-                away_prob = 0.5
-            
-            # Determine prediction (home team win)
-            probability = home_prob
-            outcome = "win" if probability > 0.5 else "loss"
-            predicted_team = home_team if probability > 0.5 else away_team
-            
-            # Calculate confidence based on probability margin
-            confidence = min(0.9, abs(probability - 0.5) * 2 + 0.4)
-            
-            return {
-                "probability": float(probability),
-                "confidence": float(confidence),
-                "outcome": outcome,
-                "team": predicted_team,
-                "odds": float(home_odds),
-                "implied_probability": float(home_implied),
+                team = home_team if row_probability > 0.5 else away_team
+            results[i] = {
+                "probability": row_probability,
+                "confidence": row_confidence,
+                "outcome": yes if row_probability > 0.5 else no,
+                "team": team,
+                "market": market,
+                "point": point,
+                "odds": first_price,
+                "implied_probability": first_implied,
                 "model_version": SportsPredictionModel.MODEL_VERSION,
                 "metadata": {
+                    "market": market,
                     "home_team": home_team,
                     "away_team": away_team,
-                    "home_odds": home_odds,
-                    "away_odds": away_odds
+                    first_key: first_odds,
+                    second_key: second_odds,
+                    "point": point,
+                    "home_rating": home_rating,
+                    "away_rating": away_rating,
+                    "fair_probability": first_fair,
+                    "margin": row_margin
                 }
             }
-            
+        return results
+    
+    @staticmethod
+    def predict(
+        event_data: Dict[str, Any],
+        ratings: Optional[Dict[str, float]] = None,
+        market: str = "h2h"
+    ) -> Dict[str, Any]:
+        """
+        Generate sports prediction from odds data.
+        
+        Args:
+            event_data: Dictionary containing event and odds information
+            ratings: Team -> strength (0.0 to 1.0); unrated teams count as 0.5
+            market: 'h2h' (home team wins), 'spreads' (home team covers its
+                spread) or 'totals' (the game goes over the total)
+        
+        Returns:
+            Prediction dictionary with probability, confidence, and outcome
+        """
+        try:
+            return SportsPredictionModel._predict_slate([event_data], ratings, market)[0]
         except Exception as e:
             # Return default prediction on error
+            return SportsPredictionModel._default_prediction(str(e))
+    
+    @staticmethod
+    def predict_many(
+        events: List[Dict[str, Any]],
+        ratings: Optional[Dict[str, float]] = None,
+        market: str = "h2h"
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for a slate of events.
+        
+        One call per slate keeps executor round-trips (and pickling in
+        process mode) to one per request instead of one per event, and lets
+        the whole slate's odds be converted as one array. Ratings are passed
+        in (only the slate's teams) rather than looked up here, so
+        process-pool workers need no copy of the rating table.
+        """
+        with phase(PHASE_INFERENCE):
+            return SportsPredictionModel._predict_slate(events, ratings, market)
+    
+    @staticmethod
+    def predict_markets(
+        events_by_market: Dict[str, List[Dict[str, Any]]],
+        ratings: Optional[Dict[str, float]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Generate predictions for several markets in one call.
+        
+        The events for every market usually come from one odds fetch with
+        markets=h2h,spreads,totals; predicting them together keeps it to one
+        executor round-trip per request.
+        """
+        with phase(PHASE_INFERENCE):
             return {
-                "probability": 0.5,
-                "confidence": 0.2,
-                "outcome": "unknown",
-                "model_version": SportsPredictionModel.MODEL_VERSION,
-                "metadata": {"error": str(e)}
+                market: SportsPredictionModel._predict_slate(events, ratings, market)
+                for market, events in events_by_market.items()
             }
+
+
+def warmup_models():
+    """
+    Import the ML libraries and exercise both models once.
+    
+    Run in the background after startup so the first real request does not
+    pay for importing scikit-learn.
+    """
+    prices = [100.0 + i for i in range(10)]
+    StockPredictionModel.predict({
+        "Time Series (Daily)": {
+            f"2024-01-{i + 1:02d}": {"4. close": str(price)} for i, price in enumerate(prices)
+        }
+    })
+    SportsPredictionModel.predict({
+        "home_team": "Home",
+        "away_team": "Away",
+        "bookmakers": [{
+            "markets": [{
+                "key": "h2h",
+                "outcomes": [{"name": "Home", "price": -110}, {"name": "Away", "price": -110}]
+            }]
+        }]
+    })
@@ -0,0 +1,207 @@
+"""Columnar, memory-mapped daily price history store."""
+import os
+import re
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+
+# Row order of the stored (len(COLUMNS), days) array; dates are days since 1970-01-01
+COLUMNS = ("date", "open", "high", "low", "close", "volume")
+
+# Alpha Vantage TIME_SERIES_DAILY field for each price column
+PAYLOAD_FIELDS = {
+    "open": "1. open",
+    "high": "2. high",
+    "low": "3. low",
+    "close": "4. close",
+    "volume": "5. volume",
+}
+
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9.\-=^]{1,20}$")
+
+
+class PriceHistory:
+    """
+    One symbol's daily bars as read-only column views (oldest first).
+    
+    Every column is a slice of the same memory-mapped array, so reading a
+    column or a date range copies nothing.
+    """
+    
+    def __init__(self, symbol: str, data: np.ndarray, modified_at: Optional[datetime] = None):
+        self.symbol = symbol
+        self.data = data
+        # When the stored file was last written (naive UTC), if read from a store
+        self.modified_at = modified_at
+    
+    def __len__(self) -> int:
+        return self.data.shape[1]
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.data[COLUMNS.index(name)]
+    
+    @property
+    def days(self) -> np.ndarray:
+        """Dates as days since 1970-01-01 (float64), the stored form."""
+        return self.data[0]
+    
+    @property
+    def dates(self) -> np.ndarray:
+        """Dates as datetime64[D] (converted, not a view)."""
+        return self.data[0].astype("datetime64[D]")
+    
+    @property
+    def open(self) -> np.ndarray:
+        return self.data[1]
+    
+    @property
+    def high(self) -> np.ndarray:
+        return self.data[2]
+    
+    @property
+    def low(self) -> np.ndarray:
+        return self.data[3]
+    
+    @property
+    def close(self) -> np.ndarray:
+        return self.data[4]
+    
+    @property
+    def volume(self) -> np.ndarray:
+        return self.data[5]
+    
+    @property
+    def last_date(self) -> Optional[np.datetime64]:
+        return np.datetime64(int(self.data[0, -1]), "D") if len(self) else None
+    
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> "PriceHistory":
+        """Bars with start <= date <= end (ISO dates, either bound optional), as a view."""
+        days = self.days
+        lo = np.searchsorted(days, _to_days(start), side="left") if start else 0
+        hi = np.searchsorted(days, _to_days(end), side="right") if end else len(days)
+        return PriceHistory(self.symbol, self.data[:, lo:hi], self.modified_at)
+    
+    def tail(self, n: int) -> "PriceHistory":
+        """The most recent n bars, as a view."""
+        return PriceHistory(self.symbol, self.data[:, max(0, len(self) - n):], self.modified_at)
+
+
+def _to_days(value) -> float:
+    return float(np.datetime64(value, "D").astype(np.int64))
+
+
+def columns_from_payload(price_data: Dict[str, Any]) -> np.ndarray:
+    """
+    Parse a TIME_SERIES_DAILY payload into the stored column layout.
+    
+    Args:
+        price_data: Alpha Vantage daily payload
+    
+    Returns:
+        Array of shape (len(COLUMNS), days), oldest first
+    """
+    time_series = price_data.get("Time Series (Daily)", {})
+    dates = sorted(time_series)
+    data = np.empty((len(COLUMNS), len(dates)))
+    data[0] = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    for row, name in enumerate(COLUMNS[1:], start=1):
+        field = PAYLOAD_FIELDS[name]
+        data[row] = [float(time_series[date].get(field, "nan")) for date in dates]
+    return data
+
+
+def merge_columns(existing: Optional[np.ndarray], new: np.ndarray) -> np.ndarray:
+    """
+    Union of two column arrays by date; bars in `new` replace bars for the same date.
+    
+    Returns:
+        Merged array, oldest first
+    """
+    if existing is None or existing.shape[1] == 0:
+        combined = new
+    else:
+        combined = np.concatenate([new, existing], axis=1)
+    # np.unique keeps the first occurrence of each date, i.e. the new bar
+    _, first = np.unique(combined[0], return_index=True)
+    return np.ascontiguousarray(combined[:, first])
+
+
+class PriceStore:
+    """
+    Per-symbol OHLCV history as memory-mapped .npy files.
+    
+    Each symbol is one float64 array of shape (len(COLUMNS), days) in
+    <root>/<SYMBOL>.npy, so each column is contiguous. Files are opened with
+    mmap and cached per process, so workers on one machine share the OS page
+    cache instead of holding their own copies. Writes go to a temporary file
+    that is renamed over the old one; readers holding the old mapping keep a
+    consistent snapshot.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        self._cache: Dict[str, Tuple[Tuple[int, int], PriceHistory]] = {}
+    
+    def path(self, symbol: str) -> str:
+        symbol = symbol.upper()
+        if not _SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+        return os.path.join(self.root, f"{symbol}.npy")
+    
+    def symbols(self) -> List[str]:
+        """Symbols with stored history."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.root) if name.endswith(".npy"))
+    
+    def read(self, symbol: str) -> Optional[PriceHistory]:
+        """
+        Memory-mapped history for a symbol, or None if nothing is stored.
+        
+        The mapping is reused until the file is replaced.
+        """
+        path = self.path(symbol)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._cache.get(symbol.upper())
+        if cached and cached[0] == signature:
+            return cached[1]
+        history = PriceHistory(symbol.upper(), np.load(path, mmap_mode="r"), datetime.utcfromtimestamp(stat.st_mtime))
+        self._cache[symbol.upper()] = (signature, history)
+        return history
+    
+    def write(self, symbol: str, data: np.ndarray):
+        """Replace a symbol's history with `data` (shape (len(COLUMNS), days), oldest first)."""
+        if data.shape[0] != len(COLUMNS):
+            raise ValueError(f"Expected {len(COLUMNS)} columns, got {data.shape[0]}")
+        path = self.path(symbol)
+        os.makedirs(self.root, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, np.ascontiguousarray(data, dtype=np.float64))
+        os.replace(temporary, path)
+    
+    def merge(self, symbol: str, data: np.ndarray) -> int:
+        """
+        Add bars to a symbol's history (same-date bars are replaced).
+        
+        Returns:
+            Number of dates that were not stored before
+        """
+        existing = self.read(symbol)
+        before = len(existing) if existing is not None else 0
+        merged = merge_columns(existing.data if existing is not None else None, data)
+        if existing is None or merged.shape != existing.data.shape or not np.array_equal(merged, existing.data, equal_nan=True):
+            self.write(symbol, merged)
+        return merged.shape[1] - before
+    
+    def merge_payload(self, symbol: str, price_data: Dict[str, Any]) -> int:
+        """merge() for a TIME_SERIES_DAILY payload."""
+        return self.merge(symbol, columns_from_payload(price_data))
+
+
+price_store = PriceStore(settings.price_store_dir)
@@ -0,0 +1,151 @@
+"""Circuit breakers and retries for upstream API calls."""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import httpx
+from app.timing import phase, PHASE_UPSTREAM
+
+# Upstream statuses worth retrying (rate limiting and server-side trouble)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+    
+    Closed: calls go through. Errors, and calls slower than
+    `slow_call_seconds`, count as failures; `failure_threshold` failures in a
+    row open the circuit. Open: calls fail immediately with CircuitOpenError
+    for `reset_seconds`. Half-open: one probe call is let through; success
+    closes the circuit, failure opens it again.
+    
+    State is per process; each worker learns about an outage on its own after
+    a few failed calls.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        slow_call_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+    
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        if self.state == OPEN:
+            waited = self._clock() - self.opened_at
+            if waited < self.reset_seconds:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, self.reset_seconds - waited)
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, self.reset_seconds)
+            self._probing = True
+        self.counters["calls"] += 1
+    
+    def record_success(self, elapsed: float):
+        if elapsed > self.slow_call_seconds:
+            self.counters["slow_calls"] += 1
+            self._fail()
+            return
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+    
+    def record_failure(self):
+        self.counters["failures"] += 1
+        self._fail()
+    
+    def record_abandoned(self):
+        """The call ended without an upstream verdict (e.g. cancelled); let another probe through."""
+        self._probing = False
+    
+    def _fail(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.counters["opened"] += 1
+            self.state = OPEN
+            self.opened_at = self._clock()
+        self._probing = False
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, **self.counters}
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base_delay * 2**attempt)]."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+async def call_upstream(
+    breaker: CircuitBreaker,
+    send: Callable[[], Awaitable[httpx.Response]],
+    retries: int = 2,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    acquire: Optional[Callable[[], bool]] = None
+) -> httpx.Response:
+    """
+    Send an upstream request through a circuit breaker, retrying transient errors.
+    
+    Timeouts, connection errors and RETRYABLE_STATUSES are retried up to
+    `retries` times with jittered backoff. Each retry first calls `acquire`
+    (e.g. a rate limiter's try_acquire), and the last failure stands if it
+    returns False. The first attempt is the caller's to budget. Other
+    responses, including 4xx errors, are returned as-is for the caller to
+    inspect.
+    
+    Raises:
+        CircuitOpenError: If the circuit is open
+        httpx.TransportError: If the last attempt failed to get a response
+    """
+    for attempt in range(retries + 1):
+        breaker.before_call()
+        started = time.perf_counter()
+        try:
+            with phase(PHASE_UPSTREAM):
+                response = await send()
+        except httpx.TransportError:
+            breaker.record_failure()
+            if attempt == retries or (acquire is not None and not acquire()):
+                raise
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUSES:
+                breaker.record_success(time.perf_counter() - started)
+                return response
+            breaker.record_failure()
+            if attempt == retries or (acquire is not None and not acquire()):
+                return response
+        await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
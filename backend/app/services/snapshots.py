@@ -0,0 +1,196 @@
+"""Precomputed prediction responses for the most requested symbols and slates."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import Request, Response
+from starlette.responses import JSONResponse
+from app.config import settings
+from app.database import get_mongodb
+from app.http_cache import cache_headers, etag_matches, not_modified
+from app.timing import phase, PHASE_LOGGING
+
+logger = logging.getLogger(__name__)
+
+
+def make_snapshot(
+    content: Any,
+    version: str,
+    etag: str,
+    last_modified: Optional[datetime],
+    max_age: float,
+    logs: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    A snapshot of one endpoint response.
+    
+    Args:
+        content: JSON-ready response body, rendered to bytes once here
+        version: Model version the predictions were made with
+        etag: The ETag the on-demand path would send for the same data
+        last_modified: When the data behind the predictions was fetched
+        max_age: Seconds the data stays fresh from now
+        logs: prediction_logs documents to insert per request served (with
+            that request's time and user id)
+    """
+    now = datetime.utcnow()
+    return {
+        "body": JSONResponse(content).body,
+        "version": version,
+        "etag": etag,
+        "last_modified": last_modified,
+        "built_at": now,
+        "expires_at": now + timedelta(seconds=max(max_age, 0)),
+        "logs": logs,
+    }
+
+
+async def serve_snapshot(snapshot: Dict[str, Any], request: Request, user_id: Optional[int]) -> Response:
+    """The response for a snapshot: 304 if the client has it, else the stored body, logged like an on-demand one."""
+    headers = cache_headers(
+        snapshot["etag"],
+        snapshot["last_modified"],
+        (snapshot["expires_at"] - datetime.utcnow()).total_seconds()
+    )
+    if etag_matches(request.headers.get("if-none-match"), snapshot["etag"]):
+        return not_modified(headers)
+    if snapshot["logs"]:
+        try:
+            with phase(PHASE_LOGGING):
+                mongodb = await get_mongodb()
+                now = datetime.utcnow()
+                await mongodb["prediction_logs"].insert_many([
+                    {**log, "timestamp": now, "user_id": user_id} for log in snapshot["logs"]
+                ])
+        except Exception as e:
+            # Logging must not fail the request
+            logger.warning("Could not log predictions served from a snapshot: %s", e)
+    return Response(snapshot["body"], media_type="application/json", headers=headers)
+
+
+class PredictionSnapshots:
+    """
+    Prediction responses rebuilt in the background and served from memory.
+    
+    Routers register one build job per snapshot key (a stock symbol, or a
+    sport slate with the default markets and regions). Every
+    `refresh_seconds` each job recomputes its response, which is kept in
+    memory and saved to the MongoDB `prediction_snapshots` collection so a
+    restarted worker can serve it straight away. A request is answered from
+    its snapshot while that is younger than `max_age_seconds`, its data is
+    still fresh and it was made with the current model version; otherwise
+    the endpoint computes the response on demand. Every worker runs its own builder.
+    """
+    
+    def __init__(self, refresh_seconds: int = 300, max_age_seconds: int = 600, collection=None):
+        self.refresh_seconds = refresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self._collection = collection
+        self.jobs: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {}
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self.counters = {"hits": 0, "misses": 0, "builds": 0, "build_failures": 0}
+        self.last_refresh: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def collection(self):
+        if self._collection is None:
+            return (await get_mongodb())["prediction_snapshots"]
+        return self._collection
+    
+    def add_job(self, key: str, build: Callable[[], Awaitable[Dict[str, Any]]]):
+        """Register the coroutine function that builds (make_snapshot) the snapshot for `key`."""
+        self.jobs[key] = build
+    
+    def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        The snapshot for `key` if it was built with model `version` and is
+        fresh: younger than `max_age_seconds` and its data not yet due for a
+        refresh (`expires_at`, e.g. the odds TTL for live games).
+        """
+        snapshot = self.snapshots.get(key)
+        now = datetime.utcnow()
+        if (
+            snapshot is None
+            or snapshot["version"] != version
+            or (now - snapshot["built_at"]).total_seconds() >= self.max_age_seconds
+            or now >= snapshot["expires_at"]
+        ):
+            if key in self.jobs:
+                self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return snapshot
+    
+    async def refresh(self) -> Dict[str, bool]:
+        """Rebuild every snapshot, one at a time; returns whether each build succeeded."""
+        built = {}
+        for key, build in self.jobs.items():
+            try:
+                snapshot = await build()
+            except Exception as e:
+                logger.warning("Prediction snapshot %s failed: %s", key, e)
+                self.counters["build_failures"] += 1
+                built[key] = False
+                continue
+            self.snapshots[key] = snapshot
+            self.counters["builds"] += 1
+            built[key] = True
+            try:
+                await self.save(key, snapshot)
+            except Exception as e:
+                logger.warning("Could not save prediction snapshot %s: %s", key, e)
+        self.last_refresh = datetime.utcnow()
+        return built
+    
+    async def save(self, key: str, snapshot: Dict[str, Any]):
+        await (await self.collection()).update_one({"key": key}, {"$set": {"key": key, **snapshot}}, upsert=True)
+    
+    async def load(self):
+        """Restore snapshots saved by a previous run (stale ones are kept but not served)."""
+        collection = await self.collection()
+        for key in self.jobs:
+            doc = await collection.find_one({"key": key})
+            if doc:
+                self.snapshots[key] = {name: doc[name] for name in (
+                    "body", "version", "etag", "last_modified", "built_at", "expires_at", "logs"
+                )}
+    
+    async def run(self):
+        """Load saved snapshots, then rebuild every `refresh_seconds` until cancelled."""
+        try:
+            await self.load()
+        except Exception as e:
+            logger.warning("Could not load saved prediction snapshots: %s", e)
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Prediction snapshot refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_seconds)
+    
+    def start(self):
+        if self._task is None and self.refresh_seconds > 0 and self.jobs:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": len(self.snapshots),
+            "jobs": len(self.jobs),
+            "last_refresh": self.last_refresh,
+            **self.counters,
+        }
+
+
+prediction_snapshots = PredictionSnapshots(
+    refresh_seconds=settings.snapshot_refresh_seconds,
+    max_age_seconds=settings.snapshot_max_age_seconds
+)
@@ -0,0 +1,259 @@
+"""Elo team ratings built incrementally from completed games."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.database import get_mongodb
+from app.services.external_apis import TheOddsAPI
+from app.services.odds_quota import parse_commence_time
+
+logger = logging.getLogger(__name__)
+
+# (game id, commence time, home team, away team, home score, away score)
+GameResult = Tuple[str, str, str, str, float, float]
+
+
+def game_from_score_event(event: Dict[str, Any]) -> Optional[GameResult]:
+    """A completed game from an Odds API scores event, or None if it is not final."""
+    if not event.get("completed") or not event.get("scores"):
+        return None
+    home, away = event.get("home_team"), event.get("away_team")
+    scores = {s.get("name"): s.get("score") for s in event["scores"]}
+    try:
+        return (event["id"], event.get("commence_time", ""), home, away, float(scores[home]), float(scores[away]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class EloRatings:
+    """
+    Elo ratings per sport.
+    
+    Each completed game moves the two teams' ratings by
+    k * (actual - expected) in opposite directions, so applying a game is
+    O(1) and the table never has to be rebuilt. The home side gets
+    `home_advantage` rating points when computing the expectation.
+    """
+    
+    def __init__(self, k: float = 20.0, home_advantage: float = 65.0, initial: float = 1500.0):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.ratings: Dict[str, Dict[str, float]] = {}
+    
+    def rating(self, sport: str, team: str) -> float:
+        return self.ratings.get(sport, {}).get(team, self.initial)
+    
+    def expected_home(self, sport: str, home: str, away: str) -> float:
+        """Probability the home team wins."""
+        diff = self.rating(sport, away) - self.rating(sport, home) - self.home_advantage
+        return 1.0 / (1.0 + 10 ** (diff / 400))
+    
+    def strength(self, sport: str, team: str) -> float:
+        """Probability the team beats an average team on neutral ground (0.5 if unrated)."""
+        return 1.0 / (1.0 + 10 ** ((self.initial - self.rating(sport, team)) / 400))
+    
+    def update(self, sport: str, home: str, away: str, home_score: float, away_score: float):
+        actual = 1.0 if home_score > away_score else 0.0 if home_score < away_score else 0.5
+        delta = self.k * (actual - self.expected_home(sport, home, away))
+        table = self.ratings.setdefault(sport, {})
+        table[home] = self.rating(sport, home) + delta
+        table[away] = self.rating(sport, away) - delta
+
+
+class FixtureScores:
+    """Scores source that reads <directory>/<sport>.json (Odds API scores payloads) instead of the API."""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+    
+    async def __call__(self, sport: str, days_from: int) -> List[Dict[str, Any]]:
+        path = os.path.join(self.directory, f"{sport}.json")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+
+class TeamRatingService:
+    """
+    Keeps Elo ratings current and serves them from memory.
+    
+    A background loop fetches each sport's recently completed games every
+    `refresh_seconds` and applies the ones not seen before. Every worker
+    runs the loop, but the scores come through the shared API cache (see
+    TheOddsAPI.get_scores), so only the first worker in each interval spends
+    quota on them. The rating table
+    and the ids of recently applied games (enough to skip repeats while they
+    are still returned by the scores endpoint) are saved to the MongoDB
+    `team_ratings` collection after every refresh that changed them, and
+    loaded back at startup. Lookups never touch the database.
+    """
+    
+    def __init__(
+        self,
+        elo: EloRatings,
+        sports: Iterable[str],
+        refresh_seconds: int = 86400,
+        days_from: int = 3,
+        fetch: Callable[[str, int], Awaitable[List[Dict[str, Any]]]] = TheOddsAPI.get_scores,
+        collection=None
+    ):
+        self.elo = elo
+        self.sports = list(sports)
+        self.refresh_seconds = refresh_seconds
+        self.days_from = days_from
+        self.fetch = fetch
+        self._collection = collection
+        # Sport -> game id -> commence time, for games applied recently
+        self.applied: Dict[str, Dict[str, str]] = {}
+        # Sport -> digest of its ratings; revision digests them all, so the same
+        # ratings give the same revision in every worker and after a restart
+        # (it is part of ETags, prediction cache keys and snapshot versions)
+        self._digests: Dict[str, str] = {}
+        self.revision = self._revision()
+        self.last_refresh: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def collection(self):
+        if self._collection is None:
+            return (await get_mongodb())["team_ratings"]
+        return self._collection
+    
+    def _horizon(self, sport: str) -> str:
+        """Commence time before which games are neither applied nor remembered."""
+        seen = self.applied.get(sport)
+        newest = parse_commence_time(max(seen.values())) if seen else None
+        if newest is None:
+            return ""
+        return (newest - timedelta(days=self.days_from + 1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    def _revision(self) -> str:
+        return hashlib.blake2b(repr(sorted(self._digests.items())).encode(), digest_size=8).hexdigest()
+    
+    def _ratings_changed(self, sport: str):
+        """Recompute the revision after `sport`'s ratings change."""
+        ratings = sorted(self.elo.ratings.get(sport, {}).items())
+        self._digests[sport] = hashlib.blake2b(repr(ratings).encode(), digest_size=8).hexdigest()
+        self.revision = self._revision()
+    
+    def apply(self, sport: str, events: List[Dict[str, Any]]) -> int:
+        """
+        Apply completed games not seen before, oldest first.
+        
+        Ids are remembered for games within a few days of the newest applied
+        one, which covers every game the scores endpoint can return again.
+        Older games that were never applied are ignored.
+        
+        Returns:
+            Number of games applied
+        """
+        seen = self.applied.setdefault(sport, {})
+        horizon = self._horizon(sport)
+        games = [
+            game for game in map(game_from_score_event, events)
+            if game and game[0] not in seen and game[1] >= horizon
+        ]
+        for game_id, commence, home, away, home_score, away_score in sorted(games, key=lambda game: game[1]):
+            self.elo.update(sport, home, away, home_score, away_score)
+            seen[game_id] = commence
+        if games:
+            self._ratings_changed(sport)
+            horizon = self._horizon(sport)
+            for game_id in [g for g, commence in seen.items() if commence < horizon]:
+                del seen[game_id]
+        return len(games)
+    
+    async def refresh(self) -> Dict[str, int]:
+        """Fetch and apply new results for every sport; returns games applied per sport."""
+        now = datetime.utcnow()
+        applied = {}
+        for sport in self.sports:
+            try:
+                events = await self.fetch(sport, self.days_from)
+            except Exception as e:
+                logger.warning("Team rating refresh for %s failed: %s", sport, e)
+                continue
+            applied[sport] = self.apply(sport, events)
+            if applied[sport]:
+                await self.save(sport, now)
+        self.last_refresh = now
+        return applied
+    
+    async def save(self, sport: str, now: Optional[datetime] = None):
+        # Stored as lists: team names such as "St. Louis Cardinals" are not valid field names
+        await (await self.collection()).update_one(
+            {"sport": sport},
+            {"$set": {
+                "sport": sport,
+                "ratings": sorted(self.elo.ratings.get(sport, {}).items()),
+                "applied": sorted(self.applied.get(sport, {}).items()),
+                "updated_at": now or datetime.utcnow(),
+            }},
+            upsert=True
+        )
+    
+    async def load(self):
+        """Restore ratings saved by a previous run."""
+        collection = await self.collection()
+        for sport in self.sports:
+            doc = await collection.find_one({"sport": sport})
+            if doc:
+                self.elo.ratings[sport] = {team: rating for team, rating in doc.get("ratings", [])}
+                self.applied[sport] = {game_id: commence for game_id, commence in doc.get("applied", [])}
+                self._ratings_changed(sport)
+    
+    def ratings_for(self, events: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Team -> strength (0-1) for every team in a slate, for SportsPredictionModel.predict."""
+        ratings = {}
+        for event in events:
+            sport = event.get("sport_key", "")
+            for team in (event.get("home_team"), event.get("away_team")):
+                if team and team in self.elo.ratings.get(sport, {}):
+                    ratings[team] = self.elo.strength(sport, team)
+        return ratings
+    
+    async def run(self):
+        """Load saved ratings, then refresh every `refresh_seconds` until cancelled."""
+        try:
+            await self.load()
+        except Exception as e:
+            logger.warning("Could not load saved team ratings: %s", e)
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Team rating refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_seconds)
+    
+    def start(self):
+        if self._task is None and self.refresh_seconds > 0 and self.sports:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sports": {sport: len(self.elo.ratings.get(sport, {})) for sport in self.sports},
+            "revision": self.revision,
+            "last_refresh": self.last_refresh,
+        }
+
+
+team_ratings = TeamRatingService(
+    EloRatings(k=settings.team_ratings_k, home_advantage=settings.team_ratings_home_advantage),
+    sports=settings.team_ratings_sports_list,
+    refresh_seconds=settings.team_ratings_refresh_seconds,
+    fetch=FixtureScores(settings.team_ratings_results_dir) if settings.team_ratings_results_dir else TheOddsAPI.get_scores
+)
@@ -0,0 +1,161 @@
+"""Offline training of versioned stock model artifacts."""
+import hashlib
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+from app.services.backtest import evaluate, fit_logistic, labeled_rows, predict_logistic
+from app.services.prediction_models import StockPredictionModel
+
+MODEL_TYPE = "logistic_regression"
+
+# Symbol -> (trading dates as datetime64[D], closes), both oldest first
+History = Tuple[np.ndarray, np.ndarray]
+
+
+def history_from_payload(price_data: Dict[str, Any]) -> History:
+    """
+    Extract (dates, closes) from a TIME_SERIES_DAILY payload.
+    
+    Args:
+        price_data: Alpha Vantage daily payload
+    
+    Returns:
+        Dates (datetime64[D]) and closing prices, oldest first
+    """
+    time_series = price_data.get("Time Series (Daily)", {})
+    dates = sorted(time_series)
+    return (
+        np.array(dates, dtype="datetime64[D]"),
+        np.array([float(time_series[date]["4. close"]) for date in dates])
+    )
+
+
+def _symbol_rows(history: History) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pool worker: features, labels and prediction dates for one symbol."""
+    dates, closes = history
+    features, labels, positions = labeled_rows(closes)
+    return features, labels, np.asarray(dates)[positions]
+
+
+def build_dataset(histories: Mapping[str, History], workers: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Feature rows for every date of every symbol, computed in parallel.
+    
+    Args:
+        histories: Symbol -> (dates, closes)
+        workers: Processes to spread symbols over (1 = in this process)
+    
+    Returns:
+        (features, labels, dates) stacked across symbols, in symbol order
+    """
+    items = [histories[symbol] for symbol in sorted(histories)]
+    if workers > 1 and len(items) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(items) // (workers * 4))
+            rows = list(pool.map(_symbol_rows, items, chunksize=chunksize))
+    else:
+        rows = [_symbol_rows(item) for item in items]
+    
+    if not rows:
+        return np.empty((0, len(StockPredictionModel.FEATURE_NAMES))), np.empty(0), np.empty(0, dtype="datetime64[D]")
+    features, labels, dates = zip(*rows)
+    return np.concatenate(features), np.concatenate(labels), np.concatenate(dates)
+
+
+def _summary(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in metrics.items() if key != "calibration"}
+
+
+def train_stock_model(
+    histories: Mapping[str, History],
+    C: float = 1.0,
+    holdout_fraction: float = 0.2,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Train the stock model on stored price history and describe it as an artifact.
+    
+    The most recent `holdout_fraction` of the date range is held out (for all
+    symbols at once, so no symbol trains on dates another is scored on), the
+    model is fitted on the rest and scored on both.
+    
+    Args:
+        histories: Symbol -> (dates, closes)
+        C: Inverse regularization strength
+        holdout_fraction: Share of the date range reserved for evaluation
+        workers: Processes for feature building (default: one per CPU)
+    
+    Returns:
+        Artifact dictionary (see save_artifact / StockPredictionModel.load_artifact)
+    """
+    features, labels, dates = build_dataset(histories, workers or os.cpu_count() or 1)
+    if len(labels) == 0:
+        raise ValueError("No training rows: histories are empty or too short")
+    
+    start, end = dates.min(), dates.max()
+    holdout_start = end - int((end - start).astype(int) * holdout_fraction)
+    train = dates < holdout_start if holdout_fraction > 0 else np.ones(len(labels), dtype=bool)
+    if not train.any():
+        raise ValueError("No training rows before the holdout window")
+    
+    w = fit_logistic(features[train][None], labels[train][None], C=C)[0]
+    probabilities = predict_logistic(features, w)
+    
+    # Same data and settings always produce the same version
+    fingerprint = hashlib.sha256()
+    fingerprint.update(np.ascontiguousarray(features).tobytes())
+    fingerprint.update(labels.tobytes())
+    fingerprint.update(json.dumps({"C": C, "holdout_fraction": holdout_fraction}).encode())
+    digest = fingerprint.hexdigest()
+    
+    return {
+        "model_type": MODEL_TYPE,
+        "model_version": f"lr-{str(end).replace('-', '')}-{digest[:8]}",
+        "features": list(StockPredictionModel.FEATURE_NAMES),
+        "coefficients": [float(value) for value in w[:-1]],
+        "intercept": float(w[-1]),
+        "hyperparameters": {"C": C, "holdout_fraction": holdout_fraction},
+        "training_window": {
+            "start": str(start),
+            "end": str(end),
+            "holdout_start": str(holdout_start) if holdout_fraction > 0 else None,
+            "symbols": len(histories),
+            "train_rows": int(train.sum()),
+            "holdout_rows": int((~train).sum()),
+        },
+        "metrics": {
+            "train": _summary(evaluate(probabilities[train], labels[train])),
+            "holdout": _summary(evaluate(probabilities[~train], labels[~train])),
+        },
+        "data_sha256": digest,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+
+def save_artifact(artifact: Dict[str, Any], directory: str, make_latest: bool = True) -> str:
+    """
+    Write an artifact as <directory>/<model_version>.json.
+    
+    Args:
+        artifact: Output of train_stock_model
+        directory: Artifact directory
+        make_latest: Also write it as latest.json (what serving loads by default)
+    
+    Returns:
+        Path of the versioned artifact
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{artifact['model_version']}.json")
+    content = json.dumps(artifact, indent=2)
+    with open(path, "w") as f:
+        f.write(content)
+    if make_latest:
+        # Write-then-rename so a serving process never reads a partial file
+        latest = os.path.join(directory, "latest.json")
+        with open(latest + ".tmp", "w") as f:
+            f.write(content)
+        os.replace(latest + ".tmp", latest)
+    return path
@@ -0,0 +1,83 @@
+"""Per-request phase timing for Server-Timing headers and slow-request sampling."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# Phase names used across the request path
+PHASE_AUTH = "auth"
+PHASE_CACHE = "cache"
+PHASE_RATE_LIMIT = "rate_limit"
+PHASE_UPSTREAM = "upstream"
+PHASE_INDICATORS = "indicators"
+PHASE_INFERENCE = "inference"
+PHASE_LOGGING = "logging"
+PHASE_SERIALIZATION = "serialization"
+
+
+class RequestTimer:
+    """Accumulates named phase durations for a single request."""
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+    
+    def record(self, name: str, duration_ms: float):
+        """Add a phase duration (phases that repeat are summed)."""
+        self.phases[name] = self.phases.get(name, 0.0) + duration_ms
+        self.counts[name] = self.counts.get(name, 0) + 1
+    
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started_at) * 1000
+    
+    def server_timing_header(self, total_ms: Optional[float] = None) -> str:
+        """Render phases as a Server-Timing header value."""
+        entries: List[str] = [
+            f"{name};dur={duration:.2f}" for name, duration in self.phases.items()
+        ]
+        if total_ms is not None:
+            entries.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(entries)
+    
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Return phases with durations and call counts."""
+        return {
+            name: {"duration_ms": round(duration, 3), "count": self.counts[name]}
+            for name, duration in self.phases.items()
+        }
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+
+def start_request_timer() -> RequestTimer:
+    """Create a timer and bind it to the current request context."""
+    timer = RequestTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def get_request_timer() -> Optional[RequestTimer]:
+    """Get the timer for the current request, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time a block of code as a named phase of the current request.
+    
+    Outside of a request (scripts, tests) this is a no-op.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(name, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,50 @@
+"""
+Move aged prediction logs from MongoDB into compressed columnar day files.
+
+Usage (from the backend directory):
+    python archive_logs.py
+    python archive_logs.py --older-than-days 3 --archive-dir /mnt/archive
+    python archive_logs.py --keep
+
+Logs from whole UTC days older than --older-than-days are written to
+<archive-dir>/<prediction_type>/<YYYY-MM-DD>.npz (one NumPy array per column,
+see app/services/prediction_logs.py) and deleted from prediction_logs.
+Run it daily, e.g. from cron; days already archived are skipped.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+from app.config import settings
+from app.services.prediction_logs import archive_prediction_logs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.prediction_logs_archive_after_days,
+        help="Archive days older than this (default: PREDICTION_LOGS_ARCHIVE_AFTER_DAYS)"
+    )
+    parser.add_argument("--archive-dir", default=settings.prediction_logs_archive_dir, help="Archive root directory")
+    parser.add_argument("--keep", action="store_true", help="Write the files but leave the logs in MongoDB")
+    args = parser.parse_args(argv)
+    
+    client = MongoClient(settings.mongodb_uri)
+    try:
+        summary = archive_prediction_logs(
+            client[settings.mongodb_db_name]["prediction_logs"],
+            args.archive_dir,
+            before=datetime.utcnow() - timedelta(days=args.older_than_days),
+            delete=not args.keep
+        )
+    finally:
+        client.close()
+    print(
+        f"Archived {summary['logs']} logs from {summary['days']} days into {summary['files']} files "
+        f"({summary['deleted']} deleted from MongoDB)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Walk-forward backtest of the stock prediction model.
+
+Usage (from the backend directory):
+    python backtest.py --from-store                      # local price store (PRICE_STORE_DIR)
+    python backtest.py --data-dir ./history              # <SYMBOL>.json TIME_SERIES_DAILY payloads
+    python backtest.py --synthetic 1000 --days 1260      # synthetic random-walk histories
+    python backtest.py --synthetic 100 --output report.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from app.services.backtest import TRADING_DAYS, closes_from_payload, run_backtest
+
+
+def load_histories(data_dir: str):
+    """Closing prices for every <SYMBOL>.json daily payload in a directory."""
+    histories = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        symbol = os.path.splitext(os.path.basename(path))[0].upper()
+        with open(path) as f:
+            histories[symbol] = closes_from_payload(json.load(f))
+    return histories
+
+
+def histories_from_store():
+    """Closing prices for every symbol in the local price store (memory-mapped)."""
+    from app.services.price_store import price_store
+    return {symbol: price_store.read(symbol).close for symbol in price_store.symbols()}
+
+
+def synthetic_histories(count: int, days: int):
+    """Deterministic random-walk histories, one per synthetic symbol."""
+    from standin.synth import price_series
+    return {f"SYN{i:05d}": price_series(days, seed=i) for i in range(count)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-store", action="store_true", help="Backtest every symbol in the price store")
+    source.add_argument("--data-dir", help="Directory of <SYMBOL>.json daily payloads")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Backtest N synthetic symbols")
+    parser.add_argument("--days", type=int, default=5 * TRADING_DAYS, help="History length for --synthetic")
+    parser.add_argument("--train-days", type=int, default=TRADING_DAYS, help="Training window per fold")
+    parser.add_argument("--test-days", type=int, default=21, help="Out-of-sample days per fold")
+    parser.add_argument("--C", type=float, default=1.0, help="Inverse regularization strength")
+    parser.add_argument("--output", help="Write the full report (with per-symbol metrics) to a file")
+    args = parser.parse_args(argv)
+    
+    if args.from_store:
+        histories = histories_from_store()
+    elif args.data_dir:
+        histories = load_histories(args.data_dir)
+    else:
+        histories = synthetic_histories(args.synthetic, args.days)
+    if not histories:
+        print("No histories found", file=sys.stderr)
+        return 1
+    
+    report = run_backtest(histories, train_days=args.train_days, test_days=args.test_days, C=args.C)
+    
+    overall = report["overall"]
+    print(f"model {report['model_version']}: {report['symbols_tested']} symbols, "
+          f"{overall['predictions']} predictions in {report['elapsed_ms']:.0f} ms")
+    if overall["predictions"]:
+        print(f"hit rate {overall['hit_rate']:.4f} (base rate {overall['base_rate']:.4f}), "
+              f"Brier {overall['brier']:.4f}, log loss {overall['log_loss']:.4f}, ECE {overall['ece']:.4f}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
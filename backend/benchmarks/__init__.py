@@ -0,0 +1,14 @@
+"""Performance benchmarks for prediction models and API hot paths."""
+import os
+import tempfile
+
+# Settings require these at import time; benchmarks never talk to the real services
+for _name in (
+    "CLERK_SECRET_KEY",
+    "CLERK_PUBLISHABLE_KEY",
+    "ALPHA_VANTAGE_API_KEY",
+    "THE_ODDS_API_KEY",
+):
+    os.environ.setdefault(_name, "benchmark")
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("PRICE_STORE_DIR", tempfile.mkdtemp(prefix="benchmark-prices-"))
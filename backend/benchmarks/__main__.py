@@ -0,0 +1,80 @@
+"""
+Run the benchmark suite.
+
+Usage (from the backend directory):
+    python -m benchmarks                   # run and compare against baseline.json
+    python -m benchmarks --save-baseline   # run and overwrite baseline.json
+    python -m benchmarks --suite models --quick
+"""
+import argparse
+import os
+import sys
+from benchmarks.harness import compare, format_report, load_results, save_results
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SUITES = ("models", "api", "startup")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--suite", choices=SUITES, action="append",
+                        help="Suite to run (repeatable, default: all)")
+    parser.add_argument("--quick", action="store_true", help="Fewer rounds, for smoke runs")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--output", help="Also write this run's results to a file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative change in the compared statistic that counts as a regression")
+    parser.add_argument("--metric", default="median_ms",
+                        choices=("min_ms", "median_ms", "mean_ms", "p95_ms", "p99_ms"),
+                        help="Statistic to compare")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit non-zero when any benchmark regresses")
+    args = parser.parse_args(argv)
+    
+    results = {}
+    for suite in args.suite or SUITES:
+        if suite == "models":
+            from benchmarks import bench_models
+            results.update(bench_models.run(quick=args.quick))
+        elif suite == "api":
+            from benchmarks import bench_api
+            results.update(bench_api.run(quick=args.quick))
+        elif suite == "startup":
+            from benchmarks import bench_startup
+            results.update(bench_startup.run(quick=args.quick))
+    
+    if args.output:
+        save_results(args.output, results)
+    
+    exit_code = 0
+    if "startup.ready" in results:
+        from benchmarks import bench_startup
+        ready_ms = results["startup.ready"]["median_ms"]
+        budget_ms = bench_startup.COLD_START_BUDGET_MS
+        print(f"Cold start: {ready_ms:.0f} ms to ready (budget {budget_ms:.0f} ms)")
+        if bench_startup.over_budget(results):
+            print("Cold start is over budget")
+            exit_code = 1 if args.fail_on_regression else 0
+    
+    if args.save_baseline:
+        stored = load_results(args.baseline) or {"results": {}}
+        merged = {**stored["results"], **results}
+        save_results(args.baseline, merged)
+        print(f"Saved {len(results)} benchmark(s) to {args.baseline}")
+        return exit_code
+    
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return exit_code
+    
+    report = compare(results, baseline["results"], threshold=args.threshold, metric=args.metric)
+    print(format_report(report, metric=args.metric))
+    if args.fail_on_regression and report["regressions"]:
+        return 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""End-to-end latency and throughput benchmarks for the API routers."""
+import asyncio
+import itertools
+from typing import Dict
+from benchmarks import standins
+from benchmarks.harness import measure_async
+
+CONCURRENCY_LEVELS = [1, 16]
+
+
+def build_app():
+    """Assemble the API the way main.py does, minus database DDL."""
+    from fastapi import FastAPI
+    from app.admission import build_admission_controller
+    from app.middleware import AdmissionMiddleware, ServerTimingMiddleware
+    from app.routers import stocks, sports, analytics
+    
+    app = FastAPI()
+    # One client drives all the load: keep the middleware, drop the per-client rates
+    app.add_middleware(AdmissionMiddleware, controller=build_admission_controller(ip_rate=0, user_rate=0))
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(stocks.router)
+    app.include_router(sports.router)
+    app.include_router(analytics.router)
+    return app
+
+
+async def _run(quick: bool) -> Dict[str, Dict[str, float]]:
+    import httpx
+    from app.config import settings
+    
+    mongo = standins.install(history_days=100, slate_events=10, bookmakers=5)
+    app = build_app()
+    requests = 50 if quick else 300
+    results = {}
+    
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench"
+    ) as client:
+        
+        async def stock_warm():
+            response = await client.get("/stocks/predictions", params={"symbol": "AAPL"})
+            assert response.status_code == 200, response.text
+        
+        symbols = (f"SYM{i}" for i in itertools.count())
+        
+        async def stock_backfill():
+            # Every request is a never-seen symbol: one full-history upstream fetch into the price store
+            mongo[settings.mongodb_db_name]["rate_limits"].documents.clear()
+            response = await client.get("/stocks/predictions", params={"symbol": next(symbols)})
+            assert response.status_code == 200, response.text
+        
+        async def sports_warm():
+            response = await client.get("/sports/predictions", params={"sport": "basketball_nba"})
+            assert response.status_code == 200, response.text
+        
+        for concurrency in CONCURRENCY_LEVELS:
+            results[f"api.stocks_predictions.warm[c={concurrency}]"] = await measure_async(
+                stock_warm, requests=requests, concurrency=concurrency
+            )
+            results[f"api.stocks_predictions.backfill[c={concurrency}]"] = await measure_async(
+                stock_backfill, requests=requests, concurrency=concurrency
+            )
+            results[f"api.sports_predictions.warm[c={concurrency}]"] = await measure_async(
+                sports_warm, requests=requests, concurrency=concurrency
+            )
+    
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, float]]:
+    """Run all API benchmarks."""
+    return asyncio.run(_run(quick))
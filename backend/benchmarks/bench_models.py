@@ -0,0 +1,100 @@
+"""Benchmarks for the prediction models."""
+from typing import Dict
+from standin.synth import alpha_vantage_daily, odds_event, odds_slate, price_series
+from benchmarks.harness import measure
+
+PRICE_HISTORY_SIZES = [10, 100, 1000, 5000]
+PREDICT_HISTORY_SIZES = [10, 100, 1000]
+BOOKMAKER_COUNTS = [1, 5, 20]
+SLATE_SIZES = [10, 300]
+MARKET_COUNTS = [5000]
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, float]]:
+    """Run all model benchmarks."""
+    import numpy as np
+    from app.services.line_scanner import scan_lines
+    from app.services.odds_math import VIG_METHODS, implied_probabilities, remove_vig
+    from app.services.prediction_models import StockPredictionModel, SportsPredictionModel
+    
+    rounds = 5 if quick else 20
+    results = {}
+    
+    for size in PRICE_HISTORY_SIZES:
+        prices = price_series(size).tolist()
+        results[f"models.calculate_indicators[{size}]"] = measure(
+            lambda: StockPredictionModel.calculate_indicators(prices),
+            rounds=rounds,
+            number=100
+        )
+    
+    for size in PREDICT_HISTORY_SIZES:
+        payload = alpha_vantage_daily("BENCH", size, seed=0)
+        results[f"models.stock_predict[{size}d]"] = measure(
+            lambda: StockPredictionModel.predict(payload),
+            rounds=rounds,
+            number=5
+        )
+    
+    for count in BOOKMAKER_COUNTS:
+        event = odds_event(0, count)
+        results[f"models.sports_predict[{count}bk]"] = measure(
+            lambda: SportsPredictionModel.predict(event),
+            rounds=rounds,
+            number=200
+        )
+    
+    for size in SLATE_SIZES:
+        events = [odds_event(i, 5) for i in range(size)]
+        results[f"models.sports_predict_many[{size}ev]"] = measure(
+            lambda: SportsPredictionModel.predict_many(events),
+            rounds=rounds,
+            number=10
+        )
+    
+    for count in MARKET_COUNTS:
+        prices = np.random.default_rng(0).choice([-250, -110, -105, 100, 150, 320], size=(count, 2))
+        implied = implied_probabilities(prices)
+        results[f"models.implied_probabilities[{count}x2]"] = measure(
+            lambda: implied_probabilities(prices),
+            rounds=rounds,
+            number=100
+        )
+        for method in VIG_METHODS:
+            results[f"models.remove_vig[{method},{count}x2]"] = measure(
+                lambda: remove_vig(implied, method),
+                rounds=rounds,
+                number=5
+            )
+    
+    markets = ("h2h", "spreads", "totals")
+    slate = odds_slate(30, 20, markets=markets)
+    predictions = SportsPredictionModel.predict_markets({market: slate for market in markets})
+    results["models.scan_lines[30ev,20bk,3mk]"] = measure(
+        lambda: scan_lines(slate, markets, predictions),
+        rounds=rounds,
+        number=5
+    )
+    
+    american = [-110, 150, -250, 320, 100, -105]
+    results["models.implied_probability_from_odds[american]"] = measure(
+        lambda: [SportsPredictionModel.implied_probability_from_odds(o) for o in american],
+        rounds=rounds,
+        number=1000
+    )
+    decimal = [1.91, 2.5, 1.4, 4.2, 2.0, 1.95]
+    results["models.implied_probability_from_odds[decimal]"] = measure(
+        lambda: [SportsPredictionModel.implied_probability_from_odds(o, "decimal") for o in decimal],
+        rounds=rounds,
+        number=1000
+    )
+    
+    from app.services.backtest import run_backtest
+    histories = {f"SYN{i}": price_series(1260, seed=i) for i in range(20 if quick else 100)}
+    results[f"models.backtest[{len(histories)}x5y]"] = measure(
+        lambda: run_backtest(histories),
+        rounds=3 if quick else 5,
+        number=1
+    )
+    
+    return results
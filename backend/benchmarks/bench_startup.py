@@ -0,0 +1,66 @@
+"""Cold-start benchmarks: how long a fresh worker takes to become ready."""
+import os
+import subprocess
+import sys
+import time
+from typing import Dict
+from benchmarks.harness import summarize
+
+# A fresh worker must import the app and answer /health within this budget
+COLD_START_BUDGET_MS = 2000.0
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT_SCRIPT = """
+import main
+print("ready", flush=True)
+"""
+
+_READY_SCRIPT = """
+from fastapi.testclient import TestClient
+import main
+with TestClient(main.app) as client:
+    assert client.get("/health").status_code == 200
+    print("ready", flush=True)
+"""
+
+
+def _time_to_ready(script: str, runs: int) -> Dict[str, float]:
+    """Time from spawning a fresh interpreter until it prints 'ready'."""
+    env = {**os.environ, "WARMUP_MODELS_ON_STARTUP": "false", "TEAM_RATINGS_REFRESH_SECONDS": "0"}
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        line = process.stdout.readline()
+        elapsed = (time.perf_counter() - started) * 1000
+        # Shutdown time is not part of the cold-start budget
+        process.wait()
+        if line.strip() != "ready":
+            raise RuntimeError(f"Startup script failed (exit code {process.returncode})")
+        samples.append(elapsed)
+    return summarize(samples)
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, float]]:
+    """Run cold-start benchmarks in fresh interpreters."""
+    runs = 3 if quick else 10
+    results = {
+        "startup.import_main": _time_to_ready(_IMPORT_SCRIPT, runs),
+        "startup.ready": _time_to_ready(_READY_SCRIPT, runs),
+    }
+    results["startup.ready"]["budget_ms"] = COLD_START_BUDGET_MS
+    return results
+
+
+def over_budget(results: Dict[str, Dict[str, float]]) -> bool:
+    """Whether the measured time-to-ready exceeds the cold-start budget."""
+    ready = results.get("startup.ready")
+    return bool(ready) and ready["median_ms"] > COLD_START_BUDGET_MS
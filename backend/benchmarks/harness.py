@@ -0,0 +1,195 @@
+"""Timing harness, baseline storage and regression comparison."""
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Summary statistics for a list of per-operation timings."""
+    ordered = sorted(samples_ms)
+    median = statistics.median(ordered)
+    return {
+        "min_ms": round(ordered[0], 6),
+        "median_ms": round(median, 6),
+        "mean_ms": round(statistics.fmean(ordered), 6),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 6),
+        "ops_per_sec": round(1000 / median, 3) if median > 0 else 0.0,
+        "samples": len(ordered),
+    }
+
+
+def measure(
+    fn: Callable[[], Any],
+    rounds: int = 20,
+    number: int = 10,
+    warmup: int = 2
+) -> Dict[str, float]:
+    """
+    Time a synchronous callable.
+    
+    Args:
+        fn: Zero-argument callable to benchmark
+        rounds: Number of timed rounds
+        number: Calls per round (per-call time is the round time / number)
+        warmup: Untimed rounds run first
+    
+    Returns:
+        Summary statistics in milliseconds per call
+    """
+    for _ in range(warmup):
+        for _ in range(number):
+            fn()
+    
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000 / number)
+    return summarize(samples)
+
+
+async def measure_async(
+    fn: Callable[[], Awaitable[Any]],
+    requests: int = 200,
+    concurrency: int = 1,
+    warmup: int = 10
+) -> Dict[str, float]:
+    """
+    Time an async callable for latency and throughput.
+    
+    Args:
+        fn: Zero-argument coroutine function to benchmark
+        requests: Total timed calls
+        concurrency: Calls in flight at once
+        warmup: Untimed calls run first
+    
+    Returns:
+        Latency statistics in milliseconds plus overall throughput
+    """
+    import asyncio
+    
+    for _ in range(warmup):
+        await fn()
+    
+    samples: List[float] = []
+    
+    async def worker(count: int):
+        for _ in range(count):
+            started = time.perf_counter()
+            await fn()
+            samples.append((time.perf_counter() - started) * 1000)
+    
+    per_worker = [requests // concurrency] * concurrency
+    for i in range(requests % concurrency):
+        per_worker[i] += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(count) for count in per_worker))
+    elapsed = time.perf_counter() - started
+    
+    stats = summarize(samples)
+    stats["throughput_rps"] = round(requests / elapsed, 3)
+    stats["concurrency"] = concurrency
+    return stats
+
+
+def environment_info() -> Dict[str, str]:
+    """Describe the machine results were recorded on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def save_results(path: str, results: Dict[str, Dict[str, float]]):
+    """Write results with environment metadata to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "recorded_at": datetime.utcnow().isoformat(),
+                "environment": environment_info(),
+                "results": results,
+            },
+            f,
+            indent=2,
+            sort_keys=True
+        )
+        f.write("\n")
+
+
+def load_results(path: str) -> Optional[Dict[str, Any]]:
+    """Load a stored results file, or None if it does not exist."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = 0.25,
+    metric: str = "median_ms"
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Compare results against a baseline.
+    
+    A benchmark regresses when its metric grows by more than `threshold`
+    (as a fraction of the baseline) and improves when it shrinks by more.
+    
+    Returns:
+        Rows grouped into 'regressions', 'improvements', 'unchanged', 'new'
+    """
+    report: Dict[str, List[Dict[str, Any]]] = {
+        "regressions": [],
+        "improvements": [],
+        "unchanged": [],
+        "new": [],
+    }
+    for name, stats in sorted(current.items()):
+        base = baseline.get(name)
+        if not base or not base.get(metric):
+            report["new"].append({"name": name, "current": stats[metric]})
+            continue
+        
+        ratio = stats[metric] / base[metric]
+        row = {
+            "name": name,
+            "baseline": base[metric],
+            "current": stats[metric],
+            "change": round(ratio - 1, 4),
+        }
+        if ratio > 1 + threshold:
+            report["regressions"].append(row)
+        elif ratio < 1 - threshold:
+            report["improvements"].append(row)
+        else:
+            report["unchanged"].append(row)
+    return report
+
+
+def format_report(report: Dict[str, List[Dict[str, Any]]], metric: str = "median_ms") -> str:
+    """Render a comparison report as a plain-text table."""
+    lines = [f"{'benchmark':<55} {'baseline':>12} {'current':>12} {'change':>9}  status"]
+    for status in ("regressions", "improvements", "unchanged"):
+        for row in report[status]:
+            lines.append(
+                f"{row['name']:<55} {row['baseline']:>12.4f} {row['current']:>12.4f} "
+                f"{row['change']:>+8.1%}  {status.rstrip('s')}"
+            )
+    for row in report["new"]:
+        lines.append(f"{row['name']:<55} {'-':>12} {row['current']:>12.4f} {'-':>9}  new")
+    lines.append(
+        f"\n{len(report['regressions'])} regression(s), "
+        f"{len(report['improvements'])} improvement(s) ({metric})"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,292 @@
+"""
+In-process stand-ins for MongoDB, Redis and the upstream APIs.
+
+Benchmarks run the real routers, rate limiter and HTTP client code, but
+MongoDB is replaced by in-memory collections and httpx requests are
+answered in-process by the upstream stand-in app (`standin.server`).
+InMemoryRedis stands in for a redis-py client for RedisCacheBackend.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional
+import httpx
+from pymongo.results import DeleteResult
+
+_OPERATORS = {
+    "$gte": lambda value, arg: value is not None and value >= arg,
+    "$gt": lambda value, arg: value is not None and value > arg,
+    "$lte": lambda value, arg: value is not None and value <= arg,
+    "$lt": lambda value, arg: value is not None and value < arg,
+    "$in": lambda value, arg: value in arg,
+    "$ne": lambda value, arg: value != arg,
+}
+
+
+def _matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate a simple MongoDB filter (equality and comparison operators)."""
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if not all(_OPERATORS[op](value, arg) for op, arg in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class InMemoryCollection:
+    """The subset of the pymongo Collection API used by the app."""
+    
+    def __init__(self):
+        self.documents: List[Dict[str, Any]] = []
+    
+    def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for document in self.documents:
+            if _matches(document, query):
+                return document
+        return None
+    
+    def find(self, query: Optional[Dict[str, Any]] = None, sort: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        found = [d for d in self.documents if _matches(d, query or {})]
+        for field, direction in reversed(sort or []):
+            found.sort(key=lambda d: d.get(field), reverse=direction < 0)
+        return found
+    
+    def count_documents(self, query: Dict[str, Any]) -> int:
+        return sum(1 for d in self.documents if _matches(d, query))
+    
+    def insert_one(self, document: Dict[str, Any]):
+        self.documents.append(dict(document))
+    
+    def insert_many(self, documents: List[Dict[str, Any]]):
+        self.documents.extend(dict(d) for d in documents)
+    
+    def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        document = self.find_one(query)
+        if document is None:
+            if not upsert:
+                return
+            document = dict(query)
+            self.documents.append(document)
+        document.update(update.get("$set", {}))
+    
+    def bulk_write(self, requests: List[Any], ordered: bool = True):
+        # pymongo UpdateOne requests only
+        for request in requests:
+            self.update_one(request._filter, request._doc, upsert=request._upsert)
+    
+    def delete_many(self, query: Dict[str, Any]):
+        before = len(self.documents)
+        self.documents = [d for d in self.documents if not _matches(d, query)]
+        return DeleteResult({"n": before - len(self.documents)}, True)
+
+
+class InMemoryDatabase(dict):
+    """Database whose collections are created on first access."""
+    
+    def __missing__(self, name: str) -> InMemoryCollection:
+        collection = InMemoryCollection()
+        self[name] = collection
+        return collection
+
+
+class InMemoryMongoClient(dict):
+    """Synchronous client stand-in (pymongo.MongoClient)."""
+    
+    def __missing__(self, name: str) -> InMemoryDatabase:
+        database = InMemoryDatabase()
+        self[name] = database
+        return database
+    
+    def close(self):
+        pass
+
+
+class AsyncInMemoryCursor:
+    """Async-iterable over a query's results, like a motor cursor."""
+    
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self._documents = iter(documents)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> Dict[str, Any]:
+        try:
+            return next(self._documents)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncInMemoryCollection:
+    """Async wrapper matching the motor collection methods the app awaits."""
+    
+    def __init__(self, collection: InMemoryCollection):
+        self._collection = collection
+    
+    async def insert_one(self, document: Dict[str, Any]):
+        self._collection.insert_one(document)
+    
+    async def insert_many(self, documents: List[Dict[str, Any]]):
+        self._collection.insert_many(documents)
+    
+    async def find_one(self, query: Dict[str, Any]):
+        return self._collection.find_one(query)
+    
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Any = None, sort: Optional[List[Any]] = None, **options):
+        # Projection and cursor options (batch_size, allow_disk_use) are accepted and ignored
+        return AsyncInMemoryCursor(self._collection.find(query, sort=sort))
+    
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        self._collection.update_one(query, update, upsert=upsert)
+
+
+class AsyncInMemoryMongoClient:
+    """Async client stand-in (motor AsyncIOMotorClient) sharing the sync data."""
+    
+    def __init__(self, sync_client: InMemoryMongoClient):
+        self._sync_client = sync_client
+    
+    def __getitem__(self, name: str):
+        database = self._sync_client[name]
+        
+        class _AsyncDatabase:
+            def __getitem__(self, collection_name: str):
+                return AsyncInMemoryCollection(database[collection_name])
+        
+        return _AsyncDatabase()
+    
+    def close(self):
+        pass
+
+
+class InMemoryPubSub:
+    """redis-py PubSub stand-in; messages are delivered synchronously on publish."""
+    
+    def __init__(self, server: "InMemoryRedis"):
+        self._server = server
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+    
+    def subscribe(self, **handlers: Callable[[Dict[str, Any]], None]):
+        self.handlers.update(handlers)
+        self._server.subscribers.append(self)
+    
+    def run_in_thread(self, sleep_time: float = 0.0, daemon: bool = False) -> "InMemoryPubSub":
+        return self
+    
+    def stop(self):
+        if self in self._server.subscribers:
+            self._server.subscribers.remove(self)
+
+
+class InMemoryPipeline:
+    """redis-py Pipeline stand-in: queues commands and runs them on execute()."""
+    
+    def __init__(self, server: "InMemoryRedis"):
+        self._server = server
+        self._commands: List[Any] = []
+    
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._commands.append((getattr(self._server, name), args, kwargs))
+            return self
+        return queue
+    
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class InMemoryRedis:
+    """The subset of the redis-py client API used by RedisCacheBackend; values are bytes."""
+    
+    def __init__(self):
+        # Key -> (value, expiry on the time.monotonic clock or None)
+        self.values: Dict[str, Any] = {}
+        self.subscribers: List[InMemoryPubSub] = []
+    
+    def get(self, key: str) -> Optional[bytes]:
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return value
+    
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+    
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        if not isinstance(value, bytes):
+            value = str(value).encode()
+        self.values[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+    
+    def incr(self, key: str) -> int:
+        count = int(self.get(key) or 0) + 1
+        expires_at = self.values.get(key, (None, None))[1]
+        self.values[key] = (str(count).encode(), expires_at)
+        return count
+    
+    def expire(self, key: str, seconds: int) -> bool:
+        if self.get(key) is None:
+            return False
+        self.values[key] = (self.values[key][0], time.monotonic() + seconds)
+        return True
+    
+    def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+    
+    def publish(self, channel: str, message: Any) -> int:
+        if not isinstance(message, bytes):
+            message = str(message).encode()
+        receivers = [s for s in self.subscribers if channel in s.handlers]
+        for subscriber in receivers:
+            subscriber.handlers[channel]({"type": "message", "channel": channel.encode(), "data": message})
+        return len(receivers)
+    
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> InMemoryPubSub:
+        return InMemoryPubSub(self)
+    
+    def pipeline(self) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+
+def install(history_days: int = 100, slate_events: int = 10, bookmakers: int = 5) -> InMemoryMongoClient:
+    """
+    Point the app at the in-memory stand-ins.
+    
+    Must be called before importing modules that touch MongoDB at import time.
+    """
+    from app import database
+    
+    sync_client = InMemoryMongoClient()
+    database.mongodb_sync_client = sync_client
+    database.mongodb_client = AsyncInMemoryMongoClient(sync_client)
+    
+    from standin.server import StandinSettings, create_app
+    upstream = create_app(StandinSettings(
+        compact_days=history_days,
+        slate_events=slate_events,
+        bookmakers=bookmakers,
+        odds_quota=10 ** 9
+    ))
+    transport = httpx.ASGITransport(app=upstream)
+    real_async_client = httpx.AsyncClient
+    
+    def async_client_factory(*args, **kwargs):
+        kwargs["transport"] = transport
+        return real_async_client(*args, **kwargs)
+    
+    class _HttpxWithTransport:
+        """httpx module proxy whose AsyncClient uses the stand-in transport."""
+        AsyncClient = staticmethod(async_client_factory)
+        
+        def __getattr__(self, name):
+            return getattr(httpx, name)
+    
+    from app.services import external_apis
+    external_apis.httpx = _HttpxWithTransport()
+    external_apis.rate_limiter.max_requests = 10 ** 9
+    external_apis.rate_limiter.limits = {}
+    external_apis.rate_limiter._db = None
+    
+    return sync_client
@@ -0,0 +1,53 @@
+"""
+Backfill or refresh the local price store from Alpha Vantage.
+
+Usage (from the backend directory):
+    python ingest_prices.py AAPL MSFT GOOGL
+    python ingest_prices.py --symbols-file watchlist.txt
+    python ingest_prices.py --force-full AAPL
+
+Symbols already backfilled only cost a compact request, and none at all
+when their history is current. Symbols are ingested one at a time so the
+Alpha Vantage rate limit is respected.
+"""
+import argparse
+import asyncio
+import sys
+from app.database import connect_mongodb, disconnect_mongodb
+from app.services.ingestion import price_ingestion
+
+
+async def ingest(symbols, force_full: bool) -> int:
+    await connect_mongodb()
+    failures = 0
+    try:
+        for symbol in symbols:
+            try:
+                result = await price_ingestion.ingest(symbol, force_full=force_full)
+                print(f"{result['symbol']}: {result['mode']}, {result['new_bars']} new bars, {result['bytes']} bytes")
+            except Exception as e:
+                failures += 1
+                print(f"{symbol.upper()}: failed ({e})", file=sys.stderr)
+    finally:
+        await disconnect_mongodb()
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("symbols", nargs="*", help="Ticker symbols")
+    parser.add_argument("--symbols-file", help="File with one symbol per line")
+    parser.add_argument("--force-full", action="store_true", help="Re-fetch entire histories")
+    args = parser.parse_args(argv)
+    
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not symbols:
+        parser.error("no symbols given")
+    return asyncio.run(ingest(symbols, args.force_full))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
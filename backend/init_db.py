@@ -1,7 +1,126 @@
-"""Initialize database tables."""
+"""
+Initialize database tables and MongoDB indexes.
+
+Run once per deployment, before starting API workers; the API itself never
+runs DDL at import or startup.
+"""
+from datetime import datetime
+from bson import ObjectId
+from pymongo import MongoClient, ASCENDING
+from pymongo.errors import CollectionInvalid
+from app.config import settings
 from app.database import Base, engine
+import app.models  # noqa: F401  (registers the tables on Base.metadata)
+
+
+def create_tables():
+    """Create PostgreSQL tables."""
+    Base.metadata.create_all(bind=engine)
+
+
+# Legacy prediction logs copied per round trip
+LEGACY_LOGS_BATCH_SIZE = 1000
+
+
+def legacy_log_timestamp(doc) -> datetime:
+    """
+    When a prediction_logs entry from before the time-series collection was written.
+    
+    Those entries stored the event's start time or the quote's date under
+    `timestamp`, usually as a string, so the time comes from the ObjectId.
+    """
+    if isinstance(doc.get("_id"), ObjectId):
+        return doc["_id"].generation_time.replace(tzinfo=None)
+    if isinstance(doc.get("timestamp"), datetime):
+        return doc["timestamp"]
+    return datetime.utcnow()
+
+
+def legacy_log_document(doc):
+    """A legacy prediction_logs entry in the current shape, with a backfilled timestamp."""
+    document = {**doc, "timestamp": legacy_log_timestamp(doc)}
+    if doc.get("event_id") and not doc.get("commence_time") and isinstance(doc.get("timestamp"), str):
+        # Sports entries stored the event's start time as their timestamp
+        document["commence_time"] = doc["timestamp"]
+    return document
+
+
+def migrate_legacy_prediction_logs(db, batch_size: int = LEGACY_LOGS_BATCH_SIZE) -> int:
+    """
+    Move prediction_logs_legacy into the time-series prediction_logs.
+    
+    Each batch is deleted from the legacy collection once it is copied, so
+    an interrupted migration resumes where it stopped; the emptied legacy
+    collection is dropped. Entries older than the retention period expire
+    soon after they are copied.
+    
+    Returns:
+        Number of entries moved
+    """
+    legacy = db["prediction_logs_legacy"]
+    moved = 0
+    while True:
+        batch = list(legacy.find({}, sort=[("_id", ASCENDING)], limit=batch_size))
+        if not batch:
+            break
+        db["prediction_logs"].insert_many([legacy_log_document(doc) for doc in batch])
+        legacy.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        moved += len(batch)
+    legacy.drop()
+    return moved
+
+
+def create_prediction_logs_collection(db):
+    """
+    Create prediction_logs as a time-series collection with retention.
+    
+    A regular prediction_logs collection left by an earlier version cannot
+    be converted in place; it is renamed to prediction_logs_legacy and its
+    entries are moved into the new collection.
+    """
+    retention = settings.prediction_logs_retention_days * 86400
+    options = db["prediction_logs"].options()
+    if options and "timeseries" not in options:
+        db["prediction_logs"].rename("prediction_logs_legacy")
+        print("Renamed the existing prediction_logs collection to prediction_logs_legacy")
+    try:
+        db.create_collection(
+            "prediction_logs",
+            timeseries={"timeField": "timestamp", "metaField": "prediction_type", "granularity": "seconds"},
+            expireAfterSeconds=retention
+        )
+    except CollectionInvalid:
+        # Already a time-series collection: keep its retention in step with the settings
+        db.command("collMod", "prediction_logs", expireAfterSeconds=retention)
+    # Settlement looks logs up by what was predicted
+    db["prediction_logs"].create_index([("symbol", ASCENDING), ("timestamp", ASCENDING)])
+    db["prediction_logs"].create_index([("event_id", ASCENDING), ("timestamp", ASCENDING)])
+    # Exports read a type's or a user's logs in time order
+    db["prediction_logs"].create_index([("prediction_type", ASCENDING), ("timestamp", ASCENDING)])
+    db["prediction_logs"].create_index([("user_id", ASCENDING), ("timestamp", ASCENDING)])
+    if "prediction_logs_legacy" in db.list_collection_names():
+        moved = migrate_legacy_prediction_logs(db)
+        print(f"Moved {moved} entries from prediction_logs_legacy to prediction_logs")
+
+
+def create_mongodb_indexes():
+    """Create MongoDB collections and indexes used by the cache, rate limiter and prediction logs."""
+    client = MongoClient(settings.mongodb_uri)
+    try:
+        db = client[settings.mongodb_db_name]
+        db["api_cache"].create_index("key", unique=True)
+        db["rate_limits"].create_index([("api_name", ASCENDING), ("timestamp", ASCENDING)])
+        # Rate-limit records are only needed for the current window
+        db["rate_limits"].create_index("timestamp", expireAfterSeconds=3600, name="rate_limits_ttl")
+        create_prediction_logs_collection(db)
+    finally:
+        client.close()
+
 
 if __name__ == "__main__":
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    create_tables()
     print("Database tables created successfully!")
+    print("Creating MongoDB indexes...")
+    create_mongodb_indexes()
+    print("MongoDB indexes created successfully!")
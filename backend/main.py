@@ -1,12 +1,23 @@
-"""FastAPI application entry point."""
+"""
+FastAPI application entry point.
+
+Importing this module does no I/O and no heavy ML imports: database tables are
+created by `init_db.py`, and scikit-learn is loaded by a background warmup
+after startup (or on first use).
+"""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import connect_mongodb, disconnect_mongodb, Base, engine
-from app.routers import auth, stocks, sports, user, analytics
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.database import connect_mongodb, disconnect_mongodb
+from app.admission import admission
+from app.middleware import AdmissionMiddleware, ServerTimingMiddleware
+from app.services.external_apis import odds_quota, rate_limiter, upstream_breakers
+from app.services.inference import inference_executor
+from app.services.prediction_cache import prediction_cache
+from app.services.snapshots import prediction_snapshots
+from app.services.team_ratings import team_ratings
+from app.routers import auth, stocks, sports, user, analytics, export
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -15,6 +26,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Reject clients over their limits (inside CORS, so browsers can read the 429s)
+app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -22,25 +36,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Last-Modified", "Cache-Control", "Retry-After"],
 )
 
+# Record per-request phase timings (outermost, so it sees the whole request)
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(stocks.router)
 app.include_router(sports.router)
 app.include_router(user.router)
 app.include_router(analytics.router)
+app.include_router(export.router)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize connections on startup."""
     await connect_mongodb()
+    inference_executor.start()
+    # Loads saved ratings, then refreshes them in the background
+    team_ratings.start()
+    # Builds the configured prediction snapshots in the background
+    prediction_snapshots.start()
+    
+    # Process-pool workers warm themselves; otherwise warm this process
+    if settings.warmup_models_on_startup and inference_executor.mode != "process":
+        # Not awaited: the worker starts serving while models warm up
+        from app.services.prediction_models import warmup_models
+        asyncio.get_running_loop().run_in_executor(None, warmup_models)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up connections on shutdown."""
+    await team_ratings.stop()
+    await prediction_snapshots.stop()
+    inference_executor.shutdown()
     await disconnect_mongodb()
 
 
@@ -58,3 +91,19 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Internal performance metrics."""
+    return {
+        "inference": inference_executor.stats(),
+        "admission": admission.stats(),
+        "odds_quota": odds_quota.last,
+        "cache_codec": rate_limiter.codec.stats(),
+        "cache_backend": rate_limiter.backend.stats(),
+        "prediction_cache": prediction_cache.stats(),
+        "team_ratings": team_ratings.stats(),
+        "prediction_snapshots": prediction_snapshots.stats(),
+        "upstreams": {name: breaker.stats() for name, breaker in upstream_breakers.items()}
+    }
@@ -0,0 +1 @@
+"""Local stand-in server for the upstream APIs (Alpha Vantage, The Odds API, Clerk)."""
@@ -0,0 +1,58 @@
+"""
+Run the upstream stand-in server.
+
+Usage (from the backend directory):
+    python -m standin --port 8001 --latency-ms 80 --error-rate 0.01
+
+Then point the API at it:
+    ALPHA_VANTAGE_BASE_URL=http://localhost:8001/query
+    THE_ODDS_API_BASE_URL=http://localhost:8001/v4
+    CLERK_JWKS_URL=http://localhost:8001/v1/jwks
+"""
+import argparse
+import os
+import sys
+import uvicorn
+
+OPTIONS = {
+    "latency_ms": float,
+    "latency_jitter_ms": float,
+    "error_rate": float,
+    "rate_limit_rate": float,
+    "compact_days": int,
+    "full_days": int,
+    "slate_events": int,
+    "bookmakers": int,
+    "odds_quota": int,
+    "fixtures_dir": str,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m standin", description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1)
+    for name, type_ in OPTIONS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type_, dest=name)
+    args = parser.parse_args(argv)
+    
+    # Options travel through the environment so every worker process sees them
+    for name in OPTIONS:
+        value = getattr(args, name)
+        if value is not None:
+            os.environ[f"STANDIN_{name.upper()}"] = str(value)
+    
+    uvicorn.run(
+        "standin.server:create_app_from_env",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Local stand-in for Alpha Vantage, The Odds API and Clerk.
+
+Serves recorded fixtures when one exists for the request and synthesizes
+payloads otherwise. Latency, error rate, rate-limit responses and the
+Odds API quota are configurable so load tests can exercise the real stack
+offline without spending API quota.
+"""
+import asyncio
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse, Response
+from pydantic_settings import BaseSettings
+from standin.synth import alpha_vantage_daily, bulk_quotes, completed_games, global_quote, odds_slate
+
+# Alpha Vantage answers at most this many symbols per REALTIME_BULK_QUOTES call
+BULK_QUOTE_LIMIT = 100
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+ALPHA_VANTAGE_RATE_LIMIT_NOTE = (
+    "Thank you for using Alpha Vantage! Our standard API call frequency is "
+    "5 calls per minute and 500 calls per day."
+)
+
+
+class StandinSettings(BaseSettings):
+    """Stand-in behaviour, configurable with STANDIN_* environment variables."""
+    
+    fixtures_dir: str = DEFAULT_FIXTURES_DIR
+    
+    # Injected faults
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    
+    # Synthesized data sizes
+    compact_days: int = 100
+    full_days: int = 5000
+    slate_events: int = 12
+    bookmakers: int = 8
+    
+    # The Odds API monthly quota (per stand-in process)
+    odds_quota: int = 500
+    
+    class Config:
+        env_prefix = "STANDIN_"
+        case_sensitive = False
+
+
+def _json(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def create_app(config: Optional[StandinSettings] = None) -> FastAPI:
+    """Build the stand-in ASGI app."""
+    config = config or StandinSettings()
+    app = FastAPI(title="Predict upstream stand-in")
+    
+    # Encoded payloads are cached so the stand-in itself is never the bottleneck
+    payloads: Dict[Tuple, bytes] = {}
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0, "odds_used": 0}
+    
+    def fixture(*parts: str) -> Optional[bytes]:
+        key = ("fixture",) + parts
+        if key not in payloads:
+            path = os.path.join(config.fixtures_dir, *parts)
+            try:
+                with open(path, "rb") as f:
+                    payloads[key] = f.read()
+            except FileNotFoundError:
+                payloads[key] = None
+        return payloads[key]
+    
+    def cached(key: Tuple, build) -> bytes:
+        if key not in payloads:
+            payloads[key] = _json(build())
+        return payloads[key]
+    
+    async def inject_faults(rate_limited: Response) -> Optional[Response]:
+        """Apply configured latency and return a fault response if one is drawn."""
+        stats["requests"] += 1
+        delay = config.latency_ms + random.uniform(0, config.latency_jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and random.random() < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"message": "Injected upstream error"}, status_code=503)
+        if config.rate_limit_rate and random.random() < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return rate_limited
+        return None
+    
+    def quota_headers(last_cost: int) -> Dict[str, str]:
+        """The Odds API usage headers."""
+        return {
+            "x-requests-remaining": str(max(0, config.odds_quota - stats["odds_used"])),
+            "x-requests-used": str(stats["odds_used"]),
+            "x-requests-last": str(last_cost),
+        }
+    
+    @app.get("/query")
+    async def alpha_vantage(
+        function: str = Query(...),
+        symbol: str = Query(...),
+        outputsize: str = Query("compact")
+    ):
+        """Alpha Vantage TIME_SERIES_DAILY, GLOBAL_QUOTE and REALTIME_BULK_QUOTES."""
+        fault = await inject_faults(JSONResponse({"Information": ALPHA_VANTAGE_RATE_LIMIT_NOTE}))
+        if fault is not None:
+            return fault
+        
+        symbol = symbol.upper()
+        recorded = fixture("alpha_vantage", function, f"{symbol}.json")
+        if recorded is not None:
+            return Response(recorded, media_type="application/json")
+        
+        today = date.today()
+        if function == "TIME_SERIES_DAILY":
+            days = config.full_days if outputsize == "full" else config.compact_days
+            body = cached(
+                (function, symbol, days, today),
+                lambda: alpha_vantage_daily(symbol, days, end=today)
+            )
+        elif function == "GLOBAL_QUOTE":
+            body = cached((function, symbol, today), lambda: global_quote(symbol, end=today))
+        elif function == "REALTIME_BULK_QUOTES":
+            symbols = [s for s in symbol.split(",") if s][:BULK_QUOTE_LIMIT]
+            body = _json(bulk_quotes(symbols, end=today))
+        else:
+            body = _json({"Error Message": f"Invalid API call. Unknown function {function}."})
+        return Response(body, media_type="application/json")
+    
+    @app.get("/v4/sports/{sport}/odds")
+    async def odds(
+        sport: str,
+        markets: str = Query("h2h"),
+        regions: str = Query("us")
+    ):
+        """The Odds API odds endpoint with usage quota headers."""
+        fault = await inject_faults(
+            JSONResponse({"message": "Too many requests", "error_code": "EXCEEDED_FREQ_LIMIT"}, status_code=429)
+        )
+        if fault is not None:
+            return fault
+        
+        # Each market/region combination costs one request, like the real API
+        cost = len(markets.split(",")) * len(regions.split(","))
+        remaining = config.odds_quota - stats["odds_used"]
+        if remaining < cost:
+            return JSONResponse(
+                {"message": "Usage quota has been reached.", "error_code": "OUT_OF_USAGE_CREDITS"},
+                status_code=401,
+                headers=quota_headers(0)
+            )
+        stats["odds_used"] += cost
+        
+        body = fixture("the_odds_api", f"{sport}.json")
+        if body is None:
+            # Schedule today's slate relative to the current hour so events stay upcoming
+            start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            market_keys = tuple(market.strip() for market in markets.split(","))
+            body = cached(
+                ("odds", sport, start, market_keys),
+                lambda: odds_slate(config.slate_events, config.bookmakers, sport=sport, start=start, markets=market_keys)
+            )
+        return Response(body, media_type="application/json", headers=quota_headers(cost))
+    
+    @app.get("/v4/sports/{sport}/scores")
+    async def scores(sport: str, daysFrom: Optional[int] = Query(None, ge=1, le=3)):
+        """The Odds API scores endpoint (completed games cost 2 requests, like the real API)."""
+        fault = await inject_faults(
+            JSONResponse({"message": "Too many requests", "error_code": "EXCEEDED_FREQ_LIMIT"}, status_code=429)
+        )
+        if fault is not None:
+            return fault
+        
+        cost = 2 if daysFrom else 1
+        if config.odds_quota - stats["odds_used"] < cost:
+            return JSONResponse(
+                {"message": "Usage quota has been reached.", "error_code": "OUT_OF_USAGE_CREDITS"},
+                status_code=401,
+                headers=quota_headers(0)
+            )
+        stats["odds_used"] += cost
+        
+        body = fixture("the_odds_api", "scores", f"{sport}.json")
+        if body is None:
+            today = date.today()
+            body = cached(("scores", sport, daysFrom, today), lambda: completed_games(sport, days=daysFrom or 0))
+        return Response(body, media_type="application/json", headers=quota_headers(cost))
+    
+    @app.get("/v1/jwks")
+    async def clerk_jwks():
+        """Clerk JSON Web Key Set."""
+        fault = await inject_faults(JSONResponse({"errors": [{"message": "Too many requests"}]}, status_code=429))
+        if fault is not None:
+            return fault
+        return Response(fixture("clerk", "jwks.json") or b'{"keys":[]}', media_type="application/json")
+    
+    @app.get("/_standin/stats")
+    async def get_stats():
+        """Request counters since start or the last reset."""
+        return {**stats, "odds_remaining": max(0, config.odds_quota - stats["odds_used"])}
+    
+    @app.post("/_standin/reset")
+    async def reset():
+        """Reset counters and the Odds API quota."""
+        for key in stats:
+            stats[key] = 0
+        return {"reset": True}
+    
+    return app
+
+
+def create_app_from_env() -> FastAPI:
+    """App factory for `uvicorn --factory` (used for multi-worker runs)."""
+    return create_app(StandinSettings())
@@ -0,0 +1,268 @@
+"""Deterministic synthetic payloads shaped like the real upstream responses."""
+import numpy as np
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+TEAMS = [
+    "Atlanta Hawks", "Boston Celtics", "Brooklyn Nets", "Charlotte Hornets",
+    "Chicago Bulls", "Cleveland Cavaliers", "Dallas Mavericks", "Denver Nuggets",
+    "Detroit Pistons", "Golden State Warriors", "Houston Rockets", "Indiana Pacers",
+    "Los Angeles Clippers", "Los Angeles Lakers", "Memphis Grizzlies", "Miami Heat",
+    "Milwaukee Bucks", "Minnesota Timberwolves", "New Orleans Pelicans", "New York Knicks",
+]
+
+BOOKMAKERS = [
+    "draftkings", "fanduel", "betmgm", "caesars", "pointsbetus", "betrivers",
+    "unibet_us", "wynnbet", "bovada", "mybookieag", "betonlineag", "lowvig",
+    "superbook", "twinspires", "barstool", "betus", "foxbet", "williamhill_us",
+    "sugarhouse", "circasports",
+]
+
+
+def symbol_seed(symbol: str) -> int:
+    """Stable seed so a symbol always gets the same history."""
+    return sum((i + 1) * ord(c) for i, c in enumerate(symbol))
+
+
+def price_series(days: int, seed: int = 0, start_price: float = 100.0) -> np.ndarray:
+    """Random-walk closing prices (oldest first)."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.015, size=days)
+    return start_price * np.exp(np.cumsum(returns))
+
+
+# Histories are generated from a fixed epoch so a compact (short) series is
+# always an exact suffix of the full series for the same symbol and end date
+HISTORY_EPOCH = date(1999, 11, 1)
+
+
+def business_days_since_epoch(end: Optional[date] = None) -> int:
+    """Number of trading days from HISTORY_EPOCH through `end` (default today)."""
+    return int(np.busday_count(np.datetime64(HISTORY_EPOCH), np.datetime64(end or date.today()) + 1))
+
+
+def daily_closes(
+    symbol: str,
+    days: int,
+    seed: Optional[int] = None,
+    end: Optional[date] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Up to `days` trading dates (datetime64[D]) and closes ending at `end`, oldest first."""
+    seed = symbol_seed(symbol) if seed is None else seed
+    end = end or date.today()
+    all_days = np.arange(np.datetime64(HISTORY_EPOCH), np.datetime64(end) + 1)
+    all_days = all_days[np.is_busday(all_days)]
+    closes = price_series(len(all_days), seed=seed)[-days:]
+    return all_days[-len(closes):], closes
+
+
+def alpha_vantage_daily(
+    symbol: str,
+    days: int,
+    seed: Optional[int] = None,
+    end: Optional[date] = None
+) -> Dict[str, Any]:
+    """TIME_SERIES_DAILY payload with up to `days` trading days (newest first, like the API)."""
+    all_days, closes = daily_closes(symbol, days, seed=seed, end=end)
+    dates = all_days.astype(str)
+    days = len(dates)
+    offset = business_days_since_epoch(end) - days
+    series = {}
+    for i in range(days - 1, -1, -1):
+        close = closes[i]
+        series[dates[i]] = {
+            "1. open": f"{close * 0.995:.4f}",
+            "2. high": f"{close * 1.01:.4f}",
+            "3. low": f"{close * 0.99:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. volume": str(1_000_000 + offset + i),
+        }
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Prices (open, high, low, close) and Volumes",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": dates[-1],
+            "4. Output Size": "Compact" if days <= 100 else "Full size",
+            "5. Time Zone": "US/Eastern",
+        },
+        "Time Series (Daily)": series,
+    }
+
+
+def global_quote(symbol: str, seed: Optional[int] = None, end: Optional[date] = None) -> Dict[str, Any]:
+    """GLOBAL_QUOTE payload matching the last bar of the synthesized daily history."""
+    history = alpha_vantage_daily(symbol, 2, seed=seed, end=end)["Time Series (Daily)"]
+    (latest_day, latest), (_, previous_bar) = list(history.items())
+    price = float(latest["4. close"])
+    previous = float(previous_bar["4. close"])
+    change = price - previous
+    return {
+        "Global Quote": {
+            "01. symbol": symbol,
+            "02. open": latest["1. open"],
+            "03. high": latest["2. high"],
+            "04. low": latest["3. low"],
+            "05. price": latest["4. close"],
+            "06. volume": latest["5. volume"],
+            "07. latest trading day": latest_day,
+            "08. previous close": previous_bar["4. close"],
+            "09. change": f"{change:.4f}",
+            "10. change percent": f"{change / previous * 100:.4f}%",
+        }
+    }
+
+
+def bulk_quotes(symbols: List[str], end: Optional[date] = None) -> Dict[str, Any]:
+    """REALTIME_BULK_QUOTES payload; each row matches global_quote for the same symbol."""
+    rows = []
+    for symbol in symbols:
+        quote = global_quote(symbol, end=end)["Global Quote"]
+        rows.append({
+            "symbol": symbol,
+            "timestamp": f"{quote['07. latest trading day']} 16:00:00.000",
+            "open": quote["02. open"],
+            "high": quote["03. high"],
+            "low": quote["04. low"],
+            "close": quote["05. price"],
+            "volume": quote["06. volume"],
+            "previous_close": quote["08. previous close"],
+            "change": quote["09. change"],
+            "change_percent": quote["10. change percent"].rstrip("%"),
+        })
+    return {"endpoint": "Realtime Bulk Quotes", "data": rows}
+
+
+def american_price(rng: np.random.Generator) -> int:
+    """Plausible American moneyline price."""
+    price = int(rng.integers(-400, 400))
+    if -100 < price < 100:
+        price = -110 if price < 0 else 100
+    return price
+
+
+def line_price(rng: np.random.Generator) -> int:
+    """Plausible American price for a spread or total (close to -110)."""
+    price = int(rng.integers(-125, -99))
+    return 100 if price == -100 else price
+
+
+# Typical game total by sport (the sport key's prefix)
+TOTAL_POINTS = {"americanfootball": 44.5, "basketball": 224.5, "baseball": 8.5, "icehockey": 6.0, "soccer": 2.5}
+
+
+def odds_market(
+    market: str,
+    rng: np.random.Generator,
+    home_team: str,
+    away_team: str,
+    sport: str
+) -> Optional[Dict[str, Any]]:
+    """One bookmaker's h2h, spreads or totals market (None for other markets)."""
+    if market == "h2h":
+        outcomes = [
+            {"name": home_team, "price": american_price(rng)},
+            {"name": away_team, "price": american_price(rng)},
+        ]
+    elif market == "spreads":
+        point = float(rng.integers(-25, 26)) / 2
+        outcomes = [
+            {"name": home_team, "price": line_price(rng), "point": point},
+            {"name": away_team, "price": line_price(rng), "point": -point},
+        ]
+    elif market == "totals":
+        base = TOTAL_POINTS.get(sport.split("_")[0], 10.0)
+        point = round(base * (1 + rng.uniform(-0.1, 0.1)) * 2) / 2
+        outcomes = [
+            {"name": "Over", "price": line_price(rng), "point": point},
+            {"name": "Under", "price": line_price(rng), "point": point},
+        ]
+    else:
+        return None
+    return {"key": market, "outcomes": outcomes}
+
+
+def odds_event(
+    index: int,
+    bookmakers: int,
+    seed: int = 0,
+    sport: str = "basketball_nba",
+    start: Optional[datetime] = None,
+    markets: Tuple[str, ...] = ("h2h",)
+) -> Dict[str, Any]:
+    """One Odds API event with prices for `markets` (h2h, spreads, totals) from `bookmakers` books."""
+    rng = np.random.default_rng(seed + index)
+    home, away = rng.choice(len(TEAMS), size=2, replace=False)
+    home_team, away_team = TEAMS[home], TEAMS[away]
+    commence = (start or datetime(2024, 1, 1, 19, 0)) + timedelta(hours=index)
+    return {
+        "id": f"event_{seed}_{index}",
+        "sport_key": sport,
+        "sport_title": sport.split("_")[-1].upper(),
+        "commence_time": commence.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "home_team": home_team,
+        "away_team": away_team,
+        "bookmakers": [
+            {
+                "key": BOOKMAKERS[b % len(BOOKMAKERS)],
+                "title": BOOKMAKERS[b % len(BOOKMAKERS)],
+                "last_update": commence.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "markets": [
+                    market for market in (odds_market(key, rng, home_team, away_team, sport) for key in markets)
+                    if market is not None
+                ],
+            }
+            for b in range(bookmakers)
+        ],
+    }
+
+
+def odds_slate(
+    events: int,
+    bookmakers: int,
+    seed: int = 0,
+    sport: str = "basketball_nba",
+    start: Optional[datetime] = None,
+    markets: Tuple[str, ...] = ("h2h",)
+) -> List[Dict[str, Any]]:
+    """A slate of Odds API events."""
+    return [odds_event(i, bookmakers, seed=seed, sport=sport, start=start, markets=markets) for i in range(events)]
+
+
+def completed_games(
+    sport: str = "basketball_nba",
+    days: int = 3,
+    games_per_day: int = 5,
+    end: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Completed games from the `days` days before `end`, in the Odds API scores shape.
+    
+    Teams earlier in TEAMS are stronger, so ratings built from these results
+    have a known order. A game's id and score depend only on its date and slot.
+    """
+    end = (end or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    strength = np.linspace(8.0, -8.0, len(TEAMS))
+    games = []
+    for day in range(days, 0, -1):
+        game_day = end - timedelta(days=day)
+        rng = np.random.default_rng(game_day.toordinal())
+        for slot in range(games_per_day):
+            home, away = rng.choice(len(TEAMS), size=2, replace=False)
+            away_score = int(rng.integers(95, 120))
+            margin = int(round(strength[home] - strength[away] + 3 + rng.normal(0, 12))) or 1
+            commence = game_day + timedelta(hours=19 + slot)
+            games.append({
+                "id": f"{sport}_{game_day:%Y%m%d}_{slot}",
+                "sport_key": sport,
+                "sport_title": sport.split("_")[-1].upper(),
+                "commence_time": commence.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "completed": True,
+                "home_team": TEAMS[home],
+                "away_team": TEAMS[away],
+                "scores": [
+                    {"name": TEAMS[home], "score": str(away_score + margin)},
+                    {"name": TEAMS[away], "score": str(away_score)},
+                ],
+                "last_update": (commence + timedelta(hours=3)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+    return games
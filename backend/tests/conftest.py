@@ -0,0 +1,32 @@
+"""Shared fixtures for the backend tests."""
+import pytest
+from app import database
+from app.config import settings
+from app.services import external_apis
+from benchmarks.standins import install
+
+
+@pytest.fixture
+def standins(monkeypatch):
+    """
+    Installs the in-memory MongoDB and upstream stand-ins.
+    
+    Returns a function taking install()'s options (history_days,
+    slate_events, bookmakers) and returning the in-memory database.
+    Everything install() replaces is restored after the test.
+    """
+    for target, name in [
+        (database, "mongodb_client"),
+        (database, "mongodb_sync_client"),
+        (external_apis, "httpx"),
+        (external_apis.rate_limiter, "max_requests"),
+        (external_apis.rate_limiter, "limits"),
+        (external_apis.rate_limiter, "_db"),
+        (external_apis.rate_limiter, "backend"),
+    ]:
+        monkeypatch.setattr(target, name, getattr(target, name))
+    
+    def install_standins(**options):
+        return install(**options)[settings.mongodb_db_name]
+    
+    return install_standins
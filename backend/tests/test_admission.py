@@ -0,0 +1,131 @@
+"""Tests for inbound admission control."""
+import jwt
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.admission import AdmissionController, ConcurrencyLimit, TokenBuckets
+from app.middleware import AdmissionMiddleware
+
+
+def make_client(ip_rate=0.0, user_rate=0.0, burst=2, max_upstream=0):
+    """A tiny app behind the admission middleware (trusting X-Forwarded-For), with its controller."""
+    controller = AdmissionController(
+        TokenBuckets(ip_rate, burst),
+        TokenBuckets(user_rate, burst),
+        ConcurrencyLimit(max_upstream),
+        retry_after_seconds=3,
+        trust_forwarded_for=True
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    
+    @app.get("/stocks/predictions")
+    async def stocks():
+        return {"ok": True}
+    
+    @app.get("/sports/predictions")
+    async def sports():
+        raise RuntimeError("upstream failed")
+    
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    return TestClient(app, raise_server_exceptions=False), controller
+
+
+def bearer(user_id, ip="10.0.0.1"):
+    return {
+        "Authorization": "Bearer " + jwt.encode({"sub": user_id}, "secret", algorithm="HS256"),
+        "X-Forwarded-For": ip,
+    }
+
+
+def test_token_bucket_refills_and_forgets_oldest_keys():
+    """Test burst, refill rate and the bound on tracked keys."""
+    buckets = TokenBuckets(rate=2.0, burst=2, max_keys=2)
+    
+    admitted = [buckets.acquire("a", now=0.0) for _ in range(2)]
+    wait = buckets.acquire("a", now=0.0)
+    refilled = buckets.acquire("a", now=0.5)
+    buckets.acquire("b", now=0.5)
+    buckets.acquire("c", now=0.5)
+    
+    assert admitted == [0.0, 0.0]
+    assert wait == 0.5
+    assert refilled == 0.0
+    assert len(buckets) == 2
+    assert TokenBuckets(rate=0, burst=1).acquire("a") == 0.0
+
+
+def test_user_limit_returns_429_with_retry_after():
+    """Test each user has a separate bucket and anonymous clients share their IP's."""
+    client, controller = make_client(user_rate=0.01, burst=2)
+    
+    statuses = [client.get("/stocks/predictions", headers=bearer("user_a")).status_code for _ in range(3)]
+    other_user = client.get("/stocks/predictions", headers=bearer("user_b", ip="10.0.0.2"))
+    anonymous = [client.get("/stocks/predictions", headers={"X-Forwarded-For": "10.0.0.3"}).status_code for _ in range(3)]
+    # A user's bucket follows them to another address
+    limited = client.get("/stocks/predictions", headers=bearer("user_a", ip="10.0.0.4"))
+    
+    assert statuses == [200, 200, 429]
+    assert other_user.status_code == 200
+    assert anonymous == [200, 200, 429]
+    assert limited.json() == {"detail": "Too many requests, please slow down"}
+    assert int(limited.headers["retry-after"]) >= 90
+    assert controller.stats()["rejected_user"] == 3
+
+
+def test_forged_user_ids_share_their_ip_bucket():
+    """Test a fresh unsigned token per request does not get a fresh bucket."""
+    client, _ = make_client(user_rate=0.01, burst=2)
+    
+    statuses = [client.get("/stocks/predictions", headers=bearer(f"forged_{i}")).status_code for i in range(4)]
+    
+    assert statuses == [200, 200, 429, 429]
+
+
+def test_rejected_users_leave_their_ip_bucket_alone():
+    """Test requests a user's own limit rejects take nothing from its IP's bucket."""
+    client, _ = make_client(user_rate=0.01, burst=2)
+    
+    def status(user_id, ip):
+        return client.get("/stocks/predictions", headers=bearer(user_id, ip)).status_code
+    
+    spent = [status("user_1", "10.0.0.1") for _ in range(2)]
+    throttled = [status("user_1", "10.0.0.2") for _ in range(3)]
+    neighbour = [status("user_2", "10.0.0.2") for _ in range(2)]
+    
+    assert spent == [200, 200]
+    assert throttled == [429, 429, 429]
+    assert neighbour == [200, 200]
+
+
+def test_ip_limit_covers_every_path_but_health():
+    """Test the per-IP bucket applies whatever the user, and health checks are exempt."""
+    client, _ = make_client(ip_rate=0.01, burst=2)
+    
+    statuses = [client.get("/stocks/predictions", headers=bearer(f"user_{i}")).status_code for i in range(3)]
+    health = client.get("/health")
+    
+    assert statuses == [200, 200, 429]
+    assert health.status_code == 200
+
+
+def test_upstream_cap_returns_503_and_releases_slots():
+    """Test requests beyond the concurrency cap are rejected and finished requests free their slot."""
+    client, controller = make_client(max_upstream=1)
+    
+    served = client.get("/stocks/predictions")
+    failed = client.get("/sports/predictions")
+    released = controller.upstream.in_flight
+    controller.upstream.in_flight = 1
+    busy = client.get("/stocks/predictions")
+    
+    assert served.status_code == 200
+    assert failed.status_code == 500
+    assert released == 0
+    assert busy.status_code == 503
+    assert busy.headers["retry-after"] == "3"
+    assert controller.stats()["rejected_busy"] == 1
+    controller.upstream.in_flight = 0
+    assert client.get("/stocks/predictions").status_code == 200
@@ -0,0 +1,55 @@
+"""Tests for the walk-forward backtest."""
+import numpy as np
+import pytest
+from app.services.backtest import evaluate, features_and_labels, fit_logistic, run_backtest, walk_forward
+from app.services.prediction_models import StockPredictionModel
+from standin.synth import price_series
+
+
+def test_feature_matrix_matches_indicators():
+    """Test every vectorized feature row equals the per-request calculation."""
+    prices = price_series(60, seed=1)
+    
+    matrix = StockPredictionModel.feature_matrix(prices)
+    
+    assert matrix.shape == (51, 4)
+    for i in range(len(matrix)):
+        indicators = StockPredictionModel.calculate_indicators(prices[:i + 10].tolist())
+        assert np.allclose(matrix[i], StockPredictionModel.features_from_indicators(indicators))
+
+
+def test_fit_logistic_matches_sklearn():
+    """Test the batched Newton solver finds sklearn's LogisticRegression solution."""
+    from sklearn.linear_model import LogisticRegression
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + rng.normal(size=300) > 0).astype(float)
+    
+    w = fit_logistic(X[None], y[None])[0]
+    model = LogisticRegression(tol=1e-10, max_iter=1000).fit(X, y)
+    
+    assert np.allclose(w[:-1], model.coef_[0], atol=1e-4)
+    assert np.isclose(w[-1], model.intercept_[0], atol=1e-4)
+
+
+def test_walk_forward_predicts_only_out_of_sample():
+    """Test predictions start after the first training window and cover every later row."""
+    features, labels = features_and_labels(price_series(400, seed=2))
+    
+    probabilities, outcomes = walk_forward(features, labels, train_days=100, test_days=30)
+    
+    assert len(probabilities) == len(labels) - 100
+    assert np.array_equal(outcomes, labels[100:])
+    assert ((probabilities > 0) & (probabilities < 1)).all()
+
+
+def test_evaluate_perfect_and_report_shape():
+    """Test metrics on known predictions and the multi-symbol report layout."""
+    metrics = evaluate(np.array([0.9, 0.1, 0.8, 0.2]), np.array([1.0, 0.0, 1.0, 0.0]))
+    assert metrics["hit_rate"] == 1.0
+    assert metrics["brier"] == pytest.approx(0.025)
+    
+    report = run_backtest({"A": price_series(300, seed=3), "B": price_series(300, seed=4)}, train_days=100)
+    assert report["model_version"] == StockPredictionModel.MODEL_VERSION
+    assert set(report["symbols"]) == {"A", "B"}
+    assert report["overall"]["predictions"] == sum(s["predictions"] for s in report["symbols"].values())
@@ -0,0 +1,107 @@
+"""Tests for the shared Redis cache backend."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import sports
+from app.services import external_apis
+from app.services.cache_backend import MongoCacheBackend, RedisCacheBackend, cache_backend_for
+from app.services.cache_codec import CacheCodec
+from app.services.external_apis import RateLimiter
+from benchmarks.standins import InMemoryCollection, InMemoryRedis
+from standin.synth import alpha_vantage_daily
+
+
+def workers(server: InMemoryRedis, count: int = 2, **kwargs):
+    """Rate limiters for several workers sharing one Redis."""
+    return [
+        RateLimiter(
+            max_requests=2,
+            codec=CacheCodec(compression="zlib", min_bytes=1024),
+            backend=RedisCacheBackend(server, **kwargs)
+        )
+        for _ in range(count)
+    ]
+
+
+def test_workers_share_entries_and_invalidate_local_copies():
+    """Test a write by one worker replaces what every other worker serves."""
+    server = InMemoryRedis()
+    first, second = workers(server)
+    payload = alpha_vantage_daily("AAPL", 300)
+    
+    first.set_cached("history", payload)
+    warm = second.get_cached("history")
+    second.get_cached("history")
+    first.set_cached("history", {"updated": True})
+    updated = second.get_cached("history")
+    first.invalidate("history")
+    
+    assert warm == payload
+    assert updated == {"updated": True}
+    assert second.backend.stats()["local_hits"] == 1
+    assert second.backend.stats()["invalidations_received"] == 2
+    assert second.get_cached_entry("history") is None
+    assert "predict:history" not in server.values
+
+
+def test_entries_keep_timestamps_and_expire():
+    """Test stale entries stay readable with their millisecond timestamp until retention ends."""
+    server = InMemoryRedis()
+    limiter, = workers(server, count=1, retention_seconds=3600, local_entries=0)
+    
+    limiter.set_cached_many({"a": {"price": 1.0}, "b": alpha_vantage_daily("MSFT", 300)})
+    entry = limiter.get_cached_entry("a")
+    
+    assert limiter.get_cached("a", ttl_seconds=0) is None
+    assert entry["data"] == {"price": 1.0}
+    assert entry["timestamp"].microsecond % 1000 == 0
+    assert set(limiter.get_cached_many(["a", "b", "c"])) == {"a", "b"}
+    assert server.values["predict:a"][1] is not None
+
+
+def test_request_counts_are_shared():
+    """Test workers reserve from one budget and none is admitted past it."""
+    server = InMemoryRedis()
+    first, second = workers(server)
+    
+    reserved = [first.try_acquire("alpha_vantage"), second.try_acquire("alpha_vantage")]
+    
+    assert reserved == [True, True]
+    assert not first.try_acquire("alpha_vantage")
+    assert not second.try_acquire("alpha_vantage")
+    assert first.try_acquire("the_odds_api")
+
+
+def test_mongo_reservations_stay_within_the_limit():
+    """Test a refused reservation is taken back, so it does not use up the window."""
+    collection = InMemoryCollection()
+    limiter = RateLimiter(max_requests=2, backend=MongoCacheBackend(lambda: {"rate_limits": collection}))
+    
+    reserved = [limiter.try_acquire("alpha_vantage") for _ in range(4)]
+    
+    assert reserved == [True, True, False, False]
+    assert collection.count_documents({"api_name": "alpha_vantage"}) == 2
+
+
+def test_backend_setting():
+    """Test the default backend is MongoDB and unknown backends are rejected."""
+    assert cache_backend_for("mongodb") is None
+    with pytest.raises(ValueError):
+        cache_backend_for("memcached")
+
+
+def test_sports_odds_served_from_redis(standins):
+    """Test the odds cache works end to end on the Redis backend."""
+    mongo = standins()
+    server = InMemoryRedis()
+    external_apis.rate_limiter.backend = RedisCacheBackend(server)
+    app = FastAPI()
+    app.include_router(sports.router)
+    client = TestClient(app)
+    
+    first = client.get("/sports/predictions")
+    second = client.get("/sports/predictions")
+    
+    assert first.json() == second.json()
+    assert any(key.startswith("predict:the_odds_") for key in server.values)
+    assert mongo["api_cache"].count_documents({}) == 0
@@ -0,0 +1,55 @@
+"""Tests for compressed API cache entries."""
+from app.services.cache_codec import CacheCodec
+from app.services.external_apis import RateLimiter
+from benchmarks.standins import InMemoryMongoClient
+from standin.synth import alpha_vantage_daily
+
+
+def limiter(codec: CacheCodec) -> RateLimiter:
+    rate_limiter = RateLimiter(codec=codec)
+    rate_limiter._db = InMemoryMongoClient()["test"]
+    return rate_limiter
+
+
+def test_large_payloads_are_compressed():
+    """Test payloads over the threshold round-trip through a compressed blob."""
+    codec = CacheCodec(compression="zlib", min_bytes=1024)
+    payload = alpha_vantage_daily("AAPL", 500)
+    
+    small = codec.encode({"price": 1.0})
+    large = codec.encode(payload)
+    decoded = codec.decode({"key": "k", **large})
+    
+    assert small["data"] == {"price": 1.0} and small["codec"] is None
+    assert large["data"] is None
+    assert large["codec"].endswith("+zlib")
+    assert decoded["data"] == payload
+    assert codec.stats()["bytes_saved"] > 0
+    assert codec.stats()["decoded"] == 1
+
+
+def test_rate_limiter_decodes_transparently():
+    """Test every cache read path returns the original payload."""
+    rate_limiter = limiter(CacheCodec(compression="zlib", min_bytes=1024))
+    payload = alpha_vantage_daily("MSFT", 500)
+    
+    rate_limiter.set_cached("history", payload)
+    rate_limiter.set_cached_many({"a": payload, "b": {"small": True}})
+    
+    stored = rate_limiter.cache_collection.find_one({"key": "history"})
+    assert isinstance(stored["blob"], bytes)
+    assert rate_limiter.get_cached("history") == payload
+    assert rate_limiter.get_cached_entry("history")["data"] == payload
+    assert rate_limiter.get_cached_many(["a", "b"]) == {"a": payload, "b": {"small": True}}
+
+
+def test_entries_outlive_codec_changes():
+    """Test compressed entries stay readable with compression off, and unreadable ones are misses."""
+    rate_limiter = limiter(CacheCodec(compression="zlib", min_bytes=0))
+    rate_limiter.set_cached("odds", [{"id": "event_1"}])
+    rate_limiter.cache_collection.insert_one({"key": "future", "blob": b"?", "codec": "cbor+brotli", "timestamp": None})
+    
+    rate_limiter.codec = CacheCodec(compression="none")
+    
+    assert rate_limiter.get_cached("odds") == [{"id": "event_1"}]
+    assert rate_limiter.get_cached_entry("future") is None
@@ -0,0 +1,95 @@
+"""Tests for ETags and conditional GET on the prediction endpoints."""
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.http_cache import etag_matches
+from app.routers import sports, stocks
+from app.services.prediction_cache import PredictionCache
+from app.services.prediction_models import SportsPredictionModel, StockPredictionModel
+from app.services.price_store import PriceHistory
+
+
+@pytest.fixture
+def app_client(standins, monkeypatch):
+    """Stock and sports routers on in-memory stand-ins with an empty prediction cache."""
+    standins()
+    cache = PredictionCache(16)
+    monkeypatch.setattr(stocks, "prediction_cache", cache)
+    monkeypatch.setattr(sports, "prediction_cache", cache)
+    app = FastAPI()
+    app.include_router(stocks.router)
+    app.include_router(sports.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def stock_history(monkeypatch):
+    """Serve a fixed 60-day history for every symbol."""
+    data = np.zeros((6, 60))
+    data[0] = np.arange(60)
+    data[4] = np.linspace(100, 120, 60)
+    
+    async def ensure_history(symbol):
+        return PriceHistory(symbol, data)
+    
+    monkeypatch.setattr(stocks.price_ingestion, "ensure_history", ensure_history)
+    return data
+
+
+def test_etag_matching():
+    """Test If-None-Match lists, the wildcard and weak validators."""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_stock_not_modified_skips_model(app_client, stock_history, monkeypatch):
+    """Test a matching If-None-Match gets an empty 304 without running the model."""
+    first = app_client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("prediction should not be looked up or computed")
+    
+    monkeypatch.setattr(stocks.prediction_cache, "get", fail)
+    monkeypatch.setattr(StockPredictionModel, "predict_prices", staticmethod(fail))
+    second = app_client.get(
+        "/stocks/predictions", params={"symbol": "AAPL"}, headers={"If-None-Match": first.headers["etag"]}
+    )
+    
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("private, max-age=")
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+def test_stock_etag_follows_data_and_model(app_client, stock_history, monkeypatch):
+    """Test the ETag changes when the price history or the model version changes."""
+    first = app_client.get("/stocks/predictions", params={"symbol": "AAPL"}).headers["etag"]
+    stock_history[4, -1] += 1
+    moved = app_client.get("/stocks/predictions", params={"symbol": "AAPL"}).headers["etag"]
+    monkeypatch.setattr(StockPredictionModel, "current_version", staticmethod(lambda: "lr-new"))
+    retrained = app_client.get(
+        "/stocks/predictions", params={"symbol": "AAPL"}, headers={"If-None-Match": moved}
+    )
+    
+    assert len({first, moved, retrained.headers["etag"]}) == 3
+    assert retrained.status_code == 200
+
+
+def test_sports_not_modified_until_model_changes(app_client, monkeypatch):
+    """Test cached odds revalidate to 304 until the model version changes."""
+    first = app_client.get("/sports/predictions")
+    etag = first.headers["etag"]
+    second = app_client.get("/sports/predictions", headers={"If-None-Match": etag})
+    monkeypatch.setattr(SportsPredictionModel, "MODEL_VERSION", "v-next")
+    third = app_client.get("/sports/predictions", headers={"If-None-Match": etag})
+    
+    assert first.status_code == 200
+    assert "last-modified" in first.headers
+    assert second.status_code == 304
+    assert third.status_code == 200
+    assert third.json()
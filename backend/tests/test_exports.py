@@ -0,0 +1,110 @@
+"""Tests for the streaming prediction log and pick exports."""
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import database
+from app.config import settings
+from app.dependencies import get_current_user
+from app.models import User, UserPick
+from app.routers import export
+from app.services.prediction_logs import log_document
+from app.services.exports import LOG_EXPORT_COLUMNS, PICK_EXPORT_COLUMNS
+
+
+@pytest.fixture
+def export_client(standins, monkeypatch):
+    """Export router on an in-memory MongoDB and SQLite, signed in as user 1 with batches of 2 rows."""
+    monkeypatch.setattr(database, "SessionLocal", database.SessionLocal)
+    mongo = standins()
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    monkeypatch.setattr(settings, "export_clerk_ids", "")
+    
+    for day in range(1, 6):
+        for prediction_type, user_id in (("stock", 1), ("sports", 2)):
+            mongo["prediction_logs"].insert_one({
+                **log_document(prediction_type, {"probability": 0.5 + day / 100, "model_version": "v1"}, user_id, symbol=f"S{day}"),
+                "timestamp": datetime(2024, 3, day, 12),
+            })
+    
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    database.Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    session = database.SessionLocal()
+    session.add_all([
+        UserPick(
+            user_id=1 + i % 2,
+            prediction_type="stock" if i % 3 else "sports",
+            symbol_or_event=f"P{i}",
+            prediction=json.dumps({"direction": "up", "rank": i}),
+            confidence=i / 10,
+            created_at=datetime(2024, 3, 1 + i)
+        )
+        for i in range(6)
+    ])
+    session.commit()
+    session.close()
+    
+    app = FastAPI()
+    app.include_router(export.router)
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, clerk_id="user_1", email="one@example.com")
+    return TestClient(app)
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_log_export_ndjson_is_filtered_and_ordered(export_client, monkeypatch):
+    monkeypatch.setattr(settings, "export_clerk_ids", "user_1")
+    
+    response = export_client.get("/export/prediction-logs", params={
+        "start": "2024-03-02T00:00:00Z", "end": "2024-03-05T00:00:00Z", "prediction_type": "sports"
+    })
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = _ndjson(response)
+    assert [row["subject"] for row in rows] == ["S2", "S3", "S4"]
+    assert {row["prediction_type"] for row in rows} == {"sports"}
+    assert list(rows[0]) == list(LOG_EXPORT_COLUMNS)
+    assert rows[0]["timestamp"] == "2024-03-02T12:00:00"
+    assert rows[0]["prediction"] == {"probability": 0.52, "model_version": "v1"}
+    assert rows[0]["user_id"] == 2
+
+
+def test_log_export_csv_is_scoped_to_the_user(export_client):
+    response = export_client.get("/export/prediction-logs", params={"format": "csv"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="prediction_logs.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert {row["user_id"] for row in rows} == {"1"}
+    assert rows[0]["point"] == ""
+    assert json.loads(rows[0]["prediction"])["model_version"] == "v1"
+
+
+def test_pick_export(export_client, monkeypatch):
+    response = export_client.get("/export/picks", params={"format": "csv", "end": "2024-03-06T00:00:00"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == list(PICK_EXPORT_COLUMNS)
+    assert [row["symbol_or_event"] for row in rows] == ["P0", "P2", "P4"]
+    assert json.loads(rows[1]["prediction"]) == {"direction": "up", "rank": 2}
+    
+    monkeypatch.setattr(settings, "export_clerk_ids", "user_1")
+    rows = _ndjson(export_client.get("/export/picks", params={"prediction_type": "stock"}))
+    assert [row["symbol_or_event"] for row in rows] == ["P1", "P2", "P4", "P5"]
+    assert rows[0]["prediction"] == {"direction": "up", "rank": 1}
+
+
+def test_export_rejects_bad_parameters(export_client):
+    assert export_client.get("/export/picks", params={"start": "2024-03-05T00:00:00", "end": "2024-03-01T00:00:00"}).status_code == 400
+    assert export_client.get("/export/picks", params={"format": "xml"}).status_code == 422
+    assert export_client.get("/export/prediction-logs", params={"prediction_type": "bonds"}).status_code == 422
@@ -0,0 +1,53 @@
+"""Tests for the inference executor."""
+import asyncio
+import threading
+import pytest
+from app.services.inference import InferenceBusyError, InferenceExecutor
+from app.timing import phase, start_request_timer
+
+
+def _square(x):
+    with phase("inference"):
+        return x * x
+
+
+def test_thread_executor_runs_and_merges_phases():
+    """Test thread mode returns results and merges worker phases into the request timer."""
+    executor = InferenceExecutor(mode="thread", max_workers=2, max_queue=0)
+    
+    async def call():
+        timer = start_request_timer()
+        result = await executor.run(_square, 7)
+        return result, timer
+    
+    try:
+        result, timer = asyncio.run(call())
+    finally:
+        executor.shutdown()
+    
+    assert result == 49
+    assert "inference" in timer.breakdown()
+    assert "inference_wait" in timer.breakdown()
+    assert executor.stats()["completed"] == 1
+
+
+def test_executor_rejects_when_queue_is_full():
+    """Test calls beyond workers + queue are rejected instead of queued."""
+    executor = InferenceExecutor(mode="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    
+    async def call():
+        blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceBusyError):
+            await executor.run(_square, 2)
+        release.set()
+        await asyncio.gather(*blocked)
+    
+    try:
+        asyncio.run(call())
+    finally:
+        executor.shutdown()
+    
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["completed"] == 2
@@ -0,0 +1,120 @@
+"""Tests for incremental price ingestion."""
+import asyncio
+import json
+from datetime import date, datetime
+import pytest
+from app.services.ingestion import PriceIngestionService, market_date
+from app.services.price_store import PriceStore
+from benchmarks.standins import AsyncInMemoryCollection, InMemoryCollection
+from standin.synth import alpha_vantage_daily
+
+
+class FakeAlphaVantage:
+    """Serves synthesized daily series ending on a movable date and counts calls."""
+    
+    def __init__(self, end: date):
+        self.end = end
+        self.calls = []
+    
+    async def __call__(self, symbol: str, outputsize: str):
+        self.calls.append(outputsize)
+        payload = alpha_vantage_daily(symbol, 1000 if outputsize == "full" else 100, end=self.end)
+        return payload, len(json.dumps(payload))
+
+
+def _service(tmp_path, upstream, refresh_seconds=0):
+    return PriceIngestionService(
+        PriceStore(str(tmp_path)),
+        refresh_seconds=refresh_seconds,
+        fetch=upstream,
+        collection=AsyncInMemoryCollection(InMemoryCollection())
+    )
+
+
+def test_backfills_once_then_fetches_compact_deltas(tmp_path):
+    """Test the first ingest is full, later ones compact, and re-ingesting adds nothing."""
+    upstream = FakeAlphaVantage(end=date(2024, 6, 3))
+    service = _service(tmp_path, upstream)
+    
+    async def scenario():
+        first = await service.ingest("AAPL", today=date(2024, 6, 3))
+        same_day = await service.ingest("AAPL", today=date(2024, 6, 3))
+        upstream.end = date(2024, 6, 5)
+        later = await service.ingest("AAPL", today=date(2024, 6, 5))
+        return first, same_day, later, await service.state("AAPL")
+    
+    first, same_day, later, state = asyncio.run(scenario())
+    
+    assert (first["mode"], first["new_bars"]) == ("full", 1000)
+    assert same_day["mode"] == "skip"
+    assert (later["mode"], later["new_bars"]) == ("compact", 2)
+    assert upstream.calls == ["full", "compact"]
+    assert state["backfilled"] and state["bars"] == 1002 and state["last_date"] == "2024-06-05"
+    assert state["upstream_calls"] == 2
+
+
+def test_bars_are_due_after_the_close_and_holidays_are_checked_once(tmp_path):
+    """Test a day's bar is expected only after the New York close and an empty check is not repeated."""
+    upstream = FakeAlphaVantage(end=date(2024, 7, 3))
+    service = _service(tmp_path, upstream)
+    
+    async def scenario():
+        await service.ingest("AAPL", today=date(2024, 7, 3))
+        holiday = await service.ingest("AAPL", today=date(2024, 7, 4))
+        again = await service.ingest("AAPL", today=date(2024, 7, 4))
+        upstream.end = date(2024, 7, 5)
+        next_day = await service.ingest("AAPL", today=date(2024, 7, 5))
+        return holiday, again, next_day
+    
+    holiday, again, next_day = asyncio.run(scenario())
+    
+    assert market_date(datetime(2024, 7, 5, 21, 0)) == date(2024, 7, 4)
+    assert market_date(datetime(2024, 7, 5, 22, 0)) == date(2024, 7, 5)
+    assert market_date(datetime(2024, 12, 5, 22, 0)) == date(2024, 12, 4)
+    assert (holiday["mode"], holiday["new_bars"]) == ("compact", 0)
+    assert again["mode"] == "skip"
+    assert next_day["mode"] == "compact" and next_day["new_bars"] > 0
+    assert upstream.calls == ["full", "compact", "compact"]
+
+
+def test_recent_check_and_concurrent_requests_share_upstream_calls(tmp_path):
+    """Test concurrent ingests of one symbol make one call, recent checks are not repeated and locks are dropped."""
+    upstream = FakeAlphaVantage(end=date(2024, 6, 3))
+    service = _service(tmp_path, upstream, refresh_seconds=300)
+    
+    async def scenario():
+        await asyncio.gather(*[service.ingest("MSFT", today=date(2024, 6, 4)) for _ in range(5)])
+        return await service.ingest("MSFT", today=date(2024, 6, 4))
+    
+    again = asyncio.run(scenario())
+    
+    assert upstream.calls == ["full"]
+    assert again["mode"] == "skip"
+    assert service._locks == {} and service._lock_users == {}
+
+
+def test_long_gap_triggers_new_backfill_and_failures_serve_stale_history(tmp_path):
+    """Test a gap beyond a compact response refetches full history; upstream errors fall back to the store."""
+    upstream = FakeAlphaVantage(end=date(2024, 1, 2))
+    service = _service(tmp_path, upstream)
+    
+    async def failing(symbol, outputsize):
+        raise Exception("rate limit exceeded")
+    
+    async def scenario():
+        await service.ingest("IBM", today=date(2024, 1, 2))
+        upstream.end = date(2024, 9, 2)
+        gap = await service.ingest("IBM", today=date(2024, 9, 2))
+        service.fetch = failing
+        stale = await service.ingest("IBM", today=date(2024, 9, 3))
+        return gap, stale
+    
+    gap, stale = asyncio.run(scenario())
+    
+    assert gap["mode"] == "full"
+    assert stale["mode"] == "stale"
+    assert len(service.store.read("IBM")) > 1000
+
+    with pytest.raises(Exception, match="rate limit"):
+        asyncio.run(service.ingest("NEW"))
+    assert service._locks == {}
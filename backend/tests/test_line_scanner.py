@@ -0,0 +1,102 @@
+"""Tests for the cross-bookmaker line scanner."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import sports
+from app.services.line_scanner import scan_lines
+from app.services.prediction_cache import PredictionCache
+
+
+def _event(books):
+    """An event with h2h and spreads prices per bookmaker: {key: (home, away, spread home, spread away, point)}."""
+    return {
+        "id": "event_1",
+        "home_team": "Home",
+        "away_team": "Away",
+        "bookmakers": [
+            {
+                "key": key,
+                "markets": [
+                    {"key": "h2h", "outcomes": [{"name": "Home", "price": home}, {"name": "Away", "price": away}]},
+                    {"key": "spreads", "outcomes": [
+                        {"name": "Home", "price": spread_home, "point": point},
+                        {"name": "Away", "price": spread_away, "point": -point},
+                    ]},
+                ],
+            }
+            for key, (home, away, spread_home, spread_away, point) in books.items()
+        ],
+    }
+
+
+def test_best_price_per_outcome_and_line():
+    """Test the best price is picked per outcome, with each spread line kept separate."""
+    event = _event({
+        "book_a": (-150, 130, -110, -110, -3.5),
+        "book_b": (-140, 120, -105, -115, -3.5),
+        "book_c": (-160, 140, -120, 100, -2.5),
+    })
+    
+    scan = scan_lines([event], ("h2h", "spreads"))
+    best = {(line["market"], line["outcome"], line["point"]): line for line in scan["best_lines"]}
+    
+    assert len(best) == 6
+    assert best[("h2h", "Home", None)]["bookmaker"] == "book_b"
+    assert best[("h2h", "Away", None)]["bookmaker"] == "book_c"
+    assert best[("spreads", "Home", -3.5)]["price"] == -105
+    assert best[("spreads", "Away", 3.5)]["bookmaker"] == "book_a"
+    assert best[("spreads", "Away", 2.5)]["decimal_odds"] == pytest.approx(2.0)
+    assert scan["arbitrages"] == []
+
+
+def test_arbitrage_across_bookmakers():
+    """Test opposite sides priced generously at different books are flagged with their profit margin."""
+    event = _event({
+        "book_a": (110, -130, -110, -110, -1.5),
+        "book_b": (-130, 115, -110, -110, -1.5),
+    })
+    
+    arbitrages = scan_lines([event], ("h2h", "spreads"))["arbitrages"]
+    
+    assert len(arbitrages) == 1
+    assert arbitrages[0]["market"] == "h2h"
+    assert [leg["bookmaker"] for leg in arbitrages[0]["legs"]] == ["book_a", "book_b"]
+    assert arbitrages[0]["margin"] == pytest.approx(1 - (100 / 210 + 100 / 215))
+
+
+def test_value_lines_use_model_probability_on_its_own_line():
+    """Test expected value is computed only where a prediction prices the line."""
+    event = _event({
+        "book_a": (150, -170, -110, -110, -3.5),
+        "book_b": (140, -160, 100, -120, -2.5),
+    })
+    predictions = {
+        "h2h": [{"probability": 0.45, "point": None, "metadata": {}}],
+        "spreads": [{"probability": 0.55, "point": -2.5, "metadata": {}}],
+    }
+    
+    scan = scan_lines([event], ("h2h", "spreads"), predictions, min_edge=0.05)
+    lines = {(line["market"], line["outcome"], line["point"]): line for line in scan["best_lines"]}
+    
+    assert lines[("h2h", "Home", None)]["expected_value"] == pytest.approx(0.45 * 2.5 - 1)
+    assert lines[("h2h", "Away", None)]["model_probability"] == pytest.approx(0.55)
+    assert lines[("spreads", "Home", -2.5)]["expected_value"] == pytest.approx(0.55 * 2.0 - 1)
+    assert lines[("spreads", "Home", -3.5)]["model_probability"] is None
+    assert [(line["market"], line["outcome"]) for line in scan["value_lines"]] == [("h2h", "Home"), ("spreads", "Home")]
+
+
+def test_lines_endpoint(standins, monkeypatch):
+    """Test the endpoint scans the slate's first MAX_SLATE_EVENTS events across all bookmakers."""
+    standins(slate_events=12, bookmakers=4)
+    monkeypatch.setattr(sports, "prediction_cache", PredictionCache(64))
+    app = FastAPI()
+    app.include_router(sports.router)
+    
+    response = TestClient(app).get("/sports/lines", params={"markets": "h2h,totals", "min_edge": "-1"})
+    
+    body = response.json()
+    assert response.status_code == 200
+    assert body["markets"] == ["h2h", "totals"]
+    assert len({line["event_id"] for line in body["best_lines"]}) == sports.MAX_SLATE_EVENTS
+    assert all(line["expected_value"] is not None for line in body["value_lines"])
+    assert any(line["market"] == "totals" for line in body["value_lines"])
@@ -0,0 +1,88 @@
+"""Tests for vectorized odds conversion and margin removal."""
+import numpy as np
+import pytest
+from app.services.odds_math import VIG_METHODS, implied_probabilities, overround, remove_vig
+from app.services.prediction_models import SportsPredictionModel
+from standin.synth import odds_event
+
+
+def test_implied_probabilities_per_format():
+    """Test each odds format converts element-wise and NaN padding is kept."""
+    american = implied_probabilities([[-110, 150], [100, np.nan]])
+    decimal = implied_probabilities([2.5, 1.25, 0], "decimal")
+    fractional = implied_probabilities([1.5, 0.25], "fractional")
+    
+    assert american[0] == pytest.approx([110 / 210, 100 / 250])
+    assert american[1, 0] == 0.5 and np.isnan(american[1, 1])
+    assert decimal == pytest.approx([0.4, 0.8, 0.0])
+    assert fractional == pytest.approx([0.4, 0.8])
+    for odds, odds_format in [(-110, "american"), (150, "american"), (2.5, "decimal"), (1.5, "fractional")]:
+        assert SportsPredictionModel.implied_probability_from_odds(odds, odds_format) == pytest.approx(
+            float(implied_probabilities(odds, odds_format))
+        )
+    with pytest.raises(ValueError):
+        implied_probabilities([2.0], "moneyline")
+
+
+@pytest.mark.parametrize("method", VIG_METHODS)
+def test_remove_vig_rows_sum_to_one(method):
+    """Test every method returns fair probabilities that keep the favourite ahead."""
+    implied = implied_probabilities([[-110, -110], [150, -180], [1000, -2000], [2.1, np.nan]])
+    implied[3] = implied_probabilities([2.1, 3.4, 3.6], "decimal")[:2]
+    
+    fair = remove_vig(implied, method)
+    
+    assert np.nansum(fair, axis=1) == pytest.approx(np.ones(4))
+    assert fair[0] == pytest.approx([0.5, 0.5])
+    assert fair[1, 1] > fair[1, 0]
+    assert np.all(fair[:3] <= implied[:3])
+
+
+def test_methods_differ_on_longshots():
+    """Test power and Shin take more of the margin from the longshot than scaling does."""
+    implied = implied_probabilities([[1000, -2000]])
+    
+    multiplicative, power, shin = (remove_vig(implied, method)[0, 0] for method in VIG_METHODS)
+    
+    assert power < multiplicative
+    assert shin < multiplicative
+    assert overround(implied) == pytest.approx([implied.sum() - 1])
+
+
+def test_shin_matches_the_two_outcome_closed_form():
+    """Test Shin's fair probabilities equal the closed form for two outcomes, even for huge margins."""
+    implied = implied_probabilities([[1000, -2000], [-110, -110], [-3000, -2500]])
+    total = implied.sum(axis=1, keepdims=True)
+    gap = implied[:, :1] - implied[:, 1:]
+    z = (total - 1) * (gap ** 2 - total) / (total * (gap ** 2 - 1))
+    share = implied ** 2 / total
+    
+    expected = (np.sqrt(z ** 2 + 4 * (1 - z) * share) - z) / (2 * (1 - z))
+    
+    assert remove_vig(implied, "shin") == pytest.approx(expected, abs=1e-12)
+
+
+def test_rows_without_margin_and_unknown_method():
+    """Test empty rows pass through, underround rows are scaled up and bad methods are rejected."""
+    fair = remove_vig([[0.0, 0.0], [0.4, 0.5]], "shin")
+    
+    assert fair[0] == pytest.approx([0.0, 0.0])
+    assert fair[1] == pytest.approx([0.4 / 0.9, 0.5 / 0.9])
+    with pytest.raises(ValueError):
+        remove_vig([[0.5, 0.6]], "additive")
+
+
+def test_predict_many_matches_predict_and_isolates_errors():
+    """Test a slate is predicted like its events one by one, with bad events failing alone."""
+    events = [odds_event(i, 3) for i in range(5)]
+    events.insert(2, {"home_team": "A", "away_team": "B", "bookmakers": []})
+    
+    slate = SportsPredictionModel.predict_many(events)
+    single = [SportsPredictionModel.predict(event) for event in events]
+    
+    assert slate == single
+    assert slate[2]["metadata"]["error"] == "No bookmaker data available"
+    fair = slate[0]["metadata"]["fair_probability"]
+    assert slate[0]["implied_probability"] > fair
+    assert slate[0]["metadata"]["margin"] > 0
+    assert slate[0]["probability"] == pytest.approx(fair * 0.7 + 0.5 * 0.3)
@@ -0,0 +1,137 @@
+"""Tests for The Odds API quota tracking and adaptive refresh."""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.services import external_apis
+from app.services.odds_quota import OddsQuota, OddsRefreshPolicy, next_quota_reset, request_cost
+from benchmarks.standins import InMemoryCollection
+
+NOW = datetime(2024, 3, 10, 12, 0)
+
+
+def event(starts_in: timedelta):
+    return {"commence_time": (NOW + starts_in).strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+@pytest.fixture
+def mongo(standins, monkeypatch):
+    """In-memory MongoDB and upstream stand-ins, restored after the test."""
+    monkeypatch.setattr(external_apis, "odds_refresh_policy", OddsRefreshPolicy())
+    return standins()
+
+
+def test_refresh_interval_follows_next_event():
+    """Test imminent and live games refresh often and distant slates rarely."""
+    policy = OddsRefreshPolicy()
+    
+    live = policy.base_ttl([event(timedelta(hours=-1)), event(timedelta(days=2))], NOW)
+    imminent = policy.base_ttl([event(timedelta(minutes=30))], NOW)
+    tonight = policy.base_ttl([event(timedelta(hours=5))], NOW)
+    distant = policy.base_ttl([event(timedelta(days=5))], NOW)
+    finished = policy.base_ttl([event(timedelta(hours=-6))], NOW)
+    
+    assert live == 60
+    assert imminent == 120
+    assert tonight == 600
+    assert distant == policy.DISTANT_TTL
+    assert finished == policy.EMPTY_TTL
+
+
+def test_low_budget_stretches_refresh_interval():
+    """Test intervals stretch so the remaining quota lasts until it renews."""
+    policy = OddsRefreshPolicy()
+    events = [event(timedelta(minutes=30))]
+    
+    plenty = policy.ttl_seconds("nba", events, 1, {"remaining": 10 ** 6, "updated_at": NOW}, NOW)
+    scarce = policy.ttl_seconds("nba", events, 1, {"remaining": 100, "updated_at": NOW}, NOW)
+    spent = policy.ttl_seconds("nba", events, 1, {"remaining": 0, "updated_at": NOW}, NOW)
+    
+    seconds_left = (next_quota_reset(NOW) - NOW).total_seconds()
+    assert plenty == 120
+    assert scarce == pytest.approx(seconds_left / 100)
+    assert spent == float("inf")
+
+
+def test_idle_slates_stop_stretching_intervals():
+    """Test a slate nobody looks up any more stops counting towards the refresh rate."""
+    policy = OddsRefreshPolicy()
+    budget = {"remaining": 40, "updated_at": NOW}
+    events = [event(timedelta(days=20))]
+    
+    alone = policy.ttl_seconds("nba", events, 1, budget, NOW)
+    shared = policy.ttl_seconds("nfl", events, 1, budget, NOW)
+    policy.ttl_seconds("nba", events, 1, budget, NOW + timedelta(seconds=shared))
+    later = NOW + timedelta(seconds=2 * shared + 1)
+    alone_later = OddsRefreshPolicy().ttl_seconds("nba", events, 1, budget, later)
+    
+    assert shared == pytest.approx(2 * alone)
+    assert policy.ttl_seconds("nba", events, 1, budget, later) == pytest.approx(alone_later)
+
+
+def test_quota_headers_are_persisted():
+    """Test the budget is read from response headers and expires with the quota period."""
+    collection = InMemoryCollection()
+    quota = OddsQuota(lambda: collection)
+    
+    quota.update_from_headers({"x-requests-remaining": "480", "x-requests-used": "20", "x-requests-last": "2"}, NOW)
+    ignored = quota.update_from_headers({}, NOW)
+    
+    assert ignored is None
+    assert quota.load(NOW)["remaining"] == 480
+    assert quota.load(NOW)["last_cost"] == 2
+    assert quota.load(next_quota_reset(NOW)) is None
+    assert request_cost("h2h,spreads", "us,uk") == 4
+
+
+def test_odds_served_from_cache_until_refresh_due(mongo):
+    """Test a second request is served from cache and the quota is recorded."""
+    first = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba", markets="h2h,spreads"))
+    second = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba", markets="h2h,spreads"))
+    
+    budget = mongo["api_quotas"].find_one({"api_name": "the_odds_api"})
+    assert second == first
+    assert budget["used"] == 2
+    assert budget["last_cost"] == 2
+
+
+def test_exhausted_quota_serves_stale_odds(mongo):
+    """Test stale odds are served, and nothing is fetched, once the quota is spent."""
+    data = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    mongo["api_cache"].update_one({}, {"$set": {"timestamp": datetime.utcnow() - timedelta(days=7)}})
+    mongo["api_quotas"].update_one({}, {"$set": {"remaining": 0}})
+    
+    stale = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    
+    assert stale == data
+    with pytest.raises(Exception, match="quota is exhausted"):
+        asyncio.run(external_apis.TheOddsAPI.get_sports_odds("americanfootball_nfl"))
+
+
+def test_concurrent_misses_share_one_fetch(mongo):
+    """Test simultaneous misses make one upstream call and reordered markets share the entry."""
+    async def fetch_all():
+        return await asyncio.gather(
+            external_apis.TheOddsAPI.get_sports_odds("basketball_nba", markets="h2h,spreads"),
+            external_apis.TheOddsAPI.get_sports_odds("basketball_nba", markets="spreads, h2h"),
+            external_apis.TheOddsAPI.get_sports_odds("basketball_nba", markets="h2h,spreads,h2h ")
+        )
+    
+    first, second, third = asyncio.run(fetch_all())
+    
+    budget = mongo["api_quotas"].find_one({"api_name": "the_odds_api"})
+    assert first == second == third
+    assert budget["used"] == 2
+    assert external_apis.TheOddsAPI._in_flight == {}
+
+
+def test_odds_request_cap_serves_stale_odds(mongo, monkeypatch):
+    """Test odds past the per-minute request cap come from cache, and a never-cached slate fails."""
+    data = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    mongo["api_cache"].update_one({}, {"$set": {"timestamp": datetime.utcnow() - timedelta(days=7)}})
+    monkeypatch.setattr(external_apis.rate_limiter, "limits", {"the_odds_api": 1})
+    
+    stale = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    
+    assert stale == data
+    with pytest.raises(Exception, match="rate limit exceeded"):
+        asyncio.run(external_apis.TheOddsAPI.get_sports_odds("americanfootball_nfl"))
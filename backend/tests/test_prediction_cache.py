@@ -0,0 +1,108 @@
+"""Tests for memoized predictions."""
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import sports, stocks
+from app.services.prediction_cache import PredictionCache, fingerprint_event, fingerprint_prices
+from app.services.prediction_models import StockPredictionModel
+from app.services.price_store import PriceHistory
+from standin.synth import odds_event
+
+
+@pytest.fixture
+def app_client(standins, monkeypatch):
+    """Stock and sports routers on in-memory stand-ins with an empty prediction cache."""
+    standins()
+    cache = PredictionCache(16)
+    monkeypatch.setattr(stocks, "prediction_cache", cache)
+    monkeypatch.setattr(sports, "prediction_cache", cache)
+    app = FastAPI()
+    app.include_router(stocks.router)
+    app.include_router(sports.router)
+    return TestClient(app), cache
+
+
+def test_lru_eviction_and_version_invalidation():
+    """Test the least recently used entry is evicted and invalidation is per model version."""
+    cache = PredictionCache(2)
+    cache.put(("stock", "A", "f", "v1"), {"probability": 0.6})
+    cache.put(("stock", "B", "f", "v1"), {"probability": 0.4})
+    cache.get(("stock", "A", "f", "v1"))
+    cache.put(("stock", "C", "f", "v2"), {"probability": 0.5})
+    
+    evicted = cache.get(("stock", "B", "f", "v1"))
+    cache.invalidate("v1")
+    
+    assert evicted is None
+    assert cache.get(("stock", "A", "f", "v1")) is None
+    assert cache.get(("stock", "C", "f", "v2")) == {"probability": 0.5}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_errors_are_not_cached_and_results_are_copies():
+    """Test failed predictions are recomputed and cached results cannot be mutated by callers."""
+    cache = PredictionCache()
+    cache.put(("stock", "A", "f", "v1"), {"probability": 0.5, "metadata": {"error": "Insufficient data"}})
+    cache.put(("stock", "B", "f", "v1"), {"probability": 0.7, "metadata": {}})
+    
+    cache.get(("stock", "B", "f", "v1"))["probability"] = 0.0
+    
+    assert len(cache) == 1
+    assert cache.get(("stock", "B", "f", "v1"))["probability"] == 0.7
+
+
+def test_fingerprints_follow_the_data():
+    """Test fingerprints change with any price or odds update and ignore container type."""
+    prices = np.linspace(100, 110, 50)
+    event = odds_event(0, 3)
+    moved = odds_event(0, 3)
+    moved["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] += 5
+    moved["bookmakers"][0]["last_update"] = "2024-01-01T19:05:00Z"
+    unstamped = odds_event(0, 3)
+    del unstamped["bookmakers"][0]["last_update"]
+    unstamped_moved = odds_event(0, 3)
+    del unstamped_moved["bookmakers"][0]["last_update"]
+    unstamped_moved["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] += 5
+    
+    assert fingerprint_prices(prices) == fingerprint_prices(list(prices))
+    assert fingerprint_prices(prices) != fingerprint_prices(prices[:-1])
+    assert fingerprint_event(event) == fingerprint_event(odds_event(0, 3))
+    assert fingerprint_event(event) != fingerprint_event(moved)
+    assert fingerprint_event(unstamped) != fingerprint_event(unstamped_moved)
+
+
+def test_stock_prediction_reused_until_model_changes(app_client, monkeypatch):
+    """Test an unchanged history is predicted once per model version."""
+    client, cache = app_client
+    closes = np.linspace(100, 120, 60)
+    data = np.zeros((6, 60))
+    data[0] = np.arange(60)
+    data[4] = closes
+    
+    async def ensure_history(symbol):
+        return PriceHistory(symbol, data)
+    
+    monkeypatch.setattr(stocks.price_ingestion, "ensure_history", ensure_history)
+    
+    first = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    second = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    monkeypatch.setattr(StockPredictionModel, "current_version", staticmethod(lambda: "lr-new"))
+    third = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    
+    assert first.json() == second.json()
+    assert third.status_code == 200
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_sports_slate_reused_while_odds_unchanged(app_client):
+    """Test a repeated slate is served entirely from the prediction cache."""
+    client, cache = app_client
+    
+    first = client.get("/sports/predictions")
+    second = client.get("/sports/predictions")
+    
+    assert first.json() == second.json()
+    assert cache.stats()["hits"] == len(second.json())
+    assert cache.stats()["misses"] == len(first.json())
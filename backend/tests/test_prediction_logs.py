@@ -0,0 +1,79 @@
+"""Tests for prediction log documents and the day-file archive."""
+import os
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.services.prediction_logs import (
+    archive_prediction_logs, archived_through, log_document, partition_path, read_partition
+)
+from benchmarks.standins import InMemoryCollection
+
+
+def _logs():
+    """Three days of stock and sports logs, inserted out of order."""
+    start = datetime(2024, 3, 1, 12)
+    logs = []
+    for day in range(3):
+        for minute in (30, 5):
+            timestamp = start + timedelta(days=day, minutes=minute)
+            logs.append({
+                **log_document("stock", {"direction": "up", "probability": 0.6, "confidence": 0.2, "model_version": "v1"}, 7, symbol="AAPL"),
+                "timestamp": timestamp,
+            })
+            logs.append({
+                **log_document(
+                    "sports",
+                    {"market": "spreads", "outcome": "Home", "probability": 0.55, "point": -3.5},
+                    None,
+                    event_id=f"e{day}",
+                    commence_time="2024-03-05T00:00:00Z"
+                ),
+                "timestamp": timestamp,
+            })
+    return logs
+
+
+def test_log_document_is_timestamped():
+    doc = log_document("stock", {"direction": "up"}, None, symbol="AAPL")
+    assert isinstance(doc["timestamp"], datetime)
+    assert doc["prediction_type"] == "stock"
+    assert doc["symbol"] == "AAPL"
+    assert doc["user_id"] is None
+
+
+def test_archive_writes_day_files_and_deletes(tmp_path):
+    collection = InMemoryCollection()
+    collection.insert_many(_logs())
+    
+    summary = archive_prediction_logs(collection, str(tmp_path), before=datetime(2024, 3, 3, 8))
+    
+    assert summary == {"logs": 8, "days": 2, "files": 4, "deleted": 8}
+    assert archived_through(str(tmp_path)) == date(2024, 3, 2)
+    assert collection.count_documents({}) == 4
+    stock = read_partition(partition_path(str(tmp_path), "stock", date(2024, 3, 1)))
+    assert stock["timestamp"].tolist() == [datetime(2024, 3, 1, 12, 5), datetime(2024, 3, 1, 12, 30)]
+    assert stock["subject"].tolist() == ["AAPL", "AAPL"]
+    assert stock["user_id"].tolist() == [7, 7]
+    assert stock["outcome"].tolist() == ["up", "up"]
+    sports = read_partition(partition_path(str(tmp_path), "sports", date(2024, 3, 2)))
+    assert sports["subject"].tolist() == ["e1", "e1"]
+    assert sports["user_id"].tolist() == [-1, -1]
+    assert sports["market"].tolist() == ["spreads", "spreads"]
+    assert sports["point"].tolist() == [-3.5, -3.5]
+    assert np.isnan(sports["confidence"]).all()
+
+
+def test_archive_rerun_does_not_duplicate(tmp_path):
+    collection = InMemoryCollection()
+    collection.insert_many(_logs())
+    archive_prediction_logs(collection, str(tmp_path), before=datetime(2024, 3, 3), delete=False)
+    
+    # Nothing new to archive while the logs are kept
+    summary = archive_prediction_logs(collection, str(tmp_path), before=datetime(2024, 3, 3))
+    assert summary["logs"] == 0
+    assert collection.count_documents({}) == 12
+    
+    # A later cutoff picks up only the next day
+    summary = archive_prediction_logs(collection, str(tmp_path), before=datetime(2024, 3, 4))
+    assert summary == {"logs": 4, "days": 1, "files": 2, "deleted": 4}
+    assert len(read_partition(partition_path(str(tmp_path), "stock", date(2024, 3, 1)))["timestamp"]) == 2
+    assert sorted(os.listdir(tmp_path / "stock")) == ["2024-03-01.npz", "2024-03-02.npz", "2024-03-03.npz"]
@@ -0,0 +1,58 @@
+"""Tests for the columnar price history store."""
+import numpy as np
+import pytest
+from datetime import date
+from app.services.price_store import PriceStore, columns_from_payload
+from app.services.prediction_models import StockPredictionModel
+from standin.synth import alpha_vantage_daily
+
+END = date(2024, 6, 28)
+
+
+def test_payload_round_trip_is_memory_mapped(tmp_path):
+    """Test a stored payload reads back as mapped columns matching the JSON."""
+    store = PriceStore(str(tmp_path))
+    payload = alpha_vantage_daily("AAPL", 50, end=END)
+    
+    store.merge_payload("aapl", payload)
+    history = store.read("AAPL")
+    
+    assert isinstance(history.data, np.memmap)
+    assert len(history) == 50
+    assert str(history.last_date) == "2024-06-28"
+    assert history.close[-1] == float(payload["Time Series (Daily)"]["2024-06-28"]["4. close"])
+    assert store.symbols() == ["AAPL"]
+    assert store.read("AAPL") is history
+
+
+def test_merge_is_idempotent_and_extends_history(tmp_path):
+    """Test merging overlapping payloads adds only new dates and never duplicates."""
+    store = PriceStore(str(tmp_path))
+    full = alpha_vantage_daily("MSFT", 300, end=END)
+    compact = alpha_vantage_daily("MSFT", 100, end=END)
+    
+    assert store.merge_payload("MSFT", compact) == 100
+    assert store.merge_payload("MSFT", compact) == 0
+    assert store.merge_payload("MSFT", full) == 200
+    
+    history = store.read("MSFT")
+    assert np.array_equal(history.data, columns_from_payload(full))
+    assert len(history.between("2024-06-01", "2024-06-30")) == 20
+    assert len(history.tail(10)) == 10
+
+
+def test_prediction_from_store_matches_payload(tmp_path):
+    """Test predicting from the stored close column equals predicting from the payload."""
+    store = PriceStore(str(tmp_path))
+    payload = alpha_vantage_daily("IBM", 100, end=END)
+    
+    store.merge_payload("IBM", payload)
+    history = store.read("IBM")
+    
+    assert StockPredictionModel.predict_prices(history.close) == StockPredictionModel.predict(payload)
+
+
+def test_rejects_path_like_symbols(tmp_path):
+    """Test symbols cannot escape the store directory."""
+    with pytest.raises(ValueError):
+        PriceStore(str(tmp_path)).read("../etc/passwd")
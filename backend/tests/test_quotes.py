@@ -0,0 +1,53 @@
+"""Tests for batched stock quotes."""
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import stocks
+from app.services import external_apis
+
+
+@pytest.fixture
+def mongo(standins):
+    """In-memory MongoDB and upstream stand-ins, restored after the test."""
+    return standins()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(stocks.router)
+    return TestClient(app)
+
+
+def test_watchlist_costs_one_upstream_call(mongo, client):
+    """Test many symbols are fetched in one bulk call and then served from per-symbol cache."""
+    symbols = [f"SYM{i}" for i in range(30)]
+    
+    first = client.get("/stocks/quotes", params={"symbols": ",".join(symbols)})
+    second = client.get("/stocks/quotes", params={"symbols": ",".join(symbols[:10])})
+    
+    assert first.status_code == 200
+    assert [q["symbol"] for q in first.json()["quotes"]] == symbols
+    assert first.json()["missing"] == []
+    assert second.status_code == 200
+    assert len(second.json()["quotes"]) == 10
+    assert mongo["rate_limits"].count_documents({}) == 1
+    assert mongo["api_cache"].count_documents({}) == 30
+
+
+def test_bulk_quotes_fill_single_quote_cache(mongo, client):
+    """Test get_quote reuses an entry cached by a bulk fetch."""
+    client.get("/stocks/quotes", params={"symbols": "AAPL,MSFT"})
+    
+    quote = asyncio.run(external_apis.AlphaVantageAPI.get_quote("MSFT"))
+    
+    assert quote["Global Quote"]["01. symbol"] == "MSFT"
+    assert mongo["rate_limits"].count_documents({}) == 1
+
+
+def test_quote_symbol_validation(client):
+    """Test empty and oversized symbol lists are rejected."""
+    assert client.get("/stocks/quotes", params={"symbols": " , "}).status_code == 400
+    too_many = ",".join(f"S{i}" for i in range(stocks.MAX_QUOTE_SYMBOLS + 1))
+    assert client.get("/stocks/quotes", params={"symbols": too_many}).status_code == 400
@@ -0,0 +1,157 @@
+"""Tests for upstream circuit breakers, retries and stale fallbacks."""
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.routers import sports
+from app.services import external_apis
+from app.services.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, call_upstream
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def responses(*statuses):
+    """A send() that answers with the given statuses in turn, counting calls."""
+    calls = []
+    
+    async def send():
+        calls.append(1)
+        status = statuses[len(calls) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return httpx.Response(status)
+    
+    return send, calls
+
+
+@pytest.fixture
+def mongo(standins, monkeypatch):
+    """In-memory MongoDB and upstream stand-ins with fresh breakers, restored after the test."""
+    monkeypatch.setattr(external_apis, "upstream_breakers", {
+        name: CircuitBreaker(name) for name in external_apis.upstream_breakers
+    })
+    monkeypatch.setattr(settings, "upstream_retry_base_delay", 0.0)
+    return standins()
+
+
+def test_breaker_opens_and_probes():
+    """Test the circuit opens after repeated failures and closes after a successful probe."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("upstream", failure_threshold=3, reset_seconds=30, clock=clock)
+    
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now = 31
+    breaker.before_call()
+    probing = breaker.state
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(0.1)
+    
+    assert probing == HALF_OPEN
+    assert breaker.state == CLOSED
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_failed_probe_and_slow_calls_reopen():
+    """Test a failed half-open probe reopens the circuit and slow calls count as failures."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("upstream", failure_threshold=2, reset_seconds=10, slow_call_seconds=1, clock=clock)
+    
+    breaker.record_success(5.0)
+    breaker.record_success(5.0)
+    opened = breaker.state
+    clock.now = 11
+    breaker.before_call()
+    breaker.record_failure()
+    
+    assert opened == OPEN
+    assert breaker.state == OPEN
+    assert breaker.opened_at == 11
+
+
+def test_transient_errors_are_retried():
+    """Test 5xx responses and connection errors are retried and 4xx responses are not."""
+    breaker = CircuitBreaker("upstream")
+    flaky, flaky_calls = responses(503, httpx.ConnectError("refused"), 200)
+    rejected, rejected_calls = responses(401, 200)
+    
+    ok = asyncio.run(call_upstream(breaker, flaky, retries=2, base_delay=0))
+    unauthorized = asyncio.run(call_upstream(breaker, rejected, retries=2, base_delay=0))
+    
+    assert ok.status_code == 200
+    assert len(flaky_calls) == 3
+    assert unauthorized.status_code == 401
+    assert len(rejected_calls) == 1
+    assert breaker.state == CLOSED
+
+
+def test_retries_are_bounded():
+    """Test the last transport error is raised once retries are spent."""
+    breaker = CircuitBreaker("upstream", failure_threshold=10)
+    send, calls = responses(*[httpx.ReadTimeout("slow")] * 5)
+    
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(call_upstream(breaker, send, retries=2, base_delay=0))
+    
+    assert len(calls) == 3
+    assert breaker.failures == 3
+
+
+def test_each_retry_reserves_a_request():
+    """Test retries stop, keeping the last failure, once no request can be reserved."""
+    breaker = CircuitBreaker("upstream", failure_threshold=10)
+    throttled, throttled_calls = responses(429, 429, 200)
+    timeouts, timeout_calls = responses(*[httpx.ReadTimeout("slow")] * 3)
+    slots = [True]
+    
+    def acquire():
+        return bool(slots) and slots.pop()
+    
+    limited = asyncio.run(call_upstream(breaker, throttled, retries=2, base_delay=0, acquire=acquire))
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(call_upstream(breaker, timeouts, retries=2, base_delay=0, acquire=lambda: False))
+    
+    assert limited.status_code == 429
+    assert len(throttled_calls) == 2
+    assert len(timeout_calls) == 1
+
+
+def test_open_circuit_serves_last_known_odds(mongo):
+    """Test cached odds are served at any age while the upstream circuit is open."""
+    data = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    mongo["api_cache"].update_one({}, {"$set": {"timestamp": datetime.utcnow() - timedelta(days=7)}})
+    breaker = external_apis.upstream_breakers["the_odds_api"]
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    
+    stale = asyncio.run(external_apis.TheOddsAPI.get_sports_odds("basketball_nba"))
+    
+    assert stale == data
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_open_circuit_without_cache_is_503(mongo):
+    """Test the sports endpoint fails fast with Retry-After when nothing is cached."""
+    app = FastAPI()
+    app.include_router(sports.router)
+    breaker = external_apis.upstream_breakers["the_odds_api"]
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    
+    response = TestClient(app).get("/sports/predictions")
+    
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
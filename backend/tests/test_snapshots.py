@@ -0,0 +1,115 @@
+"""Tests for precomputed prediction snapshots."""
+import asyncio
+import functools
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import sports, stocks
+from app.services.prediction_cache import PredictionCache
+from app.services.prediction_models import StockPredictionModel
+from app.services.price_store import PriceHistory
+from app.services.snapshots import PredictionSnapshots
+from benchmarks.standins import AsyncInMemoryCollection, InMemoryCollection
+
+
+@pytest.fixture
+def app_client(standins, monkeypatch):
+    """Stock and sports routers on in-memory stand-ins with snapshots for AAPL and the NBA slate."""
+    mongo = standins()
+    cache = PredictionCache(16)
+    monkeypatch.setattr(stocks, "prediction_cache", cache)
+    monkeypatch.setattr(sports, "prediction_cache", cache)
+    
+    data = np.zeros((6, 60))
+    data[0] = np.arange(60)
+    data[4] = np.linspace(100, 120, 60)
+    
+    async def ensure_history(symbol):
+        return PriceHistory(symbol, data)
+    
+    monkeypatch.setattr(stocks.price_ingestion, "ensure_history", ensure_history)
+    
+    collection = AsyncInMemoryCollection(InMemoryCollection())
+    snapshots = PredictionSnapshots(refresh_seconds=300, max_age_seconds=600, collection=collection)
+    snapshots.add_job("stock:AAPL", functools.partial(stocks.build_snapshot, "AAPL"))
+    snapshots.add_job("sports:basketball_nba:h2h:us", functools.partial(sports.build_snapshot, "basketball_nba", "h2h", "us"))
+    monkeypatch.setattr(stocks, "prediction_snapshots", snapshots)
+    monkeypatch.setattr(sports, "prediction_snapshots", snapshots)
+    
+    app = FastAPI()
+    app.include_router(stocks.router)
+    app.include_router(sports.router)
+    return TestClient(app), snapshots, mongo
+
+
+def _unavailable(*args, **kwargs):
+    raise AssertionError("served from the snapshot, nothing should be fetched or predicted")
+
+
+def test_stock_served_from_snapshot(app_client, monkeypatch):
+    """Test a fresh snapshot matches the on-demand response, skips fetch and inference, and survives a logging failure."""
+    client, snapshots, mongo = app_client
+    on_demand = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    
+    built = asyncio.run(snapshots.refresh())
+    monkeypatch.setattr(stocks.price_ingestion, "ensure_history", _unavailable)
+    monkeypatch.setattr(StockPredictionModel, "predict_prices", staticmethod(_unavailable))
+    served = client.get("/stocks/predictions", params={"symbol": "aapl"})
+    revalidated = client.get(
+        "/stocks/predictions", params={"symbol": "AAPL"}, headers={"If-None-Match": on_demand.headers["etag"]}
+    )
+    
+    assert built == {"stock:AAPL": True, "sports:basketball_nba:h2h:us": True}
+    assert served.json() == on_demand.json()
+    assert served.headers["etag"] == on_demand.headers["etag"]
+    assert revalidated.status_code == 304
+    assert mongo["prediction_logs"].count_documents({"symbol": "AAPL"}) == 2
+    assert snapshots.stats()["hits"] == 2
+
+    def mongo_down(documents):
+        raise ConnectionError("MongoDB unavailable")
+    
+    monkeypatch.setattr(mongo["prediction_logs"], "insert_many", mongo_down)
+    unlogged = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    
+    assert unlogged.status_code == 200
+    assert unlogged.json() == on_demand.json()
+
+
+def test_stale_or_outdated_snapshots_fall_back(app_client, monkeypatch):
+    """Test an expired snapshot, stale data or an older model version is computed on demand."""
+    client, snapshots, _ = app_client
+    asyncio.run(snapshots.refresh())
+    
+    # Odds due for a refresh (a live game's short TTL) within the max age
+    snapshots.snapshots["sports:basketball_nba:h2h:us"]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+    stale_odds = client.get("/sports/predictions")
+    monkeypatch.setattr(StockPredictionModel, "current_version", staticmethod(lambda: "lr-new"))
+    retrained = client.get("/stocks/predictions", params={"symbol": "AAPL"})
+    snapshots.max_age_seconds = 0
+    expired = client.get("/sports/predictions")
+    
+    assert stale_odds.status_code == 200
+    assert retrained.status_code == 200
+    assert expired.status_code == 200
+    assert snapshots.stats()["hits"] == 0
+    assert snapshots.stats()["misses"] == 3
+
+
+def test_sports_slate_served_from_snapshot_after_restart(app_client, monkeypatch):
+    """Test a saved slate snapshot is loaded by a new worker and served without fetching odds."""
+    client, snapshots, _ = app_client
+    on_demand = client.get("/sports/predictions")
+    asyncio.run(snapshots.refresh())
+    
+    restarted = PredictionSnapshots(collection=snapshots._collection)
+    restarted.jobs = dict(snapshots.jobs)
+    asyncio.run(restarted.load())
+    monkeypatch.setattr(sports, "prediction_snapshots", restarted)
+    monkeypatch.setattr(sports.TheOddsAPI, "get_sports_odds_entry", _unavailable)
+    served = client.get("/sports/predictions")
+    
+    assert served.json() == on_demand.json()
+    assert restarted.stats()["hits"] == 1
@@ -0,0 +1,93 @@
+"""Tests for multi-sport predictions."""
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.routers import sports
+from standin.synth import odds_slate
+
+
+@pytest.fixture
+def mongo(standins):
+    """In-memory MongoDB and upstream stand-ins, restored after the test."""
+    return standins()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(sports.router)
+    return TestClient(app)
+
+
+def test_slates_grouped_with_per_sport_errors(mongo, client, monkeypatch):
+    """Test each slate gets its own predictions and a failing sport only reports an error."""
+    async def get_sports_odds(sport, markets, regions):
+        if sport == "unknown_sport":
+            raise Exception("Unknown sport")
+        return odds_slate(12, 3, sport=sport)
+    
+    monkeypatch.setattr(sports.TheOddsAPI, "get_sports_odds", get_sports_odds)
+    
+    response = client.post("/sports/predictions/batch", json={"slates": [
+        {"sport": "basketball_nba"},
+        {"sport": "unknown_sport"},
+        {"sport": "icehockey_nhl", "markets": "h2h", "regions": "uk"},
+    ]})
+    
+    results = response.json()["results"]
+    assert response.status_code == 200
+    assert [r["sport"] for r in results] == ["basketball_nba", "unknown_sport", "icehockey_nhl"]
+    assert len(results[0]["predictions"]) == sports.MAX_SLATE_EVENTS
+    assert results[1] == {**results[1], "predictions": [], "error": "Unknown sport"}
+    assert results[2]["regions"] == "uk"
+    assert results[2]["error"] is None
+    assert mongo["prediction_logs"].count_documents({}) == 2 * sports.MAX_SLATE_EVENTS
+
+
+def test_fetches_are_concurrent_and_bounded(mongo, client, monkeypatch):
+    """Test odds are fetched concurrently, never more than the configured number at once."""
+    in_flight = []
+    peak = []
+    
+    async def get_sports_odds(sport, markets, regions):
+        in_flight.append(sport)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(sport)
+        return odds_slate(2, 2, sport=sport)
+    
+    monkeypatch.setattr(sports.TheOddsAPI, "get_sports_odds", get_sports_odds)
+    monkeypatch.setattr(settings, "sports_fetch_concurrency", 2)
+    
+    response = client.post("/sports/predictions/batch", json={
+        "slates": [{"sport": f"sport_{i}"} for i in range(5)] + [{"sport": "sport_0"}]
+    })
+    
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 5
+    assert max(peak) == 2
+
+
+def test_end_to_end_against_standin(mongo, client):
+    """Test several sports are fetched through TheOddsAPI and predicted."""
+    response = client.post("/sports/predictions/batch", json={"slates": [
+        {"sport": "basketball_nba"},
+        {"sport": "americanfootball_nfl"},
+    ]})
+    
+    results = response.json()["results"]
+    assert response.status_code == 200
+    assert all(r["error"] is None and r["predictions"] for r in results)
+
+
+def test_slate_count_validation(client):
+    """Test empty and oversized requests are rejected."""
+    empty = client.post("/sports/predictions/batch", json={"slates": []})
+    too_many = client.post("/sports/predictions/batch", json={
+        "slates": [{"sport": f"sport_{i}"} for i in range(sports.MAX_SLATES + 1)]
+    })
+    
+    assert empty.status_code == 400
+    assert too_many.status_code == 400
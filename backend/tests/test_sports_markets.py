@@ -0,0 +1,108 @@
+"""Tests for spreads and totals predictions."""
+import copy
+import json
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import sports
+from app.services.prediction_cache import PredictionCache
+from app.services.prediction_models import SportsPredictionModel
+
+NFL_FIXTURE = os.path.join(os.path.dirname(__file__), "..", "standin", "fixtures", "the_odds_api", "americanfootball_nfl.json")
+
+
+@pytest.fixture
+def nfl_event():
+    with open(NFL_FIXTURE) as f:
+        return json.load(f)[0]
+
+
+@pytest.fixture
+def client(standins, monkeypatch):
+    """Sports router on in-memory stand-ins with an empty prediction cache."""
+    mongo = standins()
+    monkeypatch.setattr(sports, "prediction_cache", PredictionCache(64))
+    app = FastAPI()
+    app.include_router(sports.router)
+    return TestClient(app), mongo
+
+
+def _with_spread(event, home_point):
+    """Copy of an event whose first bookmaker's spread is moved, prices unchanged."""
+    moved = copy.deepcopy(event)
+    spreads = next(m for m in moved["bookmakers"][0]["markets"] if m["key"] == "spreads")
+    for outcome in spreads["outcomes"]:
+        outcome["point"] = home_point if outcome["name"] == moved["home_team"] else -home_point
+    return moved
+
+
+def test_spread_probability_depends_on_the_line(nfl_event):
+    """Test the same prices give a lower cover probability the more points the home team gives."""
+    ratings = {nfl_event["home_team"]: 0.7}
+    
+    short = SportsPredictionModel.predict(_with_spread(nfl_event, -1.5), ratings, market="spreads")
+    long = SportsPredictionModel.predict(_with_spread(nfl_event, -10.5), ratings, market="spreads")
+    
+    assert short["market"] == "spreads"
+    assert short["point"] == -1.5
+    assert short["probability"] > long["probability"]
+    assert long["outcome"] == "no_cover"
+    assert long["team"] == nfl_event["away_team"]
+
+
+def test_totals_predict_over_or_under(nfl_event):
+    """Test totals are over/under the line, from the fair over probability."""
+    result = SportsPredictionModel.predict(nfl_event, market="totals")
+    missing = SportsPredictionModel.predict({**nfl_event, "bookmakers": [{"markets": []}]}, market="totals")
+    
+    assert result["outcome"] in ("over", "under")
+    assert result["team"] is None
+    assert result["point"] == 46.5
+    assert result["probability"] == pytest.approx(result["metadata"]["fair_probability"])
+    assert set(result["metadata"]) >= {"over_odds", "under_odds"}
+    assert missing["metadata"]["error"] == "No totals market available"
+
+
+def test_one_fetch_predicts_every_market(client):
+    """Test one odds request yields a prediction per event and market, with unsupported markets ignored."""
+    client, mongo = client
+    
+    response = client.get("/sports/predictions", params={"markets": "h2h,spreads,totals,outrights"})
+    again = client.get("/sports/predictions", params={"markets": "h2h,spreads,totals,outrights"})
+    
+    predictions = response.json()
+    assert response.status_code == 200
+    assert [p["market"] for p in predictions[:3]] == ["h2h", "spreads", "totals"]
+    assert len(predictions) == 3 * 10
+    assert {p["outcome"] for p in predictions if p["market"] == "spreads"} <= {"cover", "no_cover"}
+    assert all(p["point"] is not None for p in predictions if p["market"] != "h2h")
+    assert again.json() == predictions
+    assert sports.prediction_cache.stats()["hits"] == len(predictions)
+    assert mongo["api_quotas"].find_one({})["used"] == 4
+    logged = [doc["prediction"]["market"] for doc in mongo["prediction_logs"].find({})]
+    assert logged.count("totals") == 20
+
+
+def test_batch_slates_choose_their_markets(client):
+    """Test each slate in a batch is predicted for its own markets."""
+    client, _ = client
+    
+    response = client.post("/sports/predictions/batch", json={"slates": [
+        {"sport": "basketball_nba", "markets": "totals"},
+        {"sport": "icehockey_nhl", "markets": "h2h,spreads"},
+    ]})
+    
+    nba, nhl = response.json()["results"]
+    assert {p["market"] for p in nba["predictions"]} == {"totals"}
+    assert [p["market"] for p in nhl["predictions"][:2]] == ["h2h", "spreads"]
+    assert len(nhl["predictions"]) == 20
+
+
+def test_unrated_spread_uses_fair_probability(nfl_event):
+    """Test a spread between two unrated teams is not pulled towards the underdog."""
+    event = _with_spread(nfl_event, -7.0)
+    
+    result = SportsPredictionModel.predict(event, {"Some Other Team": 0.9}, market="spreads")
+    
+    assert result["probability"] == pytest.approx(result["metadata"]["fair_probability"])
@@ -0,0 +1,50 @@
+"""Tests for the local upstream stand-in server."""
+from fastapi.testclient import TestClient
+from standin.server import StandinSettings, create_app
+
+
+def test_alpha_vantage_output_sizes():
+    """Test compact and full daily series are synthesized with the configured sizes."""
+    client = TestClient(create_app(StandinSettings(compact_days=100, full_days=1000)))
+    
+    compact = client.get("/query", params={"function": "TIME_SERIES_DAILY", "symbol": "AAPL"})
+    full = client.get("/query", params={"function": "TIME_SERIES_DAILY", "symbol": "AAPL", "outputsize": "full"})
+    
+    assert len(compact.json()["Time Series (Daily)"]) == 100
+    assert len(full.json()["Time Series (Daily)"]) == 1000
+    assert compact.json()["Time Series (Daily)"].keys() <= full.json()["Time Series (Daily)"].keys()
+
+
+def test_recorded_fixture_is_replayed():
+    """Test a bundled fixture is served instead of synthesized data."""
+    client = TestClient(create_app(StandinSettings()))
+    
+    response = client.get("/query", params={"function": "TIME_SERIES_DAILY", "symbol": "IBM"})
+    
+    assert response.json()["Meta Data"]["3. Last Refreshed"] == "2024-06-28"
+
+
+def test_odds_quota_headers_and_exhaustion():
+    """Test quota headers count down and requests fail once the quota is spent."""
+    client = TestClient(create_app(StandinSettings(odds_quota=3)))
+    
+    first = client.get("/v4/sports/basketball_nba/odds", params={"markets": "h2h,spreads"})
+    assert first.status_code == 200
+    assert first.headers["x-requests-used"] == "2"
+    assert first.headers["x-requests-remaining"] == "1"
+    assert first.headers["x-requests-last"] == "2"
+    
+    second = client.get("/v4/sports/basketball_nba/odds", params={"markets": "h2h,spreads"})
+    assert second.status_code == 401
+
+
+def test_injected_rate_limit_responses():
+    """Test rate-limit injection mimics each upstream's rate-limit response."""
+    client = TestClient(create_app(StandinSettings(rate_limit_rate=1.0)))
+    
+    alpha = client.get("/query", params={"function": "GLOBAL_QUOTE", "symbol": "AAPL"})
+    odds = client.get("/v4/sports/basketball_nba/odds")
+    
+    assert alpha.status_code == 200
+    assert "Information" in alpha.json()
+    assert odds.status_code == 429
@@ -0,0 +1,31 @@
+"""Tests for worker startup cost."""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_main_is_lightweight():
+    """Test importing the app does not load heavy ML libraries or touch the databases."""
+    script = (
+        "import sys, main\n"
+        "heavy = [m for m in ('sklearn', 'pandas') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    env = {
+        **os.environ,
+        # Unreachable databases: importing must not try to connect
+        "POSTGRES_HOST": "203.0.113.1",
+        "MONGODB_URI": "mongodb://203.0.113.1:27017",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,113 @@
+"""Tests for Elo team ratings."""
+import asyncio
+import os
+import pytest
+from app.services import external_apis
+from app.services.prediction_models import SportsPredictionModel
+from app.services.team_ratings import EloRatings, FixtureScores, TeamRatingService
+from benchmarks.standins import AsyncInMemoryCollection, InMemoryCollection
+from standin.synth import TEAMS, completed_games, odds_event
+
+SCORES_DIR = os.path.join(os.path.dirname(__file__), "..", "standin", "fixtures", "the_odds_api", "scores")
+
+
+def _service(fetch, collection=None):
+    return TeamRatingService(
+        EloRatings(),
+        sports=["americanfootball_nfl", "basketball_nba"],
+        fetch=fetch,
+        collection=collection or AsyncInMemoryCollection(InMemoryCollection())
+    )
+
+
+def test_elo_update_is_zero_sum_and_favours_home():
+    """Test a win moves both ratings by the same amount and home teams are expected to win."""
+    elo = EloRatings(k=20, home_advantage=65)
+    
+    expected = elo.expected_home("nba", "Home", "Away")
+    elo.update("nba", "Home", "Away", 100, 90)
+    
+    assert expected > 0.5
+    assert elo.rating("nba", "Home") - 1500 == pytest.approx(1500 - elo.rating("nba", "Away"))
+    assert elo.rating("nba", "Home") == pytest.approx(1500 + 20 * (1 - expected))
+    assert elo.strength("nba", "Home") > 0.5 > elo.strength("nba", "Away")
+    assert elo.strength("nba", "Unknown") == 0.5
+
+
+def test_fixture_results_applied_once_and_persisted():
+    """Test repeated refreshes skip known games and a new service restores the saved table and revision."""
+    collection = AsyncInMemoryCollection(InMemoryCollection())
+    service = _service(FixtureScores(SCORES_DIR), collection)
+    
+    first = asyncio.run(service.refresh())
+    second = asyncio.run(service.refresh())
+    restored = _service(FixtureScores(SCORES_DIR), collection)
+    empty = restored.revision
+    asyncio.run(restored.load())
+    
+    assert first == {"americanfootball_nfl": 5, "basketball_nba": 0}
+    assert second == {"americanfootball_nfl": 0, "basketball_nba": 0}
+    assert service.elo.rating("americanfootball_nfl", "New Orleans Saints") > 1500
+    assert service.elo.rating("americanfootball_nfl", "Carolina Panthers") < 1500
+    assert restored.elo.ratings == service.elo.ratings
+    assert restored.applied["americanfootball_nfl"] == service.applied["americanfootball_nfl"]
+    assert restored.revision == service.revision != empty
+
+
+def test_games_older_than_the_window_are_ignored():
+    """Test a stale result that arrives after newer ones is not applied."""
+    recent = completed_games("basketball_nba", days=3, games_per_day=2)
+    old = completed_games("basketball_nba", days=10, games_per_day=2)[:2]
+    service = _service(None)
+    
+    applied = service.apply("basketball_nba", recent)
+    late = service.apply("basketball_nba", old)
+    
+    assert applied == 6
+    assert late == 0
+    assert len(service.applied["basketball_nba"]) == 6
+
+
+def test_ratings_follow_synthetic_team_strength():
+    """Test a season of synthetic results ranks the strongest team above the weakest."""
+    service = _service(None)
+    
+    service.apply("basketball_nba", completed_games("basketball_nba", days=150, games_per_day=6))
+    ratings = service.ratings_for([{"sport_key": "basketball_nba", "home_team": TEAMS[0], "away_team": TEAMS[-1]}])
+    
+    assert ratings[TEAMS[0]] > 0.5 > ratings[TEAMS[-1]]
+
+
+def test_ratings_shift_sports_predictions():
+    """Test a higher-rated home team gets a higher win probability than with neutral ratings."""
+    event = odds_event(0, 3)
+    
+    neutral = SportsPredictionModel.predict(event)
+    rated = SportsPredictionModel.predict(event, {event["home_team"]: 0.8, event["away_team"]: 0.2})
+    
+    assert rated["probability"] > neutral["probability"]
+    assert rated["metadata"]["home_rating"] == 0.8
+    assert neutral["metadata"]["home_rating"] == 0.5
+
+
+def test_refresh_from_scores_endpoint(standins):
+    """Test ratings are built from The Odds API scores endpoint and the quota is tracked."""
+    mongo = standins()
+    service = TeamRatingService(EloRatings(), sports=["basketball_nba", "americanfootball_nfl"])
+    
+    applied = asyncio.run(service.refresh())
+    # Another worker starting up reads the same scores from the shared cache
+    other_worker = TeamRatingService(EloRatings(), sports=["basketball_nba", "americanfootball_nfl"])
+    asyncio.run(other_worker.refresh())
+    
+    assert applied["basketball_nba"] > 0
+    assert applied["americanfootball_nfl"] == 5
+    assert other_worker.elo.ratings == service.elo.ratings
+    assert mongo["team_ratings"].count_documents({}) == 2
+    assert mongo["api_quotas"].find_one({})["used"] == 4
+
+    # Without the cache or enough quota, nothing is fetched
+    mongo["api_quotas"].update_one({}, {"$set": {"remaining": 1}})
+    with pytest.raises(Exception, match="quota is exhausted"):
+        asyncio.run(external_apis.TheOddsAPI.get_scores("icehockey_nhl"))
+    assert mongo["api_quotas"].find_one({})["used"] == 4
@@ -0,0 +1,44 @@
+"""Tests for per-request phase timing."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware import ServerTimingMiddleware
+from app.timing import RequestTimer, phase, get_request_timer
+
+
+def test_request_timer_sums_repeated_phases():
+    """Test repeated phases are accumulated and counted."""
+    timer = RequestTimer()
+    timer.record("cache", 1.5)
+    timer.record("cache", 2.5)
+    timer.record("inference", 10.0)
+    
+    assert timer.breakdown()["cache"] == {"duration_ms": 4.0, "count": 2}
+    assert timer.server_timing_header(total_ms=20.0) == (
+        "cache;dur=4.00, inference;dur=10.00, total;dur=20.00"
+    )
+
+
+def test_phase_outside_request_is_noop():
+    """Test phase() works without a request timer."""
+    assert get_request_timer() is None
+    with phase("inference"):
+        pass
+
+
+def test_server_timing_header_on_response():
+    """Test middleware reports recorded phases in Server-Timing."""
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    
+    @app.get("/timed")
+    async def timed():
+        with phase("upstream"):
+            pass
+        return {"ok": True}
+    
+    response = TestClient(app).get("/timed")
+    
+    assert response.status_code == 200
+    header = response.headers["server-timing"]
+    assert "upstream;dur=" in header
+    assert "total;dur=" in header
@@ -0,0 +1,52 @@
+"""Tests for offline stock model training and artifact serving."""
+import json
+import pytest
+from datetime import date
+from app.services import prediction_models
+from app.services.prediction_models import StockPredictionModel
+from app.services.training import save_artifact, train_stock_model
+from standin.synth import alpha_vantage_daily, daily_closes
+
+END = date(2024, 6, 28)
+
+
+def _histories(count=5, days=600):
+    return {f"S{i}": daily_closes(f"S{i}", days, seed=i, end=END) for i in range(count)}
+
+
+def test_training_is_reproducible_and_holds_out_recent_dates():
+    """Test the same data yields the same version and the holdout follows the training window."""
+    first = train_stock_model(_histories(), workers=1)
+    second = train_stock_model(_histories(), workers=2)
+    
+    assert first["model_version"] == second["model_version"]
+    assert first["coefficients"] == pytest.approx(second["coefficients"])
+    window = first["training_window"]
+    assert window["end"] == "2024-06-27"
+    assert window["start"] < window["holdout_start"] <= window["end"]
+    assert first["metrics"]["holdout"]["predictions"] == window["holdout_rows"] > 0
+
+
+def test_serving_uses_saved_artifact(tmp_path, monkeypatch):
+    """Test predict() serves the artifact's coefficients and version once one is deployed."""
+    artifact = train_stock_model(_histories(), workers=1)
+    save_artifact(artifact, str(tmp_path))
+    monkeypatch.setattr(prediction_models.settings, "stock_model_artifact", str(tmp_path / "latest.json"))
+    monkeypatch.setattr(prediction_models, "_stock_artifact_loaded", False)
+    monkeypatch.setattr(prediction_models, "_stock_artifact", None)
+    
+    result = StockPredictionModel.predict(alpha_vantage_daily("AAPL", 100, end=END))
+    
+    assert result["model_version"] == artifact["model_version"]
+    assert json.loads((tmp_path / f"{artifact['model_version']}.json").read_text()) == artifact
+
+
+def test_load_artifact_rejects_feature_mismatch(tmp_path):
+    """Test an artifact trained on different features is refused."""
+    artifact = train_stock_model(_histories(count=2), workers=1)
+    artifact["features"] = ["something_else"] + artifact["features"][1:]
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(artifact))
+    
+    with pytest.raises(ValueError):
+        StockPredictionModel.load_artifact(str(path))
@@ -0,0 +1,117 @@
+"""
+Train the stock model offline and write a versioned artifact.
+
+Usage (from the backend directory):
+    python train_model.py --from-store                   # local price store (PRICE_STORE_DIR)
+    python train_model.py --from-cache                   # daily histories cached in MongoDB
+    python train_model.py --data-dir ./history           # <SYMBOL>.json TIME_SERIES_DAILY payloads
+    python train_model.py --synthetic 500 --days 2520    # synthetic histories (smoke runs)
+
+The artifact is written to <output-dir>/<model_version>.json and to
+<output-dir>/latest.json, which the API loads (STOCK_MODEL_ARTIFACT).
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from app.config import settings
+from app.services.training import history_from_payload, save_artifact, train_stock_model
+
+
+def histories_from_dir(data_dir: str):
+    """(dates, closes) for every <SYMBOL>.json daily payload in a directory."""
+    histories = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        symbol = os.path.splitext(os.path.basename(path))[0].upper()
+        with open(path) as f:
+            histories[symbol] = history_from_payload(json.load(f))
+    return histories
+
+
+def histories_from_store():
+    """(dates, closes) for every symbol in the local price store."""
+    from app.services.price_store import price_store
+    histories = {}
+    for symbol in price_store.symbols():
+        history = price_store.read(symbol)
+        histories[symbol] = (history.dates, history.close)
+    return histories
+
+
+def histories_from_cache():
+    """(dates, closes) for every daily history in the MongoDB API cache."""
+    from pymongo import MongoClient
+    from app.services.cache_codec import CacheCodec
+    codec = CacheCodec()
+    client = MongoClient(settings.mongodb_uri)
+    try:
+        cache = client[settings.mongodb_db_name]["api_cache"]
+        histories = {}
+        for doc in cache.find({"key": {"$regex": "^alpha_vantage_(?!quote_)"}}):
+            doc = codec.decode(doc)
+            if doc is None:
+                continue
+            symbol = doc["key"][len("alpha_vantage_"):]
+            histories[symbol] = history_from_payload(doc["data"])
+        return histories
+    finally:
+        client.close()
+
+
+def synthetic_histories(count: int, days: int):
+    """Deterministic synthetic histories, one per synthetic symbol."""
+    from standin.synth import daily_closes
+    return {f"SYN{i:05d}": daily_closes(f"SYN{i:05d}", days, seed=i) for i in range(count)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-store", action="store_true", help="Train on every symbol in the price store")
+    source.add_argument("--from-cache", action="store_true", help="Train on daily histories cached in MongoDB")
+    source.add_argument("--data-dir", help="Directory of <SYMBOL>.json daily payloads")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Train on N synthetic symbols")
+    parser.add_argument("--days", type=int, default=2520, help="History length for --synthetic")
+    parser.add_argument("--C", type=float, default=1.0, help="Inverse regularization strength")
+    parser.add_argument("--holdout-fraction", type=float, default=0.2,
+                        help="Most recent share of the date range held out for evaluation")
+    parser.add_argument("--workers", type=int, default=0, help="Feature-building processes (0 = one per CPU)")
+    parser.add_argument("--output-dir", default=os.path.dirname(settings.stock_model_artifact) or ".",
+                        help="Artifact directory")
+    parser.add_argument("--no-latest", action="store_true", help="Do not replace latest.json")
+    args = parser.parse_args(argv)
+    
+    if args.from_store:
+        histories = histories_from_store()
+    elif args.from_cache:
+        histories = histories_from_cache()
+    elif args.data_dir:
+        histories = histories_from_dir(args.data_dir)
+    else:
+        histories = synthetic_histories(args.synthetic, args.days)
+    if not histories:
+        print("No histories found", file=sys.stderr)
+        return 1
+    
+    artifact = train_stock_model(
+        histories,
+        C=args.C,
+        holdout_fraction=args.holdout_fraction,
+        workers=args.workers or None
+    )
+    path = save_artifact(artifact, args.output_dir, make_latest=not args.no_latest)
+    
+    window = artifact["training_window"]
+    print(f"{artifact['model_version']}: {window['symbols']} symbols, {window['start']} to {window['end']}, "
+          f"{window['train_rows']} training rows")
+    for split, metrics in artifact["metrics"].items():
+        if metrics["predictions"]:
+            print(f"  {split}: hit rate {metrics['hit_rate']:.4f}, Brier {metrics['brier']:.4f}, "
+                  f"ECE {metrics['ece']:.4f} over {metrics['predictions']} rows")
+    print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())